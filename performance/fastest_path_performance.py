@@ -0,0 +1,45 @@
+import random
+from timeit import Timer
+
+import pandas as pd
+
+from setup import N_NODES_PATH, CMD_REP_PATH, UNIT_MEASURE
+
+import portento
+
+# synthetic workloads shaped as the Malawi (contacts of 20 seconds, recorded in seconds) and Kenya (hourly contacts)
+# datasets used in path_performance.py
+WORKLOADS = {
+    'malawi-style': dict(n_nodes=86, n_links=10000, t_max=13 * 24 * 3600, resolution=20, mean_contacts=3),
+    'kenya-style': dict(n_nodes=75, n_links=10000, t_max=3 * 24, resolution=1, mean_contacts=1)
+}
+
+SETUP_FASTEST_PATH = 'from portento.algorithms.min_temporal_paths import fastest_path_duration'
+
+
+def contacts_stream(seed, n_nodes, n_links, t_max, resolution, mean_contacts):
+    """A stream of contacts that start at multiples of resolution and last a geometric number of contacts."""
+    rnd = random.Random(seed)
+    links = []
+    for _ in range(n_links):
+        u, v = rnd.sample(range(n_nodes), 2)
+        t = rnd.randrange(0, t_max, resolution)
+        n_contacts = 1
+        while rnd.random() > 1 / mean_contacts:
+            n_contacts += 1
+        links.append(portento.Link(pd.Interval(t, t + n_contacts * resolution - 1, 'both'), u, v))
+
+    return portento.Stream(links)
+
+
+def performance_fastest_path(stream, seed=0):
+    nodes = random.Random(seed).sample(list(stream.nodes), N_NODES_PATH)
+    return pd.Series([Timer('fastest_path_duration(stream, node)', SETUP_FASTEST_PATH,
+                            globals=dict(stream=stream, node=node)).timeit(CMD_REP_PATH) / CMD_REP_PATH
+                      for node in nodes])
+
+
+if __name__ == "__main__":
+    res = pd.DataFrame(dict((name, performance_fastest_path(contacts_stream(0, **workload)))
+                            for name, workload in WORKLOADS.items()))
+    print((res * UNIT_MEASURE).quantile([0, .25, .5, .75, 1]))
@@ -0,0 +1,49 @@
+import gc
+import random
+import tracemalloc
+
+import pandas as pd
+
+from fastest_path_performance import WORKLOADS
+
+import portento
+
+MB = 2 ** 20
+
+
+class NotInterningStream(portento.Stream):
+    """The stream keeping the Interval objects of the links it is given, as a reference."""
+
+    def _intern(self, link):
+        return link
+
+
+def point_contacts(seed, n_nodes, n_links, t_max, resolution, mean_contacts):
+    """Contacts (t, u, v) at multiples of resolution."""
+    rnd = random.Random(seed)
+    return [(t, *rnd.sample(range(n_nodes), 2)) for t in (rnd.randrange(0, t_max, resolution) for _ in range(n_links))]
+
+
+def stream_memory(stream_type, contacts):
+    """Memory (MB) held by the stream and number of Interval objects in it, with a new Interval(t, t, 'both') for each
+    contact, as read from a file"""
+    gc.collect()
+    tracemalloc.start()
+    stream = stream_type(portento.Link(pd.Interval(t, t, 'both'), u, v) for t, u, v in contacts)
+    gc.collect()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    n_intervals = sum(1 for obj in gc.get_objects() if isinstance(obj, pd.Interval))
+    del stream
+    return memory / MB, n_intervals
+
+
+def performance_interval_pool(workload):
+    contacts = point_contacts(0, **workload)
+    return pd.DataFrame([stream_memory(stream_type, contacts) for stream_type in [NotInterningStream, portento.Stream]],
+                        index=['not interning', 'interning'], columns=['memory (MB)', 'Interval objects'])
+
+
+if __name__ == "__main__":
+    for name, workload in WORKLOADS.items():
+        print(name, performance_interval_pool(workload), sep="\n")
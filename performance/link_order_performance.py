@@ -0,0 +1,52 @@
+import random
+from collections.abc import Hashable
+from dataclasses import dataclass, field
+from heapq import merge
+from timeit import Timer
+
+import pandas as pd
+from sortedcontainers import SortedList
+
+from setup import TIME_BOUND
+
+from portento import Link
+
+N_LINKS = [1000, 10000, 100000]
+N_STREAMS = 100  # number of sorted streams merged, as the edges merged by StreamDict.__iter__
+REP = 5
+
+
+@dataclass(frozen=True, order=True)
+class DataclassLink:
+    """The links compared by their pandas Interval, as a reference."""
+    interval: pd.Interval
+    u: Hashable = field(compare=False)
+    v: Hashable = field(compare=False)
+
+
+def random_intervals(seed, n_links):
+    rnd = random.Random(seed)
+    intervals = []
+    for _ in range(n_links):
+        left = rnd.randrange(0, TIME_BOUND.right)
+        closed = rnd.choice(['both', 'left', 'right', 'neither'])
+        intervals.append(pd.Interval(left, left + rnd.randrange(1, 100), closed))
+    return intervals
+
+
+def performance_link_order(link_type, intervals):
+    """Throughput (links per second) of sorting, of building a SortedList and of merging sorted streams of links"""
+    links = [link_type(interval, 0, 1) for interval in intervals]
+    streams = [sorted(links[i::N_STREAMS]) for i in range(N_STREAMS)]
+    env = dict(links=links, streams=streams, merge=merge, SortedList=SortedList)
+    return pd.Series({command: len(links) / (Timer(command, globals=env).timeit(REP) / REP)
+                      for command in ['sorted(links)', 'SortedList(links)', 'list(merge(*streams))']})
+
+
+if __name__ == "__main__":
+    for n_links in N_LINKS:
+        intervals = random_intervals(0, n_links)
+        res = pd.DataFrame({'dataclass': performance_link_order(DataclassLink, intervals),
+                            'slotted': performance_link_order(Link, intervals)})
+        res['speedup'] = res['slotted'] / res['dataclass']
+        print(f"{n_links} links (links / s)", res, sep="\n")
@@ -0,0 +1,47 @@
+import random
+from time import perf_counter
+
+import pandas as pd
+
+from setup import N_NODES_PATH
+from fastest_path_performance import WORKLOADS
+
+import portento
+from portento.algorithms.min_temporal_paths import earliest_arrival_time
+
+
+def point_links(seed, n_nodes, n_links, t_max, resolution, mean_contacts):
+    """Contacts Interval(t, t, 'both') at multiples of resolution."""
+    rnd = random.Random(seed)
+    return [portento.Link(pd.Interval(t, t, 'both'), *rnd.sample(range(n_nodes), 2))
+            for t in (rnd.randrange(0, t_max, resolution) for _ in range(n_links))]
+
+
+def timed(f):
+    start = perf_counter()
+    f()
+    return perf_counter() - start
+
+
+def performance_point_stream(stream_type, links, seed=0):
+    """Time (seconds) of the ingestion of the links, of slicing a random half of the time and of the earliest arrival
+    times from N_NODES_PATH nodes on a new stream"""
+    stream = stream_type(links)
+    full_interval = stream.stream_presence.root.full_interval
+    left = random.Random(seed).uniform(full_interval.left, (full_interval.left + full_interval.right) / 2)
+    time_filter = portento.TimeFilter([pd.Interval(left, left + full_interval.length / 2, 'both')])
+    nodes = random.Random(seed).sample(list(stream.nodes), N_NODES_PATH)
+
+    stream = stream_type(links)
+    return pd.Series({'ingestion': timed(lambda: stream_type(links)),
+                      'slice': timed(lambda: list(portento.slice_stream(stream, time_filter=time_filter))),
+                      'earliest_arrival_time': timed(lambda: [earliest_arrival_time(stream, u) for u in nodes])})
+
+
+if __name__ == "__main__":
+    for name, workload in WORKLOADS.items():
+        links = point_links(0, **workload)
+        res = pd.DataFrame({'Stream': performance_point_stream(portento.Stream, links),
+                            'PointStream': performance_point_stream(portento.PointStream, links)})
+        res['speedup'] = res['Stream'] / res['PointStream']
+        print(name, res, sep="\n")
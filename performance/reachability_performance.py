@@ -0,0 +1,48 @@
+import random
+from time import perf_counter
+from timeit import Timer
+
+import pandas as pd
+
+from setup import N_NODES_PATH, UNIT_MEASURE
+from fastest_path_performance import WORKLOADS, contacts_stream
+
+from portento.algorithms.min_temporal_paths import ReachabilityIndex
+
+N_QUERIES = 1000
+
+SETUP_EARLIEST_ARRIVAL = 'from portento.algorithms.min_temporal_paths import earliest_arrival_time'
+
+
+def random_queries(stream, seed=0):
+    rnd = random.Random(seed)
+    nodes = list(stream.nodes)
+    full_interval = stream.stream_presence.root.full_interval
+    queries = []
+    for _ in range(N_QUERIES):
+        left, right = sorted(rnd.randrange(int(full_interval.left), int(full_interval.right)) for _ in range(2))
+        queries.append((*rnd.sample(nodes, 2), pd.Interval(left, right, 'both')))
+    return queries
+
+
+def performance_reachability(stream, workers=1):
+    """Build time (seconds), index size (number of runs) and mean query time of the index and of
+    earliest_arrival_time with a target (units of UNIT_MEASURE)"""
+    build_start = perf_counter()
+    index = ReachabilityIndex(stream, workers=workers)
+    build_time = perf_counter() - build_start
+
+    queries = random_queries(stream)
+    index_time = Timer('for u, v, interval in queries: index.reachable(u, v, interval)',
+                       globals=dict(index=index, queries=queries)).timeit(1) / len(queries)
+    queries = queries[:N_NODES_PATH]
+    path_time = Timer('for u, v, interval in queries: earliest_arrival_time(stream, u, interval, target=v)',
+                      SETUP_EARLIEST_ARRIVAL, globals=dict(stream=stream, queries=queries)).timeit(1) / len(queries)
+
+    return pd.Series({'build time (s)': build_time, 'index size': index.size, 'query index': index_time * UNIT_MEASURE,
+                      'query earliest_arrival_time': path_time * UNIT_MEASURE})
+
+
+if __name__ == "__main__":
+    print(pd.DataFrame(dict((name, performance_reachability(contacts_stream(0, **workload)))
+                            for name, workload in WORKLOADS.items())))
@@ -1 +1,2 @@
 from portento.algorithms import min_temporal_paths
+from portento.algorithms import centrality
@@ -0,0 +1,2 @@
+from .closeness import closeness
+from .betweenness import betweenness
@@ -0,0 +1,88 @@
+from functools import partial
+from typing import Optional
+import numpy as np
+import pandas as pd
+from pandas import Interval
+from portento.classes import Stream
+from portento.utils import map_shared
+from portento.algorithms.min_temporal_paths.utils import link_table, ticks_time_bound
+from .utils import PATH_ALGORITHMS, check_criterion, sample_sources, split_sources
+
+
+def betweenness(stream: Stream, criterion: str = 'fastest', time_bound: Interval = None,
+                n_samples: Optional[int] = None, seed: Optional[int] = None, workers: Optional[int] = None,
+                chunksize: Optional[int] = None):
+    """Compute the temporal betweenness of each node over one optimal journey per pair, that is the fraction of the
+    pairs of other nodes whose journey passes through the node.
+
+    The journey of each pair (u, v) is the one returned by the path algorithm of the criterion with return_paths:
+    'arrival' for earliest_arrival_time, 'fastest' for fastest_path_duration, 'shortest' for shortest_path_distance.
+    When a pair has many optimal journeys, only the one chosen by the path algorithm counts, with weight 1: the
+    optimal journeys are not counted and the pair is not split among them as in the betweenness of static graphs, so
+    the result depends on how the path algorithm breaks ties.
+    The sources are split in chunks swept by a pool of processes, each one returning the counts of its chunk.
+
+    Parameters
+    ----------
+    stream : Stream or DiStream.
+
+    criterion : str
+        One of 'arrival', 'fastest', 'shortest'.
+        Default is 'fastest'.
+
+    time_bound : Interval
+        The time to take into account. Needed to perform a time slice over the stream.
+        Default is None.
+        If time_bound is None, use the whole stream.
+
+    n_samples : int
+        If given, estimate the betweenness from n_samples source nodes drawn uniformly, scaling their counts by the
+        number of nodes over n_samples.
+        Default is None, that is all the nodes are sources.
+
+    seed : int
+        Seed of the random generator of the sources.
+
+    workers : int
+        Number of processes. Default is None, that is the number of CPUs.
+        If workers is 1, the computation is serial.
+
+    chunksize : int
+        The number of sources swept by a worker at once. Default is None, that is about four chunks per worker.
+
+    Returns
+    -------
+    betweenness : pandas Series
+        The series indexed by node.
+
+    """
+    check_criterion(criterion)
+    time_bound = ticks_time_bound(stream, time_bound)
+    if not time_bound:
+        time_bound = stream.stream_presence.root.full_interval
+
+    table = link_table(stream, time_bound)
+    sources = sample_sources(table.nodes, n_samples, seed)
+    counts = sum(map_shared(partial(_count_intermediate_nodes, criterion, time_bound), stream,
+                            split_sources(sources, workers, chunksize), workers, 1))
+
+    n_nodes = len(table.nodes)
+    return pd.Series(counts * n_nodes / (len(sources) * max((n_nodes - 1) * (n_nodes - 2), 1)), index=table.nodes,
+                     name='betweenness')
+
+
+def _count_intermediate_nodes(criterion, time_bound, stream, sources):
+    """The number of journeys from the sources that pass through each node.
+
+    """
+    table = link_table(stream, time_bound)
+    idx = dict(((u, i) for i, u in enumerate(table.nodes)))
+    counts = np.zeros(len(table.nodes))
+    algorithm = PATH_ALGORITHMS[criterion]
+    for source in sources:
+        _, journeys = algorithm(stream, source, table, True, None)
+        for v, journey in journeys.items():
+            for w in set(hop.v for hop in journey[:-1]) - {source, v}:
+                counts[idx[w]] += 1
+
+    return counts
@@ -0,0 +1,90 @@
+from functools import partial
+from typing import Optional
+import numpy as np
+import pandas as pd
+from pandas import Interval
+from portento.classes import Stream
+from portento.utils import map_shared
+from portento.algorithms.min_temporal_paths.earliest_arrival import _earliest_arrival_times
+from portento.algorithms.min_temporal_paths.utils import link_table, ticks_time_bound, unreached_times
+from .utils import PATH_ALGORITHMS, check_criterion, sample_sources, split_sources
+
+
+def closeness(stream: Stream, criterion: str = 'fastest', time_bound: Interval = None, n_samples: Optional[int] = None,
+              seed: Optional[int] = None, workers: Optional[int] = None, chunksize: Optional[int] = None):
+    """Compute the temporal closeness of each node, that is how fast the node is reached from the other nodes.
+
+    The closeness of v is the average of 1 / distance(u, v) over the other nodes u, 0 if v is not reachable from u.
+    The distance depends on the criterion:
+    'arrival' is the earliest arrival time minus the start of the time bound, 'fastest' the duration of the fastest
+    path, 'shortest' the distance of shortest_path_distance, the number of hops of the shortest path times the instant
+    duration.
+    The sources are split in chunks swept by a pool of processes, each one returning the sums of its chunk; with the
+    'arrival' criterion each chunk is swept at once by earliest_arrival_times.
+    The distances are computed in the ticks of the stream: with a Timestamp stream, in nanoseconds.
+
+    Parameters
+    ----------
+    stream : Stream or DiStream.
+
+    criterion : str
+        One of 'arrival', 'fastest', 'shortest'.
+        Default is 'fastest'.
+
+    time_bound : Interval
+        The time to take into account. Needed to perform a time slice over the stream.
+        Default is None.
+        If time_bound is None, use the whole stream.
+
+    n_samples : int
+        If given, estimate the closeness from n_samples source nodes drawn uniformly, scaling their sums by the
+        number of nodes over n_samples.
+        Default is None, that is all the nodes are sources.
+
+    seed : int
+        Seed of the random generator of the sources.
+
+    workers : int
+        Number of processes. Default is None, that is the number of CPUs.
+        If workers is 1, the computation is serial.
+
+    chunksize : int
+        The number of sources swept by a worker at once. Default is None, that is about four chunks per worker.
+
+    Returns
+    -------
+    closeness : pandas Series
+        The series indexed by node.
+
+    """
+    check_criterion(criterion)
+    time_bound = ticks_time_bound(stream, time_bound)
+    if not time_bound:
+        time_bound = stream.stream_presence.root.full_interval
+
+    table = link_table(stream, time_bound)
+    sources = sample_sources(table.nodes, n_samples, seed)
+    sums = sum(map_shared(partial(_harmonic_sums, criterion, time_bound), stream,
+                          split_sources(sources, workers, chunksize), workers, 1))
+
+    n_nodes = len(table.nodes)
+    return pd.Series(sums * n_nodes / (len(sources) * max(n_nodes - 1, 1)), index=table.nodes, name='closeness')
+
+
+def _harmonic_sums(criterion, time_bound, stream, sources):
+    """The sums of 1 / distance(u, v) over the sources u, for each node v.
+
+    """
+    table = link_table(stream, time_bound)
+    if criterion == 'arrival':
+        arrival_times = _earliest_arrival_times(stream, sources, table)
+        distances = np.where(arrival_times == unreached_times(stream, 1)[0], np.inf, arrival_times - table.start)
+    else:
+        algorithm = PATH_ALGORITHMS[criterion]
+        distances = np.array([[values[v] for v in table.nodes]
+                              for values in (algorithm(stream, source, table, False, None) for source in sources)],
+                             dtype=float)
+
+    idx = dict(((u, i) for i, u in enumerate(table.nodes)))
+    distances[np.arange(len(sources)), [idx[source] for source in sources]] = np.inf
+    return (1 / distances).sum(axis=0)
@@ -0,0 +1,93 @@
+import pytest
+from pandas import Interval, Timestamp, Timedelta
+from portento.classes import Stream, DiStream
+from portento.utils import Link, DiLink
+from portento.algorithms.min_temporal_paths.tests.random_stream import generate_stream
+from portento.algorithms.min_temporal_paths import earliest_arrival_time, fastest_path_duration, \
+    shortest_path_distance
+from portento.algorithms.centrality import closeness, betweenness
+
+
+class TestCentrality:
+
+    @pytest.mark.parametrize('criterion,algorithm', [('arrival', earliest_arrival_time),
+                                                     ('fastest', fastest_path_duration),
+                                                     ('shortest', shortest_path_distance)])
+    @pytest.mark.parametrize('stream_type,link_type', [(DiStream, DiLink), (Stream, Link)])
+    def test_closeness(self, criterion, algorithm, stream_type, link_type):
+        stream = generate_stream(stream_type, link_type, 0, n_links=50, t_range=range(20), u_range=range(10))
+        time_bound = Interval(2, 18, 'both')
+        start = 2 if criterion == 'arrival' else 0
+
+        expected = dict(((v, 0) for v in stream.nodes))
+        for u in stream.nodes:
+            values = algorithm(stream, u, time_bound)
+            for v in stream.nodes:
+                if v != u:
+                    expected[v] += 1 / (values[v] - start) / (len(stream.nodes) - 1)
+
+        result = closeness(stream, criterion, time_bound, workers=1)
+        assert result.to_dict() == pytest.approx(expected)
+        assert closeness(stream, criterion, time_bound, workers=2, chunksize=3).to_dict() == pytest.approx(expected)
+
+    @pytest.mark.parametrize('criterion', ['arrival', 'fastest', 'shortest'])
+    def test_timestamps(self, criterion):
+        stream = generate_stream(Stream, Link, 3, n_links=50, t_range=range(20), u_range=range(10))
+        start, second = Timestamp('2024-01-01 08:00'), Timedelta('1s')
+        timestamp_stream = Stream([Link(Interval(start + link.interval.left * second,
+                                                 start + link.interval.right * second, link.interval.closed),
+                                        link.u, link.v) for link in stream], instant_duration=second)
+        time_bound = Interval(2, 18, 'both')
+        timestamp_time_bound = Interval(start + 2 * second, start + 18 * second, 'both')
+
+        # the distances of the timestamp stream are in nanoseconds
+        expected = closeness(stream, criterion, time_bound, workers=1) / second.value
+        assert closeness(timestamp_stream, criterion, timestamp_time_bound, workers=1).to_dict() == \
+            pytest.approx(expected.to_dict())
+        assert betweenness(timestamp_stream, criterion, timestamp_time_bound, workers=1).to_dict() == \
+            pytest.approx(betweenness(stream, criterion, time_bound, workers=1).to_dict())
+
+    def test_closeness_instant_duration(self):
+        stream = DiStream([DiLink(Interval(0, 1, 'both'), 0, 1), DiLink(Interval(4, 6, 'both'), 1, 2)],
+                          instant_duration=2)
+        # each hop counts as the instant duration: the distances are 2 from 0 to 1 and from 1 to 2, 4 from 0 to 2
+        assert closeness(stream, 'shortest', workers=1).to_dict() == \
+            pytest.approx({0: 0, 1: (1 / 2) / 2, 2: (1 / 4 + 1 / 2) / 2})
+
+    def test_betweenness(self):
+        stream = DiStream([DiLink(Interval(0, 1, 'both'), 0, 1), DiLink(Interval(2, 3, 'both'), 1, 2),
+                           DiLink(Interval(4, 5, 'both'), 2, 3)])
+        # the pairs through 1: (0, 2), (0, 3), through 2: (0, 3), (1, 3), over the 3 * 2 pairs of other nodes
+        assert betweenness(stream, workers=1).to_dict() == pytest.approx({0: 0, 1: 1 / 3, 2: 1 / 3, 3: 0})
+
+    @pytest.mark.parametrize('criterion', ['arrival', 'fastest', 'shortest'])
+    def test_betweenness_ties(self, criterion):
+        # the pair (0, 3) has two optimal journeys, through 1 and through 2: only one of them counts
+        stream = DiStream([DiLink(Interval(0, 1, 'both'), 0, 1), DiLink(Interval(0, 1, 'both'), 0, 2),
+                           DiLink(Interval(2, 3, 'both'), 1, 3), DiLink(Interval(2, 3, 'both'), 2, 3)])
+        result = betweenness(stream, criterion, workers=1)
+        assert result[0] == result[3] == 0
+        assert sorted([result[1], result[2]]) == pytest.approx([0, 1 / 6])
+
+    @pytest.mark.parametrize('criterion', ['arrival', 'fastest', 'shortest'])
+    def test_betweenness_random(self, criterion):
+        stream = generate_stream(Stream, Link, 1, n_links=50, t_range=range(20), u_range=range(10))
+        result = betweenness(stream, criterion, workers=1)
+        assert ((result >= 0) & (result <= 1)).all()
+        assert betweenness(stream, criterion, workers=2).to_dict() == pytest.approx(result.to_dict())
+
+    @pytest.mark.parametrize('centrality', [closeness, betweenness])
+    def test_sampled_sources(self, centrality):
+        stream = generate_stream(Stream, Link, 2, n_links=100, t_range=range(30), u_range=range(12))
+        exact = centrality(stream, workers=1)
+        assert centrality(stream, n_samples=len(stream.nodes), seed=0, workers=1).to_dict() == \
+            pytest.approx(exact.to_dict())
+
+        estimate = centrality(stream, n_samples=6, seed=0, workers=1)
+        assert estimate.equals(centrality(stream, n_samples=6, seed=0, workers=1))
+        assert list(estimate.index) == list(exact.index)
+
+        with pytest.raises(AttributeError):
+            centrality(stream, n_samples=0)
+        with pytest.raises(AttributeError):
+            centrality(stream, criterion='latest')
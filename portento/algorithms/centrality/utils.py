@@ -0,0 +1,41 @@
+from collections.abc import Hashable
+from math import ceil
+from multiprocessing import cpu_count
+from random import Random
+from typing import Iterable, Optional
+from portento.algorithms.min_temporal_paths.earliest_arrival import _earliest_arrival_time
+from portento.algorithms.min_temporal_paths.fastest_path import _fastest_path_duration
+from portento.algorithms.min_temporal_paths.shortest_path import _shortest_path_distance
+
+# the path algorithms of each criterion, run on the link table of the time bound and returning values in ticks
+PATH_ALGORITHMS = {
+    'arrival': _earliest_arrival_time,
+    'fastest': _fastest_path_duration,
+    'shortest': _shortest_path_distance
+}
+
+
+def check_criterion(criterion: str):
+    if criterion not in PATH_ALGORITHMS:
+        raise AttributeError("The criterion must be one of %s." % ", ".join(PATH_ALGORITHMS))
+
+
+def sample_sources(nodes: Iterable[Hashable], n_samples: Optional[int], seed: Optional[int]):
+    """All the nodes, or n_samples of them drawn uniformly without replacement.
+
+    """
+    nodes = list(nodes)
+    if n_samples is None:
+        return nodes
+    if not 0 < n_samples <= len(nodes):
+        raise AttributeError("n_samples must be positive and not greater than the number of nodes.")
+    return Random(seed).sample(nodes, n_samples)
+
+
+def split_sources(sources: list, workers: Optional[int], chunksize: Optional[int]):
+    """Split the sources in chunks, by default about four chunks per worker.
+
+    """
+    if chunksize is None:
+        chunksize = max(1, ceil(len(sources) / (4 * (workers or cpu_count()))))
+    return [sources[i:i + chunksize] for i in range(0, len(sources), chunksize)]
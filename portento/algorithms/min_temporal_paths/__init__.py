@@ -1,4 +1,7 @@
-from .earliest_arrival import earliest_arrival_time
+from .earliest_arrival import earliest_arrival_time, earliest_arrival_times
 from .fastest_path import fastest_path_duration, fastest_path_duration_multipass
-from .latest_departure import latest_departure_time
+from .latest_departure import latest_departure_time, latest_departure_times
 from .shortest_path import shortest_path_distance
+from .batch import batch
+from .reachability import ReachabilityIndex
+from .online import OnlineEarliestArrival
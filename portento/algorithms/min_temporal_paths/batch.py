@@ -0,0 +1,64 @@
+from collections.abc import Hashable
+from functools import partial
+from typing import Callable, Iterable, Optional
+import pandas as pd
+from pandas import Interval
+from portento.classes import Stream
+from portento.utils import map_shared
+from .utils import link_table, ticks_time_bound
+
+
+def batch(algorithm: Callable, stream: Stream, sources: Optional[Iterable[Hashable]] = None,
+          time_bound: Interval = None, workers: Optional[int] = None, chunksize: Optional[int] = None):
+    """Run a min temporal path algorithm from many source nodes with a pool of processes.
+
+    The link table of the stream is computed before starting the workers, so that each worker receives the stream
+    together with its table once and only the sources and the results travel between processes.
+
+    Parameters
+    ----------
+    algorithm : Callable
+        A single-source algorithm of the form algorithm(stream, source, time_bound), e.g. fastest_path_duration.
+
+    stream : Stream or DiStream.
+
+    sources : Iterable
+        The starting nodes.
+        Default is None.
+        If sources is None, use all the nodes of the stream.
+
+    time_bound : Interval
+        The time to take into account. Needed to perform a time slice over the stream.
+        Default is None.
+        If time_bound is None, use the whole stream.
+
+    workers : int
+        Number of processes. Default is None, that is the number of CPUs.
+        If workers is 1, the computation is serial.
+
+    chunksize : int
+        The number of sources sent to a worker at once. Default is None, that lets multiprocessing split the
+        sources in about four chunks per worker.
+
+    Returns
+    -------
+    results : pandas DataFrame
+        The DataFrame with a row for each source node and a column for each node of the stream.
+
+    """
+    sources = list(stream.nodes) if sources is None else list(sources)
+    if not all(map(stream.__contains__, sources)):
+        raise AttributeError("The source nodes must be present in the stream.")
+
+    time_bound = ticks_time_bound(stream, time_bound)
+    if not time_bound:
+        time_bound = stream.stream_presence.root.full_interval
+
+    link_table(stream, time_bound)
+
+    results = map_shared(partial(_run_from_source, algorithm, time_bound), stream, sources, workers, chunksize)
+    return pd.DataFrame(results, index=pd.Index(sources, name='source'), columns=list(stream.nodes))
+
+
+def _run_from_source(algorithm, time_bound, stream, source):
+    return algorithm(stream, source, time_bound)
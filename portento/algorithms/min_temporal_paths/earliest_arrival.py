@@ -2,13 +2,21 @@
 
 """
 from collections.abc import Hashable
+from functools import partial
+from heapq import heapify, heappush, heappop
+from itertools import count
+from typing import Iterable, List, Optional, Union
+import numpy as np
+import pandas as pd
 from pandas import Interval
 from portento.classes import Stream
-from portento.utils import get_start_end
-from .utils import prepare_for_path_computation
+from portento.utils import instant_at_or_after
+from .utils import link_table, window_link_tables, ticks_time_bound, unreached_times, Journeys, hop, \
+    select_results
 
 
-def earliest_arrival_time(stream: Stream, source: Hashable, time_bound: Interval = None):
+def earliest_arrival_time(stream: Stream, source: Hashable, time_bound: Union[Interval, List[Interval]] = None,
+                          return_paths: bool = False, target: Hashable = None):
     """Compute the earliest arrival time from node source to each other node in the predefined time boundaries.
 
     Parameters
@@ -18,34 +26,166 @@ def earliest_arrival_time(stream: Stream, source: Hashable, time_bound: Interval
     source : Node
         The starting node.
 
-    time_bound : Interval
+    time_bound : Interval or list of Interval
         The time to take into account. Needed to perform a time slice over the stream.
         Default is None.
         If time_bound is None, use the whole stream.
+        If time_bound is a list, return a list with the results within each interval: the stream is sliced once for
+        all of them.
+
+    target : Node
+        The ending node. If given, stop as soon as its earliest arrival time is final and return only its result.
+        Default is None.
+
+    return_paths : bool
+        If True, also return the journeys that reach each node at its earliest arrival time.
+        Default is False.
 
     Returns
     -------
     arrival_time : dict
         The dictionary of the form {node : earliest arrival time from source node}
 
+    journeys : Journeys
+        Only if return_paths is True.
+        The mapping of the form {node : journey from source node}
+
     """
     if not (source in stream):
         raise AttributeError("The source node must be present in the stream.")
+    if target is not None and not (target in stream):
+        raise AttributeError("The target node must be present in the stream.")
+
+    time_bound = ticks_time_bound(stream, time_bound)
+    if isinstance(time_bound, list):
+        return [_earliest_arrival_time(stream, source, table, return_paths, target, stream.clock)
+                for table in window_link_tables(stream, time_bound)]
 
     if not time_bound:
         time_bound = stream.stream_presence.root.full_interval
 
-    start, end = get_start_end(time_bound, stream.instant_duration)
+    return _earliest_arrival_time(stream, source, link_table(stream, time_bound), return_paths, target,
+                                  stream.clock)
 
-    arrival_time = dict(((u, start if u == source else float('inf')) for u in stream.nodes))
 
-    for t, nodes in prepare_for_path_computation(stream, [time_bound]):
-        t_plus_trav = t + stream.instant_duration
-        if t_plus_trav <= end and t >= arrival_time[nodes["u"]]:  # already reached the source node
-            if t_plus_trav < arrival_time[nodes["v"]]:  # can improve the arrival time of the target
-                arrival_time[nodes["v"]] = t_plus_trav
+def _earliest_arrival_time(stream, source, table, return_paths, target, clock=None):
+    start = table.start
+
+    arrival_time = dict(((u, start if u == source else float('inf')) for u in stream.nodes))
+    out_links = table.out_links
+    predecessor = {source: None}
 
-        elif t >= end:
+    # the nodes are settled in order of arrival time, as in Dijkstra's algorithm
+    tie_breaker = count()
+    to_visit = [(start, next(tie_breaker), source)]
+    while to_visit:
+        arrival_u, _, u = heappop(to_visit)
+        if arrival_u > arrival_time[u]:  # already settled with an earlier arrival time
+            continue
+        if u == target:
             break
 
-    return arrival_time
+        for first, last, v in out_links.get(u, ()):
+            # the first instant of the link in which u has already been reached
+            t = instant_at_or_after(first, arrival_u, stream.instant_duration)
+            t_plus_trav = t + stream.instant_duration
+            if t <= last and t_plus_trav < arrival_time[v]:  # can improve the arrival time of the target
+                arrival_time[v] = t_plus_trav
+                predecessor[v] = (u, t)
+                heappush(to_visit, (t_plus_trav, next(tie_breaker), v))
+
+    return select_results(arrival_time, Journeys(predecessor, partial(_reconstruct_backwards, predecessor)), target,
+                          return_paths, clock)
+
+
+def _reconstruct_backwards(predecessor, v, pointer):
+    """Follow the pointers of the form (previous node, instant) back to the source
+
+    """
+    journey = []
+    while pointer:
+        u, t = pointer
+        journey.append(hop(u, v, t))
+        v, pointer = u, predecessor[u]
+    return journey[::-1]
+
+
+def earliest_arrival_times(stream: Stream, sources: Optional[Iterable[Hashable]] = None, time_bound: Interval = None):
+    """Compute the earliest arrival time from many source nodes to each other node in the predefined time boundaries.
+
+    The nodes are settled in order of arrival time, as in Dijkstra's algorithm, in a single sweep shared by all the
+    sources: each pair (node, arrival time) is settled once, for all the sources that reach the node at that time.
+
+    Parameters
+    ----------
+    stream : Stream or DiStream.
+
+    sources : Iterable
+        The starting nodes.
+        Default is None.
+        If sources is None, use all the nodes of the stream.
+
+    time_bound : Interval
+        The time to take into account. Needed to perform a time slice over the stream.
+        Default is None.
+        If time_bound is None, use the whole stream.
+
+    Returns
+    -------
+    arrival_times : pandas DataFrame
+        The DataFrame with a row for each source node and a column for each node of the stream.
+
+    """
+    sources = list(stream.nodes) if sources is None else list(sources)
+    if not all(map(stream.__contains__, sources)):
+        raise AttributeError("The source nodes must be present in the stream.")
+
+    time_bound = ticks_time_bound(stream, time_bound)
+    if not time_bound:
+        time_bound = stream.stream_presence.root.full_interval
+
+    table = link_table(stream, time_bound)
+    arrival_times = pd.DataFrame(_earliest_arrival_times(stream, sources, table),
+                                 index=pd.Index(sources, name='source'), columns=table.nodes)
+    return arrival_times.apply(stream.clock.times) if stream.clock else arrival_times
+
+
+def _earliest_arrival_times(stream, sources, table):
+    """The matrix of the earliest arrival times (in the ticks of the stream), with a row for each source and a column
+    for each node of the table. The nodes not reached have the time of unreached_times.
+
+    """
+    idx = dict(((u, i) for i, u in enumerate(table.nodes)))
+    arrival_times = unreached_times(stream, (len(sources), len(table.nodes)))
+    arrival_times[np.arange(len(sources)), [idx[source] for source in sources]] = table.start
+
+    # {(arrival time, node) : rows of the sources that reach the node at that time}, settled in order of time as in
+    # Dijkstra's algorithm. A hop arrives after the time it leaves, so each pair is settled once.
+    to_settle = dict()
+    for row, source in enumerate(sources):
+        to_settle.setdefault((table.start, idx[source]), []).append(row)
+    to_settle = dict(((event, np.array(rows)) for event, rows in to_settle.items()))
+    to_visit = list(to_settle)
+    heapify(to_visit)
+
+    out_links = table.out_links
+    while to_visit:
+        arrival_u, u = heappop(to_visit)
+        rows = to_settle.pop((arrival_u, u))
+        rows = rows[arrival_times[rows, u] == arrival_u]  # the sources that reach u earlier are settled already
+
+        for first, last, v in out_links.get(table.nodes[u], ()):
+            t = instant_at_or_after(first, arrival_u, stream.instant_duration)
+            if t > last:
+                continue
+            t_plus_trav, y = t + stream.instant_duration, idx[v]
+            to_update = rows[t_plus_trav < arrival_times[rows, y]]
+            if len(to_update):
+                arrival_times[to_update, y] = t_plus_trav
+                if (t_plus_trav, y) in to_settle:
+                    to_settle[t_plus_trav, y] = np.concatenate((to_settle[t_plus_trav, y], to_update))
+                else:
+                    to_settle[t_plus_trav, y] = to_update
+                    heappush(to_visit, (t_plus_trav, y))
+
+    return arrival_times
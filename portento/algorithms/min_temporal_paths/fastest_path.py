@@ -1,15 +1,19 @@
+from collections import deque
 from collections.abc import Hashable
-from functools import singledispatch
+from functools import singledispatch, partial
+from heapq import heappush, heappop
+from itertools import count
+from typing import List, Union
 from pandas import Interval
-from operator import itemgetter
-from sortedcontainers import SortedKeyList
 from portento.classes import Stream, DiStream
-from portento.utils import get_start_end
+from portento.utils import get_start_end, instant_at_or_after, count_instants, nth_instant
 from .earliest_arrival import earliest_arrival_time
-from .utils import prepare_for_path_computation, find_le_idx, update_on_new_candidate, filter_out_candidate
+from .utils import prepare_for_path_computation, link_table, window_link_tables, ticks_time_bound, Journeys, hop, \
+    select_results, last_out_instants
 
 
-def fastest_path_duration(stream: Stream, source: Hashable, time_bound: Interval = None):
+def fastest_path_duration(stream: Stream, source: Hashable, time_bound: Union[Interval, List[Interval]] = None,
+                          return_paths: bool = False, target: Hashable = None):
     """Compute the fastest path duration from the source node to each other node in the predefined time boundaries.
 
     Parameters
@@ -19,57 +23,256 @@ def fastest_path_duration(stream: Stream, source: Hashable, time_bound: Interval
     source : Node
         The starting node.
 
-    time_bound : Interval
+    time_bound : Interval or list of Interval
         The time to take into account. Needed to perform a time slice over the stream.
         Default is None.
         If time_bound is None, use the whole stream.
+        If time_bound is a list, return a list with the results within each interval: the stream is sliced once for
+        all of them.
+
+    target : Node
+        The ending node. If given, stop as soon as its fastest path duration is final and return only its result.
+        Default is None.
+
+    return_paths : bool
+        If True, also return the fastest journeys to each node.
+        Default is False.
 
     Returns
     -------
     path_duration : dict
         The dictionary of the form {node : duration of the fastest path from source node}
 
+    journeys : Journeys
+        Only if return_paths is True.
+        The mapping of the form {node : journey from source node}
+
     """
     if not (source in stream):
         raise AttributeError("The source node must be present in the stream.")
+    if target is not None and not (target in stream):
+        raise AttributeError("The target node must be present in the stream.")
+
+    time_bound = ticks_time_bound(stream, time_bound)
+    if isinstance(time_bound, list):
+        return [_fastest_path_duration(stream, source, table, return_paths, target, stream.clock)
+                for table in window_link_tables(stream, time_bound)]
 
     if not time_bound:
         time_bound = stream.stream_presence.root.full_interval
 
-    start, end = get_start_end(time_bound, stream.instant_duration)
+    return _fastest_path_duration(stream, source, link_table(stream, time_bound), return_paths, target,
+                                  stream.clock)
+
+
+def _fastest_path_duration(stream, source, table, return_paths, target, clock=None):
+    instant_duration = stream.instant_duration
     path_duration = dict(((u, 0 if u == source else float('inf')) for u in stream.nodes))
-    pairs_start_arrival_time = dict(((u, SortedKeyList(key=itemgetter(1))) for u in stream.nodes))
+    pointers = {source: None}
+
+    # With a target, the runs to come start no later than the runs that can still make a hop, the ones at a node
+    # with a link whose last instant plus the instant duration is not before the current time: the current time
+    # minus their latest starting time bounds the duration to come. Heap of (-last starting time, last instant).
+    if target is not None:
+        last_out = last_out_instants(table.out_links)
+        can_hop = [(-last_out[source], last_out[source])] if source in last_out else []
+
+    for now, v, run in _sweep_runs(table, source, instant_duration):
+        if run:
+            if run[1] - run[0] < path_duration[v]:
+                path_duration[v] = run[1] - run[0]
+                pointers[v] = (run, 0)
+            if target is not None and v in last_out:
+                heappush(can_hop, (-run[3], last_out[v]))
+
+        if target is not None:
+            while can_hop and can_hop[0][1] + instant_duration < now:
+                heappop(can_hop)
+            if not can_hop or now + can_hop[0][0] >= path_duration[target]:
+                break
+
+    return select_results(path_duration, Journeys(pointers, partial(_reconstruct, instant_duration)), target,
+                          return_paths, clock, durations=True)
+
+
+def _sweep_runs(table, source, instant_duration):
+    """Sweep the links of the table in time order, yielding (time, node, run) after each event, with the run
+    accepted at the node or (time, None, None) if no run is accepted.
+
+    A run (s, a, n) stands for the n pairs (starting time, arrival time) given by (s + k * d, a + k * d), with d the
+    instant duration: a link leaving the source is a single run, and so is the image of a run through any other
+    link. The sweep visits the runs in order of arrival time and the links in order of first instant, a run that
+    arrives at the first instant of a link before the link.
+    The runs accepted at each node hold all the pairs that are not dominated, that is with no other pair that
+    starts later and arrives earlier. They are yielded as (s, a, n, last starting time, last arrival time, origin),
+    the origin being (accepted run of the previous node, previous node, instant of the first hop, index of the pair
+    of the previous run that makes the first hop), with no previous run for the source.
 
-    for t, nodes in prepare_for_path_computation(stream, [time_bound]):
-        t_plus_trav = t + stream.instant_duration
-        if t_plus_trav <= end:
-            u, v = nodes["u"], nodes["v"]
+    """
+    accepted_runs = dict(((u, _AcceptedRuns(instant_duration)) for u in table.nodes))
+    active_links = dict(((u, []) for u in table.nodes))
+    tie_breaker = count()
+    to_visit = []
+
+    def visit(starting, arrival, n, w, origin):
+        heappush(to_visit, (arrival, next(tie_breaker), w, starting, n, origin))
+
+    links = iter(table)
+    link = next(links, None)
+    while to_visit or link:
+        if link and (not to_visit or link[0] < to_visit[0][0]):
+            first, last, u, w = link
+            link = next(links, None)
             if u == source:
-                pairs_start_arrival_time[source].add((t, t))
+                visit(first, first + instant_duration, count_instants(first, last, instant_duration), w,
+                      (None, u, first, 0))
+            else:
+                # the link takes the best pair already arrived and the runs still in progress
+                runs = accepted_runs[u]
+                runs.expire(first)
+                if runs.ended:
+                    visit(runs.ended[3], first + instant_duration, 1, w, (runs.ended, u, first, runs.ended[2] - 1))
+                for run in runs.in_progress:
+                    _visit_through_link(visit, run, u, first, last, w, instant_duration)
+                active_links[u].append((first, last, w))
+            yield first, None, None
+            continue
+
+        arrival_v, _, v, starting_v, n, origin = heappop(to_visit)
+        if v == source:
+            yield arrival_v, None, None
+            continue
+
+        # the leading pairs of the run that are dominated by the runs already accepted
+        n_dominated = accepted_runs[v].count_dominated(starting_v, arrival_v)
+        if n_dominated >= n:
+            yield arrival_v, None, None
+            continue
+        if n_dominated > 0:  # visit the rest of the run when its first arrival time is reached
+            previous_run, u, t, k = origin
+            visit(nth_instant(starting_v, n_dominated, instant_duration),
+                  nth_instant(arrival_v, n_dominated, instant_duration), n - n_dominated, v,
+                  (previous_run, u, nth_instant(t, n_dominated, instant_duration), k + n_dominated))
+            yield arrival_v, None, None
+            continue
+
+        run = accepted_runs[v].add(starting_v, arrival_v, n, origin)
+
+        # the run leaves through the links already started, the other links will take it when they start
+        active_links[v] = [(first, last, w) for first, last, w in active_links[v] if last >= arrival_v]
+        for first, last, w in active_links[v]:
+            _visit_through_link(visit, run, v, first, last, w, instant_duration)
+        yield arrival_v, v, run
+
+
+def _visit_through_link(visit, run, u, first, last, w, instant_duration):
+    starting, arrival, n = run[:3]
+    through_link = _run_through_link(starting, arrival, n, first, last, instant_duration)
+    if through_link:
+        starting_w, arrival_w, n_w, k, t = through_link
+        visit(starting_w, arrival_w, n_w, w, (run, u, t, k))
+
+
+def _reconstruct(instant_duration, v, pointer):
+    """Follow the origins of the runs back to the source, starting from the pair of index k of a run
 
-            pairs_u, pairs_v = pairs_start_arrival_time[u].copy(), pairs_start_arrival_time[v].copy()
+    """
+    journey = []
+    run, k = pointer if pointer else (None, 0)
+    while run:
+        previous_run, u, t, previous_k = run[5]
+        journey.append(hop(u, v, nth_instant(t, k, instant_duration)))
+        v, run, k = u, previous_run, previous_k + k
+    return journey[::-1]
 
-            if len(pairs_u) > 0:
-                # extract the pair with the largest arrival time that is less than or equal to t
-                tuple_idx = find_le_idx(pairs_u, t)
-                starting_u, arrival_u = pairs_u[tuple_idx]
 
-                if arrival_u < t_plus_trav:
-                    starting_v, arrival_v = starting_u, t_plus_trav
+class _AcceptedRuns:
+    """The runs accepted at a node, visited in non-decreasing order of arrival time.
 
-                    # filter out dominated candidates
-                    pairs_u = filter_out_candidate(pairs_u, tuple_idx)
+    The runs still in progress are kept in a deque, the last accepted first. A run is accepted only if the runs in
+    progress do not dominate its first pair, so it is faster than them: the runs at the front that end before it
+    are dominated for the rest of their life and are dropped. Thus the deque is sorted both by duration and by last
+    arrival time, and the runs that are over leave it from the front: only the one with the latest last starting
+    time is kept.
+    Each run is pushed and popped once.
 
-                    # compare selected pair with the tail of pairs in v
-                    pairs_v = update_on_new_candidate(pairs_v, (starting_v, arrival_v))
+    """
 
-                    pairs_start_arrival_time[u], pairs_start_arrival_time[v] = pairs_u, pairs_v
-                    path_duration[v] = min(path_duration[v], arrival_v - starting_v)
+    def __init__(self, instant_duration):
+        self._instant_duration = instant_duration
+        self.in_progress = deque()
+        self.ended = None
 
-        elif t >= end:
-            break
+    def expire(self, t):
+        """Close the runs in progress whose last arrival time is not after t, keeping the one with the latest last
+        starting time.
 
-    return path_duration
+        """
+        while self.in_progress and self.in_progress[0][4] <= t:
+            run = self.in_progress.popleft()
+            if not self.ended or run[3] > self.ended[3]:
+                self.ended = run
+
+    def add(self, starting, arrival, n, origin):
+        """Accept the run, returning it as (starting, arrival, n, last starting, last arrival, origin)
+
+        """
+        run = (starting, arrival, n, nth_instant(starting, n - 1, self._instant_duration),
+               nth_instant(arrival, n - 1, self._instant_duration), origin)
+        while self.in_progress and self._dominates_rest(run, self.in_progress[0]):
+            self.in_progress.popleft()
+        self.in_progress.appendleft(run)
+        return run
+
+    def count_dominated(self, starting, arrival):
+        """Count the leading pairs of the run (starting, arrival, ...) that are dominated by the accepted runs.
+
+        A run dominates either no pair or all the pairs with starting time up to its last starting time.
+        Some dominated pairs may be left out, they will be counted again at a later arrival time.
+
+        """
+        self.expire(arrival)
+        dominating = self.ended[3] if self.ended else float('-inf')
+        if self.in_progress and self._dominates_first(self.in_progress[0], starting, arrival):
+            dominating = max(dominating, self.in_progress[0][3])
+
+        return count_instants(starting, dominating, self._instant_duration) if starting <= dominating else 0
+
+    def _dominates_first(self, run, starting, arrival):
+        """Check if the run dominates the pair (starting, arrival), given that the run starts arriving by arrival.
+
+        """
+        starting_r, arrival_r, n_r = run[:3]
+        # the starting time of the pair of the run that arrives last by arrival
+        k = min(n_r, count_instants(arrival_r, arrival, self._instant_duration)) - 1
+        return starting <= nth_instant(starting_r, k, self._instant_duration)
+
+    def _dominates_rest(self, run, other):
+        """Check if the run dominates all the pairs of the other run from its first arrival time on.
+
+        """
+        if other[3] > run[3]:
+            return False
+        arrival = instant_at_or_after(other[1], run[1], self._instant_duration)
+        k = count_instants(other[1], arrival, self._instant_duration) - 1
+        return self._dominates_first(run, nth_instant(other[0], k, self._instant_duration), arrival)
+
+
+def _run_through_link(starting, arrival, n, first, last, instant_duration):
+    """The run of the pairs that cross the link with instants from first to last, with the index of the pair of
+    the given run that makes the first hop and its instant, or None.
+
+    The pairs that arrive by the first instant all leave at the first instant: only the one with the latest
+    starting time is kept.
+
+    """
+    k = min(n, count_instants(arrival, first, instant_duration)) - 1 if arrival < first else 0
+    t = instant_at_or_after(first, nth_instant(arrival, k, instant_duration), instant_duration)
+    if t > last:
+        return None
+
+    return (nth_instant(starting, k, instant_duration), t + instant_duration,
+            min(n - k, count_instants(t, last, instant_duration)), k, t)
 
 
 @singledispatch
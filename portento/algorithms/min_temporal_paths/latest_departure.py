@@ -1,11 +1,19 @@
 from collections.abc import Hashable
+from functools import partial
+from heapq import heapify, heappush, heappop
+from itertools import count
+from typing import Iterable, List, Optional, Union
+import numpy as np
+import pandas as pd
 from pandas import Interval
 from portento.classes import Stream
-from portento.utils import get_start_end
-from .utils import prepare_for_path_computation
+from portento.utils import instant_at_or_before
+from .utils import link_table, window_link_tables, ticks_time_bound, unreached_times, Journeys, hop, \
+    select_results
 
 
-def latest_departure_time(stream: Stream, target: Hashable, time_bound: Interval = None):
+def latest_departure_time(stream: Stream, target: Hashable, time_bound: Union[Interval, List[Interval]] = None,
+                          return_paths: bool = False, source: Hashable = None):
     """Compute the latest departure time from each node to the target node in the predefined time boundaries.
 
     Parameters
@@ -15,33 +23,171 @@ def latest_departure_time(stream: Stream, target: Hashable, time_bound: Interval
     target : Node
         The ending node.
 
-    time_bound : Interval
+    time_bound : Interval or list of Interval
         The time to take into account. Needed to perform a time slice over the stream.
         Default is None.
         If time_bound is None, use the whole stream.
+        If time_bound is a list, return a list with the results within each interval: the stream is sliced once for
+        all of them.
+
+    source : Node
+        The starting node. If given, stop as soon as its latest departure time is final and return only its result.
+        Default is None.
+
+    return_paths : bool
+        If True, also return the journeys that leave each node at its latest departure time.
+        Default is False.
 
     Returns
     -------
     departure_time : dict
         The dictionary of the form {node : latest departure time to reach target node}
 
+    journeys : Journeys
+        Only if return_paths is True.
+        The mapping of the form {node : journey to target node}
+
     """
     if not (target in stream):
         raise AttributeError("The target node must be present in the stream.")
+    if source is not None and not (source in stream):
+        raise AttributeError("The source node must be present in the stream.")
+
+    time_bound = ticks_time_bound(stream, time_bound)
+    if isinstance(time_bound, list):
+        return [_latest_departure_time(stream, target, table, return_paths, source, stream.clock)
+                for table in window_link_tables(stream, time_bound)]
 
     if not time_bound:
         time_bound = stream.stream_presence.root.full_interval
 
-    start, end = get_start_end(time_bound, stream.instant_duration)
+    return _latest_departure_time(stream, target, link_table(stream, time_bound), return_paths, source,
+                                  stream.clock)
+
+
+def _latest_departure_time(stream, target, table, return_paths, source, clock=None):
+    start, end = table.start, table.end
 
     departure_time = dict(((u, end if u == target else float('-inf')) for u in stream.nodes))
+    in_links = table.in_links
+    successor = {target: None}
 
-    for t, nodes in prepare_for_path_computation(stream, [time_bound], reverse=True):
-        if t >= start:
-            if t + stream.instant_duration <= departure_time[nodes["v"]]:
-                if t > departure_time[nodes["u"]]:
-                    departure_time[nodes["u"]] = t
-        else:
+    # the nodes are settled in reverse order of departure time, as in Dijkstra's algorithm run backwards
+    tie_breaker = count()
+    to_visit = [(-end, next(tie_breaker), target)]
+    while to_visit:
+        departure_v, _, v = heappop(to_visit)
+        departure_v = -departure_v
+        if departure_v < departure_time[v]:  # already settled with a later departure time
+            continue
+        if v == source:
             break
 
-    return departure_time
+        for first, last, u in in_links.get(v, ()):
+            # the last instant of the link from which v is reached in time
+            t = instant_at_or_before(first, min(last, departure_v - stream.instant_duration),
+                                     stream.instant_duration)
+            if t >= max(first, start) and t > departure_time[u]:
+                departure_time[u] = t
+                successor[u] = (v, t)
+                heappush(to_visit, (-t, next(tie_breaker), u))
+
+    return select_results(departure_time, Journeys(successor, partial(_reconstruct_forwards, successor)), source,
+                          return_paths, clock)
+
+
+def _reconstruct_forwards(successor, u, pointer):
+    """Follow the pointers of the form (next node, instant) up to the target
+
+    """
+    journey = []
+    while pointer:
+        v, t = pointer
+        journey.append(hop(u, v, t))
+        u, pointer = v, successor[v]
+    return journey
+
+
+def latest_departure_times(stream: Stream, targets: Optional[Iterable[Hashable]] = None, time_bound: Interval = None):
+    """Compute the latest departure time from each node to many target nodes in the predefined time boundaries.
+
+    The nodes are settled in reverse order of departure time, as in Dijkstra's algorithm run backwards, in a single
+    sweep shared by all the targets: each pair (node, departure time) is settled once, for all the targets that the
+    node reaches leaving at that time.
+
+    Parameters
+    ----------
+    stream : Stream or DiStream.
+
+    targets : Iterable
+        The ending nodes.
+        Default is None.
+        If targets is None, use all the nodes of the stream.
+
+    time_bound : Interval
+        The time to take into account. Needed to perform a time slice over the stream.
+        Default is None.
+        If time_bound is None, use the whole stream.
+
+    Returns
+    -------
+    departure_times : pandas DataFrame
+        The DataFrame with a row for each target node and a column for each node of the stream.
+
+    """
+    targets = list(stream.nodes) if targets is None else list(targets)
+    if not all(map(stream.__contains__, targets)):
+        raise AttributeError("The target nodes must be present in the stream.")
+
+    time_bound = ticks_time_bound(stream, time_bound)
+    if not time_bound:
+        time_bound = stream.stream_presence.root.full_interval
+
+    table = link_table(stream, time_bound)
+    departure_times = pd.DataFrame(_latest_departure_times(stream, targets, table),
+                                   index=pd.Index(targets, name='target'), columns=table.nodes)
+    return departure_times.apply(stream.clock.times) if stream.clock else departure_times
+
+
+def _latest_departure_times(stream, targets, table):
+    """The matrix of the latest departure times (in the ticks of the stream), with a row for each target and a column
+    for each node of the table. The nodes that do not reach the target have the time of unreached_times.
+
+    """
+    idx = dict(((u, i) for i, u in enumerate(table.nodes)))
+    departure_times = unreached_times(stream, (len(targets), len(table.nodes)), latest=True)
+    departure_times[np.arange(len(targets)), [idx[target] for target in targets]] = table.end
+
+    # {(-departure time, node) : rows of the targets reached leaving the node at that time}, settled in reverse order
+    # of time as in Dijkstra's algorithm run backwards. A hop leaves before the time it arrives, so each pair is
+    # settled once.
+    to_settle = dict()
+    for row, target in enumerate(targets):
+        to_settle.setdefault((-table.end, idx[target]), []).append(row)
+    to_settle = dict(((event, np.array(rows)) for event, rows in to_settle.items()))
+    to_visit = list(to_settle)
+    heapify(to_visit)
+
+    in_links = table.in_links
+    while to_visit:
+        departure_v, v = heappop(to_visit)
+        rows = to_settle.pop((departure_v, v))
+        departure_v = -departure_v
+        rows = rows[departure_times[rows, v] == departure_v]  # the targets reached leaving v later are settled already
+
+        for first, last, u in in_links.get(table.nodes[v], ()):
+            # the last instant of the link from which v is reached in time
+            t = instant_at_or_before(first, min(last, departure_v - stream.instant_duration), stream.instant_duration)
+            if t < max(first, table.start):
+                continue
+            x = idx[u]
+            to_update = rows[t > departure_times[rows, x]]
+            if len(to_update):
+                departure_times[to_update, x] = t
+                if (-t, x) in to_settle:
+                    to_settle[-t, x] = np.concatenate((to_settle[-t, x], to_update))
+                else:
+                    to_settle[-t, x] = to_update
+                    heappush(to_visit, (-t, x))
+
+    return departure_times
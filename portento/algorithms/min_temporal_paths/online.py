@@ -0,0 +1,204 @@
+from collections.abc import Hashable
+from heapq import heappush, heappop
+from typing import Iterable
+import pandas as pd
+from pandas import Interval
+from sortedcontainers import SortedKeyList
+from portento.classes import Stream, DiStream
+from portento.utils import Link, cut_interval, contains_interval, instants_bounds, instant_at_or_after, \
+    instant_at_or_before, nth_instant
+from portento.utils.intervals_functions import _left_tuple
+from .utils import ticks_time_bound
+
+
+class OnlineEarliestArrival:
+    """Earliest arrival times from a set of source nodes, kept up to date while links are added to the stream.
+
+    The object subscribes to the add method of the stream. A new link can only make the arrival times earlier: the
+    arrival time through the link is computed from the arrival time of its first node and, if it improves, the
+    improvement is propagated with a Dijkstra visit that stops at the nodes that do not improve. Links added in time
+    order leave from nodes already reached and end after the other links, so the visit stops right away; a link added
+    out of order only revisits the nodes that it makes reachable earlier.
+    When the added link is merged with a link of the stream whose instants lie on a different grid, the instants of
+    the older link are lost and the arrival times are computed again from scratch.
+
+    Parameters
+    ----------
+    stream : Stream or DiStream.
+
+    sources : Iterable
+        The starting nodes.
+
+    time_bound : Interval
+        The time to take into account. It may have an infinite right side, or Timestamp bounds if the stream has a
+        clock.
+        Default is None.
+        If time_bound is None, use the time from the start of the stream on.
+
+    """
+
+    def __init__(self, stream: Stream, sources: Iterable[Hashable], time_bound: Interval = None):
+        self._sources = list(sources)
+        if not all(map(stream.__contains__, self._sources)):
+            raise AttributeError("The source nodes must be present in the stream.")
+
+        time_bound = ticks_time_bound(stream, time_bound)
+        if not time_bound:
+            full_interval = stream.stream_presence.root.full_interval
+            time_bound = Interval(full_interval.left, float('inf'), 'left' if full_interval.closed_left else 'neither')
+
+        self._stream = stream
+        self._instant_duration = stream.instant_duration
+        self._time_bound = time_bound
+        self._start, self._end = _start_end(time_bound, self._instant_duration)
+
+        # {(u, v) : {merged interval of the stream : (first, last)}} and {u : [(first, last, v), ...] sorted by last}
+        self._intervals = dict()
+        self._out_links = dict()
+        for u, adj in stream.edges.items():
+            for v, links in adj.items():
+                for interval in links.interval_tree:
+                    self._add_interval(u, v, interval)
+
+        self._arrival = dict()
+        self._recompute()
+        stream.add_listener(self._on_add)
+
+    @property
+    def sources(self):
+        return self._sources
+
+    @property
+    def arrival_times(self):
+        """pandas DataFrame with a row for each source node and a column for each node of the stream, with Timestamps
+        (NaT if the node is not reached) if the stream has a clock
+
+        """
+        nodes = list(self._stream.nodes)
+        arrival_times = pd.DataFrame([[self._arrival[source].get(u, float('inf')) for u in nodes]
+                                      for source in self._sources],
+                                     index=pd.Index(self._sources, name='source'), columns=nodes)
+        return arrival_times.apply(self._stream.clock.times) if self._stream.clock else arrival_times
+
+    def arrival_time(self, source: Hashable):
+        """dict of the form {node : earliest arrival time from source node}, with Timestamps (NaT if the node is not
+        reached) if the stream has a clock
+
+        """
+        if source not in self._arrival:
+            raise AttributeError("The node is not a source.")
+        arrival_time = dict(((u, self._arrival[source].get(u, float('inf'))) for u in self._stream.nodes))
+        if self._stream.clock:
+            arrival_time = dict(((u, self._stream.clock.time(t)) for u, t in arrival_time.items()))
+        return arrival_time
+
+    def close(self):
+        """Stop following the stream.
+
+        """
+        self._stream.remove_listener(self._on_add)
+
+    def _on_add(self, link: Link):
+        interval = _merged_interval(self._stream.edges[link.u][link.v].interval_tree, link.interval)
+        if not self._add_interval(link.u, link.v, interval):
+            self._recompute()
+            return
+
+        bounds = self._instants_bounds(interval)
+        if bounds:
+            first, last = bounds
+            for u, v in self._orientations(link.u, link.v):
+                for arrival in self._arrival.values():
+                    t = arrival.get(u, float('inf'))
+                    if t <= last and instant_at_or_after(first, t, self._instant_duration) + self._instant_duration \
+                            < arrival.get(v, float('inf')):
+                        arrival[v] = instant_at_or_after(first, t, self._instant_duration) + self._instant_duration
+                        self._propagate(arrival, [(arrival[v], v)])
+
+    def _add_interval(self, u, v, interval):
+        """Store the merged interval of (u, v), replacing the intervals merged into it.
+        Return False if the instants of a replaced interval are not instants of the merged one.
+
+        """
+        intervals = self._intervals.setdefault((u, v), dict())
+        bounds = self._instants_bounds(interval)
+        same_grid = True
+        for merged in [other for other in intervals if contains_interval(interval, other)]:
+            merged_bounds = intervals.pop(merged)
+            if merged_bounds:
+                same_grid = same_grid and bounds is not None and \
+                    _grid(merged_bounds[0], self._instant_duration) == _grid(bounds[0], self._instant_duration)
+                for x, y in self._orientations(u, v):
+                    self._out_links[x].remove((*merged_bounds, y))
+
+        intervals[interval] = bounds
+        if bounds:
+            for x, y in self._orientations(u, v):
+                self._out_links.setdefault(x, SortedKeyList(key=lambda link: link[1])).add((*bounds, y))
+
+        return same_grid
+
+    def _recompute(self):
+        for source in self._sources:
+            self._arrival[source] = {source: self._start}
+            self._propagate(self._arrival[source], [(self._start, source)])
+
+    def _propagate(self, arrival, to_visit):
+        """Dijkstra visit of the nodes whose arrival time improves, from the nodes to visit.
+
+        """
+        while to_visit:
+            t, u = heappop(to_visit)
+            if t > arrival[u] or u not in self._out_links:
+                continue
+            for first, last, v in self._out_links[u].irange_key(min_key=t):
+                t_v = instant_at_or_after(first, t, self._instant_duration)
+                if t_v + self._instant_duration < arrival.get(v, float('inf')):
+                    arrival[v] = t_v + self._instant_duration
+                    heappush(to_visit, (arrival[v], v))
+
+    def _orientations(self, u, v):
+        return ((u, v),) if isinstance(self._stream, DiStream) else ((u, v), (v, u))
+
+    def _instants_bounds(self, interval):
+        """The first and last instant of the interval within the time bound from which a hop ends within it, or None
+
+        """
+        if not interval.overlaps(self._time_bound):
+            return None
+        bounds = instants_bounds(cut_interval(interval, self._time_bound), self._instant_duration)
+        if not bounds:
+            return None
+
+        first, last = bounds
+        if self._end < float('inf'):
+            last = min(last, instant_at_or_before(first, self._end - self._instant_duration, self._instant_duration))
+        return (first, last) if first <= last else None
+
+
+def _start_end(time_bound, instant_duration):
+    if time_bound.right == float('inf'):
+        return (time_bound.left if time_bound.closed_left else nth_instant(time_bound.left, 1, instant_duration)), \
+            float('inf')
+
+    bounds = instants_bounds(time_bound, instant_duration)
+    if not bounds:
+        raise AttributeError("The time bound must contain at least an instant.")
+    return bounds
+
+
+def _grid(first, instant_duration):
+    """The instant at or before 0 of the instants first + k * instant_duration
+
+    """
+    return instant_at_or_before(first, 0, instant_duration)
+
+
+def _merged_interval(tree, interval):
+    """The interval of the tree that contains the given one.
+
+    """
+    node = tree.root
+    while not contains_interval(node.value, interval):
+        node = node.left if _left_tuple(interval) < _left_tuple(node.value) else node.right
+    return node.value
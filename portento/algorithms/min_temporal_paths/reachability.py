@@ -0,0 +1,194 @@
+from bisect import bisect_left
+from collections.abc import Hashable
+from heapq import heappush, heappop
+from itertools import accumulate
+from typing import Optional
+from pandas import Interval
+from portento.classes import Stream
+from portento.utils import map_shared, instants_bounds, instant_at_or_after, instant_at_or_before, count_instants, \
+    nth_instant
+from .earliest_arrival import _earliest_arrival_time
+from .fastest_path import _sweep_runs
+from .utils import link_table, ticks_time_bound
+
+
+class ReachabilityIndex:
+    """Index of the temporal reachability of a stream, answering repeated "can u reach v within an interval" queries
+    without a path computation each.
+
+    The label of each pair of nodes (u, v) is the profile of the journeys from u to v: the runs of pairs (starting
+    time, arrival time) accepted by the fastest path sweep from u, which hold all the pairs that are not dominated.
+    The index is built with one sweep for each node, its size is the number of runs stored.
+    A query looks for a journey that starts and arrives within the interval with a binary search on the label.
+    The instants of a link cut by the left side of the interval are counted from there: when they are not the
+    instants of the link, the query falls back to earliest_arrival_time.
+    The index is not updated when links are added to the stream.
+
+    Parameters
+    ----------
+    stream : Stream or DiStream.
+
+    workers : int
+        Number of processes used to build the index. Default is None, that is the number of CPUs.
+        If workers is 1, the computation is serial.
+
+    chunksize : int
+        The number of nodes sent to a worker at once. Default is None, that lets multiprocessing choose it.
+
+    """
+
+    def __init__(self, stream: Stream, workers: Optional[int] = None, chunksize: Optional[int] = None):
+        self._stream = stream
+        self._instant_duration = stream.instant_duration
+        self._nodes = set(stream.nodes)
+
+        self._grids = _instant_grids(stream)
+        link_table(stream, _index_time_bound(stream))
+        sources = list(stream.nodes)
+        self._labels = dict(zip(sources, map_shared(_labels_from_source, stream, sources, workers, chunksize)))
+
+    @property
+    def size(self):
+        """The number of runs stored in the labels.
+
+        """
+        return sum(len(label) for labels in self._labels.values() for label in labels.values())
+
+    def reachable(self, u: Hashable, v: Hashable, interval: Interval = None):
+        """Check if there is a journey from u to v that starts and arrives within the interval.
+
+        The result is the same as checking that the earliest arrival time from u to v within the interval is finite.
+
+        Parameters
+        ----------
+        u : Node
+            The starting node.
+
+        v : Node
+            The ending node.
+
+        interval : Interval
+            It may have Timestamp bounds if the stream has a clock.
+            Default is None.
+            If interval is None, use the whole stream.
+
+        Returns
+        -------
+        reachable : bool
+
+        """
+        if not (u in self._nodes and v in self._nodes):
+            raise AttributeError("The nodes must be present in the stream.")
+        if u == v:
+            return True
+
+        interval = ticks_time_bound(self._stream, interval)
+        if not interval:
+            interval = self._stream.stream_presence.root.full_interval
+
+        bounds = instants_bounds(interval, self._instant_duration)
+        if not bounds:
+            return False
+
+        start, end = bounds
+        if not self._grids <= {instant_at_or_before(start, 0, self._instant_duration)}:
+            return _earliest_arrival_time(self._stream, u, link_table(self._stream, interval), False, v) < float('inf')
+
+        label = self._labels[u].get(v)
+        return label is not None and label.earliest_arrival(start) <= end
+
+
+def _index_time_bound(stream):
+    """The whole stream, extended on the right side so that the hops made in its last instants are kept.
+
+    """
+    full_interval = stream.stream_presence.root.full_interval
+    return Interval(full_interval.left, full_interval.right + 2 * stream.instant_duration, 'both')
+
+
+def _instant_grids(stream):
+    """The grids of instants of the links, each one given by its instant at or before 0.
+
+    """
+    instant_duration = stream.instant_duration
+    return set(instant_at_or_before(interval.left if interval.closed_left
+                                    else nth_instant(interval.left, 1, instant_duration), 0, instant_duration)
+               for adj in stream.edges.values() for links in adj.values() for interval in links.interval_tree)
+
+
+def _labels_from_source(stream, source):
+    table = link_table(stream, _index_time_bound(stream))
+    runs = dict()
+    for _, v, run in _sweep_runs(table, source, stream.instant_duration):
+        if run:
+            runs.setdefault(v, []).append(run[:4])
+
+    return dict(((v, _Label(v_runs, stream.instant_duration)) for v, v_runs in runs.items()))
+
+
+class _Label:
+    """The runs (starting, arrival, n, last starting) of the journeys between two nodes, for earliest arrival
+    queries.
+
+    The runs that start at or after the query time give their first arrival time: they are kept sorted by starting
+    time, with the minimum arrival time of each suffix.
+    The runs that start before the query time and end at or after it give the arrival time of their first pair that
+    starts at or after it. Their pairs are spaced by the instant duration, so they are grouped by the grid of
+    instants they lie on: in a group, the first pair of each run is at the same instant and the fastest run gives the
+    earliest arrival. For each group, the fastest run is found for each segment (left, right] between the starting
+    times of the runs.
+
+    """
+
+    def __init__(self, runs, instant_duration):
+        self._instant_duration = instant_duration
+        self._n_runs = len(runs)
+
+        runs = sorted(runs)
+        self._starting = [run[0] for run in runs]
+        self._min_arrival = list(accumulate((run[1] for run in reversed(runs)), min))[::-1]
+
+        grids = dict()
+        for run in runs:
+            grids.setdefault(instant_at_or_before(run[0], 0, instant_duration), []).append(run)
+        self._grids = [_fastest_run_segments(grid_runs) for grid_runs in grids.values()]
+
+    def __len__(self):
+        return self._n_runs
+
+    def earliest_arrival(self, t):
+        """The earliest arrival time of the pairs that start at or after t, or inf.
+
+        """
+        i = bisect_left(self._starting, t)
+        arrival = self._min_arrival[i] if i < len(self._starting) else float('inf')
+
+        for anchor, bounds, fastest in self._grids:
+            i = bisect_left(bounds, t)
+            if 0 < i < len(bounds) and fastest[i - 1]:
+                starting, arrival_r = fastest[i - 1]
+                t_r = instant_at_or_after(anchor, t, self._instant_duration)
+                arrival = min(arrival, nth_instant(arrival_r, count_instants(starting, t_r, self._instant_duration) - 1,
+                                                   self._instant_duration))
+        return arrival
+
+
+def _fastest_run_segments(runs):
+    """The bounds of the segments (left, right] between the starting times and the last starting times of the runs,
+    with the (starting, arrival) of the fastest run that starts before the segment and ends within or after it.
+
+    """
+    bounds = sorted(set(bound for run in runs for bound in (run[0], run[3])))
+    fastest = []
+    candidates = []
+    i = 0
+    for left, right in zip(bounds, bounds[1:]):
+        while i < len(runs) and runs[i][0] <= left:
+            starting, arrival, _, last_starting = runs[i]
+            heappush(candidates, (arrival - starting, last_starting, starting, arrival))
+            i += 1
+        while candidates and candidates[0][1] < right:
+            heappop(candidates)
+        fastest.append(candidates[0][2:] if candidates else None)
+
+    return runs[0][0], bounds, fastest
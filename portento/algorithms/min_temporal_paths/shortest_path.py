@@ -1,13 +1,16 @@
 from collections.abc import Hashable
+from heapq import heappush, heappop
+from itertools import count
+from typing import List, Union
 from pandas import Interval
-from operator import itemgetter
-from sortedcontainers import SortedKeyList
 from portento.classes import Stream
-from portento.utils import get_start_end
-from .utils import prepare_for_path_computation, update_on_new_candidate, get_idx_filtered_candidates
+from portento.utils import instant_at_or_after
+from .utils import link_table, window_link_tables, ticks_time_bound, Journeys, hop, select_results, \
+    last_out_instants
 
 
-def shortest_path_distance(stream: Stream, source: Hashable, time_bound: Interval = None):
+def shortest_path_distance(stream: Stream, source: Hashable, time_bound: Union[Interval, List[Interval]] = None,
+                           return_paths: bool = False, target: Hashable = None):
     """Compute the distance (number of hops in the shortest path) from source node to each other node
     in the predefined time boundaries.
 
@@ -18,55 +21,109 @@ def shortest_path_distance(stream: Stream, source: Hashable, time_bound: Interva
     source : Node
         The starting node.
 
-    time_bound : Interval
+    time_bound : Interval or list of Interval
         The time to take into account. Needed to perform a time slice over the stream.
         Default is None.
         If time_bound is None, use the whole stream.
+        If time_bound is a list, return a list with the results within each interval: the stream is sliced once for
+        all of them.
+
+    target : Node
+        The ending node. If given, stop as soon as its distance is final and return only its result.
+        Default is None.
+
+    return_paths : bool
+        If True, also return the shortest journeys to each node.
+        Default is False.
 
     Returns
     -------
     distance : dict
         The dictionary of the form {node : distance from the source}
 
+    journeys : Journeys
+        Only if return_paths is True.
+        The mapping of the form {node : journey from source node}
+
     """
     if not (source in stream):
         raise AttributeError("The source node must be present in the stream.")
+    if target is not None and not (target in stream):
+        raise AttributeError("The target node must be present in the stream.")
+
+    time_bound = ticks_time_bound(stream, time_bound)
+    if isinstance(time_bound, list):
+        return [_shortest_path_distance(stream, source, table, return_paths, target, stream.clock)
+                for table in window_link_tables(stream, time_bound)]
 
     if not time_bound:
         time_bound = stream.stream_presence.root.full_interval
 
-    start, end = get_start_end(time_bound, stream.instant_duration)
-    path_distance = dict(((u, 0 if u == source else float('inf')) for u in stream.nodes))
-    pairs_distance_arrival_time = dict(((u, SortedKeyList(key=itemgetter(0))) for u in stream.nodes))
-
-    for t, nodes in prepare_for_path_computation(stream, [time_bound]):
-        t_plus_trav = t + stream.instant_duration
-        if t_plus_trav <= end:
-            u, v = nodes["u"], nodes["v"]
-            if u == source:
-                pairs_distance_arrival_time[source].add((0, t))
+    return _shortest_path_distance(stream, source, link_table(stream, time_bound), return_paths, target,
+                                   stream.clock)
 
-            pairs_u, pairs_v = pairs_distance_arrival_time[u].copy(), pairs_distance_arrival_time[v].copy()
 
-            if len(pairs_u) > 0:
-                # extract the pair with the largest arrival time that is less than or equal to t
-                tuple_idx, to_remove_idx = get_idx_filtered_candidates(pairs_u, t)
-                distance_u, arrival_u = pairs_u[tuple_idx]
-
-                if arrival_u < t_plus_trav:
-                    distance_v, arrival_v = distance_u + stream.instant_duration, t_plus_trav
-
-                    # filter out dominated candidates
-                    for i in to_remove_idx:
-                        pairs_u.pop(i)
-
-                    # compare selected pair with the tail of pairs in v
-                    pairs_v = update_on_new_candidate(pairs_v, (distance_v, arrival_v), neg=False)
-
-                    pairs_distance_arrival_time[u], pairs_distance_arrival_time[v] = pairs_u, pairs_v
-                    path_distance[v] = min(path_distance[v], distance_v)
-
-        elif t >= end:
-            break
+def _shortest_path_distance(stream, source, table, return_paths, target, clock=None):
+    path_distance = dict(((u, 0 if u == source else float('inf')) for u in stream.nodes))
 
-    return path_distance
+    # The sweep visits the (distance, arrival time) candidates in order of arrival time and the links in order of
+    # first instant, a candidate that arrives at the first instant of a link before the link. Among the candidates
+    # already arrived at a node, the last accepted one has the smallest distance: the Pareto frontier of a node
+    # reduces to its current distance, and a candidate is accepted only if it improves it.
+    # the pointer of a candidate is (pointer of the previous node, previous node, instant), None for the source
+    pointers = {source: None}
+    active_links = dict(((u, []) for u in stream.nodes))
+    tie_breaker = count()
+    to_visit = []
+
+    # With a target, the candidates to come are bounded by the nodes that can still make a hop, the ones with a link
+    # whose last instant plus the instant duration is not before the current time: (distance + 1 hop, last instant).
+    if target is not None:
+        last_out = last_out_instants(table.out_links)
+        can_hop = [(stream.instant_duration, last_out[source])] if source in last_out else []
+
+    links = iter(table)
+    link = next(links, None)
+    while to_visit or link:
+        if target is not None:
+            now = min(link[0] if link else float('inf'), to_visit[0][0] if to_visit else float('inf'))
+            while can_hop and can_hop[0][1] + stream.instant_duration < now:
+                heappop(can_hop)
+            if not can_hop or can_hop[0][0] >= path_distance[target]:
+                break
+
+        if link and (not to_visit or link[0] < to_visit[0][0]):
+            first, last, u, w = link
+            link = next(links, None)
+            if path_distance[u] < float('inf'):  # u has already been reached
+                heappush(to_visit, (first + stream.instant_duration, next(tie_breaker), w,
+                                    path_distance[u] + stream.instant_duration, (pointers[u], u, first)))
+            active_links[u].append((first, last, w))
+            continue
+
+        arrival_v, _, v, distance_v, pointer = heappop(to_visit)
+        if distance_v >= path_distance[v]:  # dominated by a candidate arrived before
+            continue
+
+        path_distance[v] = distance_v
+        pointers[v] = pointer
+        if target is not None and v in last_out:
+            heappush(can_hop, (distance_v + stream.instant_duration, last_out[v]))
+        # the candidate leaves through the links already started, the other links will take it when they start
+        active_links[v] = [(first, last, w) for first, last, w in active_links[v] if last >= arrival_v]
+        for first, last, w in active_links[v]:
+            t = instant_at_or_after(first, arrival_v, stream.instant_duration)
+            heappush(to_visit, (t + stream.instant_duration, next(tie_breaker), w,
+                                distance_v + stream.instant_duration, (pointer, v, t)))
+
+    return select_results(path_distance, Journeys(pointers, _reconstruct), target, return_paths, clock,
+                          durations=True)
+
+
+def _reconstruct(v, pointer):
+    journey = []
+    while pointer:
+        pointer, u, t = pointer
+        journey.append(hop(u, v, t))
+        v = u
+    return journey[::-1]
@@ -1,12 +1,16 @@
 import pytest
-from pandas import Interval
+import pandas as pd
+from pandas import Interval, Timestamp, Timedelta
 from .random_stream import generate_stream
 from portento.classes import Stream, DiStream
 from portento.utils import Link, DiLink
-from portento.algorithms.min_temporal_paths.earliest_arrival import earliest_arrival_time
-from portento.algorithms.min_temporal_paths.latest_departure import latest_departure_time
+from portento.algorithms.min_temporal_paths.earliest_arrival import earliest_arrival_time, earliest_arrival_times
+from portento.algorithms.min_temporal_paths.latest_departure import latest_departure_time, latest_departure_times
 from portento.algorithms.min_temporal_paths.fastest_path import fastest_path_duration, fastest_path_duration_multipass
 from portento.algorithms.min_temporal_paths.shortest_path import shortest_path_distance
+from portento.algorithms.min_temporal_paths.batch import batch
+from portento.algorithms.min_temporal_paths.reachability import ReachabilityIndex
+from portento.algorithms.min_temporal_paths.online import OnlineEarliestArrival
 
 
 class TestMinPaths:
@@ -103,7 +107,8 @@ class TestMinPaths:
         ([(DiLink(Interval(9, 11), 0, 2)), DiLink(Interval(0, 2), 0, 1), DiLink(Interval(1, 3), 1, 2)], 0, 2, 1),
         ([(DiLink(Interval(9, 11), 0, 2)), DiLink(Interval(0, 2), 1, 0), DiLink(Interval(1, 3), 1, 2)],
          0, 1, float('inf')),
-        ([DiLink(Interval(0, 2), 0, 1), DiLink(Interval(1, 3), 1, 2)], 0, 2, 2)
+        ([DiLink(Interval(0, 2), 0, 1), DiLink(Interval(1, 3), 1, 2)], 0, 2, 2),
+        ([DiLink(Interval(0, 2), 0, 1), DiLink(Interval(1, 3), 1, 2), DiLink(Interval(5, 7), 0, 2)], 0, 2, 1)
     ])
     def test_shortest_path_di_stream(self, links, source, target, res):
         stream = DiStream(links)
@@ -121,3 +126,271 @@ class TestMinPaths:
     def test_shortest_path_stream(self, links, source, target, res):
         stream = Stream(links)
         assert shortest_path_distance(stream, source)[target] == res
+
+    def test_long_links(self):
+        stream = DiStream([DiLink(Interval(0, 1000), 0, 1), DiLink(Interval(500.5, 600), 1, 2),
+                           DiLink(Interval(550, 1000), 0, 2)], instant_duration=0.5)
+        assert earliest_arrival_time(stream, 0) == {0: 0.5, 1: 1.0, 2: 501.5}
+        assert latest_departure_time(stream, 2) == {0: 999.5, 1: 600, 2: 1000}
+        assert fastest_path_duration(stream, 0) == {0: 0, 1: 0.5, 2: 0.5}
+        assert shortest_path_distance(stream, 0) == {0: 0, 1: 0.5, 2: 0.5}
+
+    @pytest.mark.parametrize('stream_type,link_type', [(DiStream, DiLink), (Stream, Link)])
+    @pytest.mark.parametrize('s', list(range(5)))
+    def test_earliest_arrival_times(self, stream_type, link_type, s):
+        stream = generate_stream(stream_type, link_type, s, n_links=50, t_range=range(20), u_range=range(10))
+        arrival_times = earliest_arrival_times(stream)
+        assert list(arrival_times.index) == list(arrival_times.columns) == list(stream.nodes)
+        for source in stream.nodes:
+            assert arrival_times.loc[source].to_dict() == earliest_arrival_time(stream, source)
+
+        time_bound = Interval(5, 15, 'both')
+        sources = list(stream.nodes)[:3]
+        arrival_times = earliest_arrival_times(stream, sources, time_bound)
+        for source in sources:
+            assert arrival_times.loc[source].to_dict() == earliest_arrival_time(stream, source, time_bound)
+
+    @pytest.mark.parametrize('stream_type,link_type', [(DiStream, DiLink), (Stream, Link)])
+    @pytest.mark.parametrize('s', list(range(5)))
+    def test_latest_departure_times(self, stream_type, link_type, s):
+        stream = generate_stream(stream_type, link_type, s, n_links=50, t_range=range(20), u_range=range(10))
+        departure_times = latest_departure_times(stream)
+        for target in stream.nodes:
+            assert departure_times.loc[target].to_dict() == latest_departure_time(stream, target)
+
+        time_bound = Interval(5, 15, 'both')
+        targets = list(stream.nodes)[:3]
+        departure_times = latest_departure_times(stream, targets, time_bound)
+        for target in targets:
+            assert departure_times.loc[target].to_dict() == latest_departure_time(stream, target, time_bound)
+
+    @pytest.mark.parametrize('stream_type,link_type', [(DiStream, DiLink), (Stream, Link)])
+    def test_many_sources_chain(self, stream_type, link_type):
+        # the link (i, i + 1) starts before the link (i - 1, i) and is used after it: a sweep of the links in order of
+        # first instant improves a single node at each pass
+        n = 200
+        stream = stream_type([link_type(Interval(n - i, 3 * n - i, 'both'), i, i + 1) for i in range(n)])
+        arrival_times = earliest_arrival_times(stream)
+        departure_times = latest_departure_times(stream)
+        for u in stream.nodes:
+            assert arrival_times.loc[u].to_dict() == earliest_arrival_time(stream, u)
+            assert departure_times.loc[u].to_dict() == latest_departure_time(stream, u)
+        assert arrival_times.loc[0, n] == n + n
+
+    def test_many_sources_not_in_stream(self):
+        stream = DiStream([DiLink(Interval(0, 1), 0, 1)])
+        with pytest.raises(AttributeError):
+            earliest_arrival_times(stream, [0, 2])
+        with pytest.raises(AttributeError):
+            latest_departure_times(stream, [2])
+
+    @pytest.mark.parametrize('algorithm', [earliest_arrival_time, fastest_path_duration, shortest_path_distance])
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_batch(self, algorithm, workers):
+        stream = generate_stream(Stream, Link, 0, n_links=50, t_range=range(20), u_range=range(10))
+        results = batch(algorithm, stream, workers=workers)
+        assert list(results.index) == list(results.columns) == list(stream.nodes)
+        for source in stream.nodes:
+            assert results.loc[source].to_dict() == algorithm(stream, source)
+
+        time_bound = Interval(5, 15, 'both')
+        results = batch(algorithm, stream, [0, 1], time_bound, workers=workers)
+        assert results.loc[1].to_dict() == algorithm(stream, 1, time_bound)
+
+    @pytest.mark.parametrize('stream_type,link_type', [(DiStream, DiLink), (Stream, Link)])
+    @pytest.mark.parametrize('s', list(range(10)))
+    def test_return_paths(self, stream_type, link_type, s):
+        stream = generate_stream(stream_type, link_type, s, n_links=50, t_range=range(20), u_range=range(10))
+        time_bound = Interval(2, 18, 'both')
+
+        def check_journey(journey, first_node, last_node):
+            assert [hop.u for hop in journey[1:]] == [hop.v for hop in journey[:-1]]
+            assert all(hop_1.interval.left + 1 <= hop_2.interval.left for hop_1, hop_2 in zip(journey, journey[1:]))
+            for hop in journey:
+                assert isinstance(hop, DiLink) and hop.interval.left == hop.interval.right
+                assert time_bound.left <= hop.interval.left and hop.interval.left + 1 <= time_bound.right
+                assert any(hop.interval.left in link.interval for link in stream.link_presence(hop.u, hop.v))
+            if journey:
+                assert journey[0].u == first_node and journey[-1].v == last_node
+
+        for node in stream.nodes:
+            arrival_time, journeys = earliest_arrival_time(stream, node, time_bound, return_paths=True)
+            assert arrival_time == earliest_arrival_time(stream, node, time_bound)
+            assert set(journeys) == set(u for u in arrival_time if arrival_time[u] < float('inf'))
+            for u, journey in journeys.items():
+                check_journey(journey, node, u)
+                assert journey[-1].interval.left + 1 == arrival_time[u] if journey else u == node
+
+            departure_time, journeys = latest_departure_time(stream, node, time_bound, return_paths=True)
+            assert set(journeys) == set(u for u in departure_time if departure_time[u] > float('-inf'))
+            for u, journey in journeys.items():
+                check_journey(journey, u, node)
+                assert journey[0].interval.left == departure_time[u] if journey else u == node
+
+            path_duration, journeys = fastest_path_duration(stream, node, time_bound, return_paths=True)
+            assert set(journeys) == set(u for u in path_duration if path_duration[u] < float('inf'))
+            for u, journey in journeys.items():
+                check_journey(journey, node, u)
+                assert journey[-1].interval.left + 1 - journey[0].interval.left == path_duration[u] if journey \
+                    else u == node
+
+            distance, journeys = shortest_path_distance(stream, node, time_bound, return_paths=True)
+            assert set(journeys) == set(u for u in distance if distance[u] < float('inf'))
+            for u, journey in journeys.items():
+                check_journey(journey, node, u)
+                assert len(journey) == distance[u]
+
+    @pytest.mark.parametrize('stream_type,link_type', [(DiStream, DiLink), (Stream, Link)])
+    @pytest.mark.parametrize('s', list(range(10)))
+    def test_single_pair(self, stream_type, link_type, s):
+        stream = generate_stream(stream_type, link_type, s, n_links=50, t_range=range(20), u_range=range(10))
+        time_bound = Interval(2, 18, 'both')
+
+        for node in stream.nodes:
+            for algorithm in [earliest_arrival_time, fastest_path_duration, shortest_path_distance]:
+                values, journeys = algorithm(stream, node, time_bound, return_paths=True)
+                for other in stream.nodes:
+                    assert algorithm(stream, node, time_bound, target=other) == values[other]
+                    value, journey = algorithm(stream, node, time_bound, return_paths=True, target=other)
+                    assert value == values[other]
+                    if algorithm is shortest_path_distance:
+                        assert journey is None if other not in journeys else len(journey) == value
+                    elif algorithm is earliest_arrival_time:
+                        assert journey == journeys.get(other)
+
+            values, journeys = latest_departure_time(stream, node, time_bound, return_paths=True)
+            for other in stream.nodes:
+                assert latest_departure_time(stream, node, time_bound, source=other) == values[other]
+                assert latest_departure_time(stream, node, time_bound, return_paths=True, source=other) == \
+                    (values[other], journeys.get(other))
+
+        with pytest.raises(AttributeError):
+            fastest_path_duration(stream, 0, target='not a node')
+
+    @pytest.mark.parametrize('stream_type,link_type', [(DiStream, DiLink), (Stream, Link)])
+    @pytest.mark.parametrize('s', list(range(10)))
+    def test_time_bound_list(self, stream_type, link_type, s):
+        stream = generate_stream(stream_type, link_type, s, n_links=50, t_range=range(20), u_range=range(10))
+        time_bounds = [Interval(0, 6, 'both'), Interval(4, 12, 'neither'), Interval(2.5, 9, 'right'),
+                       Interval(12, 25, 'left')]
+
+        for node in stream.nodes:
+            for algorithm in [earliest_arrival_time, latest_departure_time, fastest_path_duration,
+                              shortest_path_distance]:
+                assert algorithm(stream, node, time_bounds) == [algorithm(stream, node, time_bound)
+                                                                for time_bound in time_bounds]
+        assert earliest_arrival_time(stream, 0, []) == []
+
+    @pytest.mark.parametrize('stream_type,link_type', [(DiStream, DiLink), (Stream, Link)])
+    @pytest.mark.parametrize('s', list(range(5)))
+    def test_timestamps(self, stream_type, link_type, s):
+        stream = generate_stream(stream_type, link_type, s, n_links=50, t_range=range(20), u_range=range(10))
+        start, second = Timestamp('2024-01-01 08:00'), Timedelta('1s')
+
+        def to_time(interval):
+            return Interval(start + interval.left * second, start + interval.right * second, interval.closed)
+
+        time_stream = stream_type([link_type(to_time(link.interval), link.u, link.v) for link in stream],
+                                  instant_duration=second)
+        time_bound = Interval(2, 18, 'both')
+
+        for node in stream.nodes:
+            for algorithm, unit in [(earliest_arrival_time, start), (latest_departure_time, start),
+                                    (fastest_path_duration, Timedelta(0)), (shortest_path_distance, Timedelta(0))]:
+                values = algorithm(stream, node, time_bound)
+                assert algorithm(time_stream, node, to_time(time_bound)) == dict(
+                    ((u, pd.NaT if abs(value) == float('inf') else unit + value * second)
+                     for u, value in values.items()))
+
+        values, journeys = earliest_arrival_time(time_stream, 0, to_time(time_bound), return_paths=True)
+        for u, journey in journeys.items():
+            assert all(link.interval.left + second <= values[u] for link in journey)
+        assert earliest_arrival_times(time_stream, [0], to_time(time_bound)).loc[0].to_dict() == values
+
+    @pytest.mark.parametrize('stream_type,link_type', [(DiStream, DiLink), (Stream, Link)])
+    def test_timestamps_exact_ticks(self, stream_type, link_type):
+        # more than 2 ** 53 nanoseconds from the origin, where float64 ticks are not exact
+        start, offset, ns = Timestamp('2024-01-01 08:00'), Timedelta('200D'), Timedelta('1ns')
+        stream = stream_type([link_type(Interval(start, start + ns, 'both'), 0, 1),
+                              link_type(Interval(start + offset + ns, start + offset + 3 * ns, 'both'), 1, 2),
+                              link_type(Interval(start + offset + 3 * ns, start + offset + 5 * ns, 'both'), 2, 3)],
+                             instant_duration=ns)
+
+        arrival_times = earliest_arrival_times(stream)
+        departure_times = latest_departure_times(stream)
+        for u in stream.nodes:
+            assert arrival_times.loc[u].to_dict() == earliest_arrival_time(stream, u)
+            assert departure_times.loc[u].to_dict() == latest_departure_time(stream, u)
+        assert arrival_times.loc[0, 3] == start + offset + 4 * ns
+        assert departure_times.loc[3, 0] == start + ns
+
+    @pytest.mark.parametrize('stream_type,link_type', [(DiStream, DiLink), (Stream, Link)])
+    @pytest.mark.parametrize('s', list(range(10)))
+    def test_reachability_index(self, stream_type, link_type, s):
+        stream = generate_stream(stream_type, link_type, s, n_links=50, t_range=range(20), u_range=range(10))
+        index = ReachabilityIndex(stream, workers=1)
+        assert index.size >= sum(1 for u in stream.nodes for v in stream.nodes if u != v and index.reachable(u, v))
+
+        for interval in [None, Interval(2, 18, 'both'), Interval(5, 9, 'neither'), Interval(7, 30, 'left'),
+                         Interval(2.5, 18, 'both'), Interval(-3, 40, 'right')]:
+            for u in stream.nodes:
+                arrival_time = earliest_arrival_time(stream, u, interval)
+                for v in stream.nodes:
+                    assert index.reachable(u, v, interval) == (arrival_time[v] < float('inf'))
+
+        with pytest.raises(AttributeError):
+            index.reachable(0, 'not a node')
+
+    @pytest.mark.parametrize('stream_type,link_type', [(DiStream, DiLink), (Stream, Link)])
+    @pytest.mark.parametrize('s', list(range(10)))
+    def test_online_earliest_arrival(self, stream_type, link_type, s):
+        links = sorted(generate_stream(stream_type, link_type, s, n_links=60, t_range=range(30), u_range=range(10)),
+                       key=lambda link: link.interval.left)
+        links[20], links[-5] = links[-5], links[20]  # out of order links
+        stream = stream_type(links[:20])
+        sources = list(stream.nodes)[:3]
+        online = OnlineEarliestArrival(stream, sources, Interval(2, float('inf'), 'both'))
+
+        for i, link in enumerate(links[20:]):
+            stream.add(link)
+            if i % 10 == 0:
+                for source in sources:
+                    assert online.arrival_time(source) == earliest_arrival_time(stream, source, Interval(2, 50, 'both'))
+        assert online.arrival_times.loc[sources[0]].to_dict() == online.arrival_time(sources[0])
+
+        online.close()
+        stream.add(link_type(Interval(0, 40, 'both'), sources[0], 'new node'))
+        assert 'new node' not in online.arrival_time(sources[0]) or \
+            online.arrival_time(sources[0])['new node'] == float('inf')
+
+    @pytest.mark.parametrize('stream_type,link_type', [(DiStream, DiLink), (Stream, Link)])
+    @pytest.mark.parametrize('s', list(range(3)))
+    def test_reachability_online_timestamps(self, stream_type, link_type, s):
+        links = sorted(generate_stream(stream_type, link_type, s, n_links=60, t_range=range(30), u_range=range(10)),
+                       key=lambda link: link.interval.left)
+        start, second = Timestamp('2024-01-01 08:00'), Timedelta('1s')
+
+        def to_time(interval):
+            return Interval(start + interval.left * second, start + interval.right * second, interval.closed)
+
+        time_links = [link_type(to_time(link.interval), link.u, link.v) for link in links]
+        stream, time_stream = stream_type(links), stream_type(time_links, instant_duration=second)
+        index, time_index = ReachabilityIndex(stream, workers=1), ReachabilityIndex(time_stream, workers=1)
+        for interval in [None, Interval(2, 18, 'both'), Interval(5, 9, 'neither'), Interval(2.5, 18, 'both')]:
+            time_interval = interval and to_time(interval)
+            for u in stream.nodes:
+                for v in stream.nodes:
+                    assert time_index.reachable(u, v, time_interval) == index.reachable(u, v, interval)
+
+        stream, time_stream = stream_type(links[:20]), stream_type(time_links[:20], instant_duration=second)
+        sources = list(stream.nodes)[:3]
+        online = OnlineEarliestArrival(stream, sources, Interval(2, 50, 'both'))
+        time_online = OnlineEarliestArrival(time_stream, sources, to_time(Interval(2, 50, 'both')))
+        for link, time_link in zip(links[20:], time_links[20:]):
+            stream.add(link)
+            time_stream.add(time_link)
+        for source in sources:
+            assert time_online.arrival_time(source) == dict(
+                ((u, pd.NaT if t == float('inf') else start + t * second)
+                 for u, t in online.arrival_time(source).items()))
+        assert time_online.arrival_times.loc[sources[0]].to_dict() == time_online.arrival_time(sources[0])
@@ -1,11 +1,10 @@
 import pytest
 from operator import itemgetter
 import random
-from sortedcontainers import SortedKeyList
 from portento.classes import Stream, DiStream
-from portento.utils import Link, DiLink
-from portento.algorithms.min_temporal_paths.utils import prepare_for_path_computation, find_le, find_le_idx, \
-    update_on_new_candidate, filter_out_candidate, dominates
+from portento.utils import Link, DiLink, count_instants, nth_instant
+from portento.algorithms.min_temporal_paths.utils import prepare_for_path_computation, \
+    prepare_links_for_path_computation, link_table
 from .random_stream import generate_stream
 
 
@@ -17,47 +16,38 @@ class TestUtils:
         prepared = list(prepare_for_path_computation(stream, [stream.stream_presence.root.full_interval]))
         assert prepared == sorted(prepared, key=itemgetter(0))
 
-        prepared = list(prepare_for_path_computation(stream, [stream.stream_presence.root.full_interval],
-                                                     reverse=True))
-        assert prepared == sorted(prepared, key=itemgetter(0), reverse=True)
-
     @pytest.mark.parametrize('s', list(range(5)))
     def test_prepare_link(self, s):
         stream = generate_stream(Stream, Link, s)
         prepared = list(prepare_for_path_computation(stream, [stream.stream_presence.root.full_interval]))
         assert prepared == sorted(prepared, key=itemgetter(0))
 
-        prepared = list(prepare_for_path_computation(stream, [stream.stream_presence.root.full_interval],
-                                                     reverse=True))
-        assert prepared == sorted(prepared, key=itemgetter(0), reverse=True)
-
-    @pytest.mark.parametrize('tuples,dom_a,res', [
-        ([(3, 12), (4, 14), (5, 16)], 15, [(4, 14), (5, 16)]),
-        ([(3, 12), (4, 14), (5, 16)], 13, [(3, 12), (4, 14), (5, 16)]),
-        ([(3, 12), (4, 14), (5, 16)], 17, [(5, 16)]),
-        ([], 1, [])
-    ])
-    def test_filter_out_candidate(self, tuples, dom_a, res):
-        s = SortedKeyList(tuples, key=itemgetter(1))
-        assert list(filter_out_candidate(s, find_le_idx(s, dom_a))) == res
-
-    @pytest.mark.parametrize('tuple_1,tuple_2,res', [
-        ((1, 0), (2, 1), False),
-        ((0, 10), (10, 0), False),
-        ((10, 0), (0, 10), True),
-        ((10, 0), (11, 10), False),
-        ((1, 0), (0, 0), True),
-        ((10, 10), (9, 10), True)
-    ])
-    def test_domination_fun(self, tuple_1, tuple_2, res):
-        assert dominates(tuple_1, tuple_2) == res
-
-    @pytest.mark.parametrize('tuples,candidate,res', [
-        ([], (0, 1), [(0, 1)]),
-        ([(10, 10)], (9, 10), [(10, 10)]),
-        ([(9, 10)], (10, 11), [(9, 10), (10, 11)]),
-        ([(10, 10)], (10, 9), [(10, 9)])
-    ])
-    def test_update_on_new_candidate(self, tuples, candidate, res):
-        s = SortedKeyList(tuples, key=itemgetter(1))
-        assert list(update_on_new_candidate(s, candidate, True)) == res
+    @pytest.mark.parametrize('stream_type,link_type', [(DiStream, DiLink), (Stream, Link)])
+    @pytest.mark.parametrize('s', list(range(5)))
+    def test_prepare_links(self, stream_type, link_type, s):
+        stream = generate_stream(stream_type, link_type, s)
+        time_bound = stream.stream_presence.root.full_interval
+        end = time_bound.right - 5
+        instants = sorted((t, nodes["u"], nodes["v"]) for t, nodes in prepare_for_path_computation(stream, [time_bound])
+                          if t + stream.instant_duration <= end)
+        links = prepare_links_for_path_computation(stream, [time_bound], end)
+        assert instants == sorted((nth_instant(first, k, stream.instant_duration), u, v)
+                                  for first, last, u, v in links
+                                  for k in range(count_instants(first, last, stream.instant_duration)))
+
+    @pytest.mark.parametrize('stream_type,link_type', [(DiStream, DiLink), (Stream, Link)])
+    def test_link_table(self, stream_type, link_type):
+        stream = generate_stream(stream_type, link_type, 0)
+        time_bound = stream.stream_presence.root.full_interval
+        table = link_table(stream, time_bound)
+        assert link_table(stream, time_bound) is table
+        assert list(table) == sorted(table, key=itemgetter(0))
+        links = prepare_links_for_path_computation(stream, [time_bound], table.end)
+        assert len(table) == len(links)
+        assert sorted(table) == sorted((first, last, x, y) for first, last, u, v in links
+                                       for x, y in table.orientations(u, v))
+        assert sum(map(len, table.out_links.values())) == sum(map(len, table.in_links.values())) == \
+            len(table) * (1 if stream_type is DiStream else 2)
+
+        stream.add(next(iter(stream)))
+        assert link_table(stream, time_bound) is not table
@@ -1,110 +1,341 @@
-from typing import List
-from itertools import repeat, tee
-from functools import singledispatch
+import numpy as np
+from typing import Callable, List
+from collections.abc import Mapping
+from itertools import repeat
+from functools import singledispatch, cached_property
 from heapq import merge
 from operator import itemgetter
 from pandas import Interval
-from sortedcontainers import SortedKeyList
 
-from portento.utils import split_in_instants, DiLink, Link
-from portento.classes import Stream, DiStream, StreamTree
+from portento.utils import split_in_instants, DiLink, Link, instants_bounds, instant_at_or_before, get_start_end, \
+    nth_instant, Clock, TICKS_MAX, TICKS_MIN
+from portento.classes import Stream, DiStream, PointStream, StreamTree
 from portento.slicing import slice_by_time, TimeFilter
 
 
 @singledispatch
-def prepare_for_path_computation(stream, time_bound: List[Interval], reverse=False):
+def prepare_for_path_computation(stream, time_bound: List[Interval]):
+    """The instants of the links within the time bounds as (t, {"u": u, "v": v}), in order of time.
+    Each instant of an undirected link appears once: the caller relaxes both directions.
+
+    """
     pass
 
 
 @prepare_for_path_computation.register
-def _(stream: DiStream, time_bound, reverse=False):
-    return _create_edge_representation(stream.tree_view, stream.instant_duration, time_bound, reverse, DiLink)
+def _(stream: DiStream, time_bound):
+    return _create_edge_representation(stream.tree_view, stream.instant_duration, time_bound, DiLink)
+
+
+@prepare_for_path_computation.register
+def _(stream: Stream, time_bound):
+    return _create_edge_representation(stream.tree_view, stream.instant_duration, time_bound, Link)
 
 
 @prepare_for_path_computation.register
-def _(stream: Stream, time_bound, reverse=False):
-    edge_repr, edge_repr_rev = tee(_create_edge_representation(stream.tree_view,
-                                                               stream.instant_duration, time_bound, reverse, Link), 2)
+def _(stream: PointStream, time_bound):
+    links = stream._slice_by_time(TimeFilter(time_bound).interval_tree)
+    return ((link.interval.left, {"u": link.u, "v": link.v}) for link in links)
 
-    return merge(edge_repr, map(lambda x: (x[0], {"u": x[1]["v"], "v": x[1]["u"]}), edge_repr_rev),
-                 key=itemgetter(0), reverse=reverse)
 
+def _create_edge_representation(stream_tree: StreamTree, instant_duration, time_bound, link_type):
+    """Merge the instants of the sliced links, each one iterated lazily.
 
-def _create_edge_representation(stream_tree: StreamTree, instant_duration, time_bound, reverse, link_type):
-    split_order = lambda x: reversed(list(x)) if reverse else list(x)
-    instants = merge(*map(lambda x: split_order(zip(split_in_instants(x.interval, instant_duration),
-                                                    repeat(({"u": x.u,
-                                                             "v": x.v})))),
+    """
+    instants = merge(*map(lambda x: zip(split_in_instants(x.interval, instant_duration),
+                                        repeat(({"u": x.u,
+                                                 "v": x.v}))),
                           slice_by_time(stream_tree, TimeFilter(time_bound), link_type)),
-                     key=itemgetter(0), reverse=reverse)
+                     key=itemgetter(0))
 
     return instants
 
 
-def dominates(tuple_1, tuple_2, neg=True):
-    tuple_1_val, tuple_1_a = tuple_1
-    tuple_2_val, tuple_2_a = tuple_2
+@singledispatch
+def prepare_links_for_path_computation(stream, time_bound: List[Interval], end):
+    pass
+
+
+@prepare_links_for_path_computation.register
+def _(stream: DiStream, time_bound, end):
+    return list(_create_link_representation(stream.tree_view, stream.instant_duration, time_bound, end, DiLink))
+
+
+@prepare_links_for_path_computation.register
+def _(stream: Stream, time_bound, end):
+    return list(_create_link_representation(stream.tree_view, stream.instant_duration, time_bound, end, Link))
 
-    if neg:
-        tuple_1_val *= -1
-        tuple_2_val *= -1
 
-    return ((tuple_1_val < tuple_2_val and tuple_1_a <= tuple_2_a) or
-            (tuple_1_val == tuple_2_val and tuple_1_a < tuple_2_a))
+@prepare_links_for_path_computation.register
+def _(stream: PointStream, time_bound, end):
+    # a contact at t can be traversed if t + instant_duration <= end
+    last_start = nth_instant(end, -1, stream.instant_duration)
+    return [(link.interval.left, link.interval.left, link.u, link.v)
+            for link in stream._slice_by_time(TimeFilter(time_bound).interval_tree)
+            if link.interval.left <= last_start]
 
 
-def find_le_idx(a, x):
-    """Find rightmost value less than or equal to x
+def _create_link_representation(stream_tree: StreamTree, instant_duration, time_bound, end, link_type):
+    """Represent each sliced link by its first and last instant, without enumerating the instants in between.
+    Only the instants from which the link can be traversed before the end (t + instant_duration <= end) are kept.
 
-    The code is based on the documentation of the bisect module
     """
-    i = a.bisect_key_right(x)
-    return max(i - 1, 0)
+    for link in slice_by_time(stream_tree, TimeFilter(time_bound), link_type):
+        bounds = instants_bounds(link.interval, instant_duration)
+        if bounds:
+            first, last = bounds
+            last = min(last, instant_at_or_before(first, end - instant_duration, instant_duration))
+            if first <= last:
+                yield first, last, link.u, link.v
+
+
+PATH_TABLES_CACHE_SIZE = 16
+
+
+class LinkTable:
+    """The links of a stream within a time bound, ready for path computation.
 
+    Each link is represented by the first and the last instant in which it can be traversed (t + instant_duration
+    must not exceed the end of the time bound). The links are sorted by first instant and their nodes are replaced
+    by their index in nodes. Undirected links are stored once and iterated in both orientations, one after the
+    other.
 
-def find_le(a, x):
-    """Find rightmost value less than or equal to x
+    Parameters
+    ----------
+    nodes : list
+        The nodes of the stream.
+    first, last, u, v : numpy array
+        The columns of the table.
+    start, end
+        The first and the last instant of the time bound.
+    directed : bool
+        False if the links are undirected.
 
-    The code is based on the documentation of the bisect module
     """
 
-    return a[find_le_idx(a, x)]
+    def __init__(self, nodes, first, last, u, v, start, end, directed=True):
+        self.nodes = nodes
+        self.first, self.last, self.u, self.v = first, last, u, v
+        self.start, self.end = start, end
+        self.directed = directed
 
+    @classmethod
+    def from_stream(cls, stream: Stream, time_bound: Interval):
+        start, end = get_start_end(time_bound, stream.instant_duration)
+        nodes = list(stream.nodes)
+        idx = dict(((u, i) for i, u in enumerate(nodes)))
+        links = sorted(prepare_links_for_path_computation(stream, [time_bound], end), key=itemgetter(0))
+        first, last, u, v = (list(column) for column in zip(*links)) if links else ([], [], [], [])
+        return cls(nodes, np.array(first), np.array(last),
+                   np.fromiter(map(idx.get, u), dtype=int, count=len(u)),
+                   np.fromiter(map(idx.get, v), dtype=int, count=len(v)),
+                   start, end, isinstance(stream, DiStream))
 
-def filter_out_candidate(candidate_tuples, dominating_idx):
-    """Filter out candidates in which their key is less than min_key"""
+    def __len__(self):
+        return len(self.first)
 
-    return SortedKeyList(candidate_tuples[dominating_idx:], key=candidate_tuples.key)
+    def __iter__(self):
+        """Iterate over the links as tuples (first, last, u, v), an undirected link as (u, v) and then (v, u)
 
+        """
+        links = zip(self.first.tolist(), self.last.tolist(), map(self.nodes.__getitem__, self.u.tolist()),
+                    map(self.nodes.__getitem__, self.v.tolist()))
+        if self.directed:
+            return links
+        return ((first, last, x, y) for first, last, u, v in links for x, y in ((u, v), (v, u)))
 
-def get_idx_filtered_candidates(candidate_tuples, t):
-    """Find the index of the tuple with max a that is <= t. Also return dominated indexes of dominated tuples"""
-    to_remove_idx = []
-    tuple_idx, tuple_arrival = 0, float('-inf')
-    for i, (distance, arrival) in enumerate(candidate_tuples):
-        if arrival < t and tuple_arrival < arrival:
-            tuple_arrival = arrival
-            tuple_idx = i
-        else:
-            to_remove_idx.append(i)
+    def orientations(self, u, v):
+        """The directions in which the link between u and v can be traversed
 
-    return tuple_idx, reversed(to_remove_idx)
+        """
+        return ((u, v),) if self.directed else ((u, v), (v, u))
 
+    @cached_property
+    def out_links(self):
+        """dict of the form {node : [(first, last, v), ...]}, sorted by first instant
 
-def update_on_new_candidate(candidate_tuples, candidate, neg=True):
-    """Returns the updated SortedKeyList according to the new candidate"""
+        """
+        return group_links_by_node(self)
 
-    # get the tail of the SortedKeyList. If empty, return a default value that is always dominated
-    tail = candidate_tuples.pop() if len(candidate_tuples) > 0 else (float('inf') * (-1 if neg else 1), float('inf'))
+    @cached_property
+    def in_links(self):
+        """dict of the form {node : [(first, last, u), ...]}, sorted by first instant
 
-    if dominates(candidate, tail, neg):  # the candidate tuple dominates the tail
-        candidate_tuples.add(candidate)
-    elif dominates(tail, candidate, neg):  # the tail dominates the candidate tuple
-        candidate_tuples.add(tail)
-    elif tail != candidate:  # there's no domination and the two tuples are different
-        candidate_tuples.add(tail)
-        candidate_tuples.add(candidate)
-    else:
-        candidate_tuples.add(tail)
+        """
+        return group_links_by_node(self, reverse=True)
+
+
+def link_table(stream: Stream, time_bound: Interval):
+    """Return the LinkTable of the stream within the time bound.
+
+    The table is cached on the stream, so that repeated path queries over the same time bound reuse it.
+    The cache is emptied whenever a link is added to the stream.
+
+    """
+    tables = stream._path_tables
+    table = tables.get(time_bound)
+    if table is None:
+        table = LinkTable.from_stream(stream, time_bound)
+        if len(tables) >= PATH_TABLES_CACHE_SIZE:
+            del tables[next(iter(tables))]
+        tables[time_bound] = table
+
+    return table
+
+
+def window_link_tables(stream: Stream, time_bounds: List[Interval]):
+    """Return the LinkTable of the stream within each time bound.
+
+    The intervals of the links are read from the stream once, sorted by left side, and the table of each time bound
+    is built from the links that overlap it, found with a binary search. The links cut by a time bound are counted
+    from its sides, as if the stream was sliced by it.
+
+    """
+    instant_duration = stream.instant_duration
+    nodes = list(stream.nodes)
+    idx = dict(((u, i) for i, u in enumerate(nodes)))
+    links = sorted((interval.left, interval.closed_left, interval.right, interval.closed_right, idx[u], idx[v])
+                   for u, adj in stream.edges.items() for v, links in adj.items()
+                   for interval in links.interval_tree)
+    left = np.array([link[0] for link in links])
+    right = np.array([link[2] for link in links])
+
+    tables = []
+    for time_bound in time_bounds:
+        start, end = get_start_end(time_bound, instant_duration)
+        overlapping = np.flatnonzero(right[:np.searchsorted(left, time_bound.right, side='right')] >= time_bound.left)
+        rows = sorted(filter(None, (_cut_link(*links[i], time_bound, end, instant_duration)
+                                    for i in overlapping.tolist())), key=itemgetter(0))
+        first, last, u, v = (list(column) for column in zip(*rows)) if rows else ([], [], [], [])
+        tables.append(LinkTable(nodes, np.array(first), np.array(last), np.array(u, dtype=int), np.array(v, dtype=int),
+                                start, end, isinstance(stream, DiStream)))
+
+    return tables
+
+
+def _cut_link(left, closed_left, right, closed_right, u, v, time_bound, end, instant_duration):
+    """The row (first, last, u, v) of the link cut by the time bound, as in prepare_links_for_path_computation, or None
+
+    """
+    if time_bound.left > left:
+        left, closed_left = time_bound.left, time_bound.closed_left
+    elif time_bound.left == left:
+        closed_left = closed_left and time_bound.closed_left
+    if time_bound.right < right:
+        right, closed_right = time_bound.right, time_bound.closed_right
+    elif time_bound.right == right:
+        closed_right = closed_right and time_bound.closed_right
+
+    first = left if closed_left else nth_instant(left, 1, instant_duration)
+    right = right if closed_right else right - instant_duration
+    if right < first:
+        return None
+
+    last = min(instant_at_or_before(first, right, instant_duration),
+               instant_at_or_before(first, end - instant_duration, instant_duration))
+    return (first, last, u, v) if first <= last else None
+
+
+class Journeys(Mapping):
+    """The journeys found by a min temporal path algorithm, reconstructed lazily for each node.
+
+    Each journey is a list of DiLink, one for each hop in order, whose interval holds just the instant in which the
+    hop is made. Only the nodes with a journey are keys, the starting node (or ending node) has an empty journey.
+
+    Parameters
+    ----------
+    pointers : dict
+        The dictionary of the form {node : pointer}, where pointer is what the algorithm recorded for the node.
+    reconstruct : Callable
+        A function of the form reconstruct(node, pointer) that returns the journey of the node.
+
+    """
 
-    return candidate_tuples
+    def __init__(self, pointers: dict, reconstruct: Callable):
+        self._pointers = pointers
+        self._reconstruct = reconstruct
+
+    def __getitem__(self, node):
+        return self._reconstruct(node, self._pointers[node])
+
+    def __iter__(self):
+        return iter(self._pointers)
+
+    def __len__(self):
+        return len(self._pointers)
+
+    def with_clock(self, clock: Clock):
+        """The journeys with the instants of the hops converted back to times by the clock.
+
+        """
+        reconstruct = self._reconstruct
+        return Journeys(self._pointers, lambda node, pointer: [hop(link.u, link.v, clock.time(link.interval.left))
+                                                               for link in reconstruct(node, pointer)])
+
+
+def select_results(values: dict, journeys: Journeys, node, return_paths: bool, clock: Clock = None,
+                   durations: bool = False):
+    """The results of a min temporal path algorithm: the values of all the nodes, or only the value of node if it is
+    not None, followed by the journeys (or the journey of node, None if there is no journey) if return_paths.
+    With the clock of a stream, the values are converted back to times (or to durations) and so are the instants of
+    the journeys.
+
+    """
+    if clock:
+        convert = clock.duration if durations else clock.time
+        values = dict(((u, convert(value)) for u, value in values.items()))
+        journeys = journeys.with_clock(clock)
+    if node is not None:
+        values, journeys = values[node], journeys.get(node)
+    return (values, journeys) if return_paths else values
+
+
+def ticks_time_bound(stream: Stream, time_bound):
+    """The time bound of a path query (or each one of a list) in the ticks of the stream, if it has a clock.
+
+    """
+    if not stream.clock or not time_bound:
+        return time_bound
+    if isinstance(time_bound, list):
+        return [stream.clock.interval(interval) for interval in time_bound]
+    return stream.clock.interval(time_bound)
+
+
+def last_out_instants(out_links: dict):
+    """dict of the form {node : last instant of the links leaving the node}
+
+    """
+    return dict(((u, max(map(itemgetter(1), links))) for u, links in out_links.items()))
+
+
+def hop(u, v, t):
+    """The link of a journey from u to v made at instant t
+
+    """
+    return DiLink._trusted(Interval(t, t, 'both'), u, v)
+
+
+def group_links_by_node(links, reverse=False):
+    """Group the links by their first node (by their second node if reverse).
+
+    Returns
+    -------
+    dict of the form {node : [(first, last, other node), ...]}
+
+    """
+    grouped = dict()
+    for first, last, u, v in links:
+        if reverse:
+            u, v = v, u
+        grouped.setdefault(u, []).append((first, last, v))
+    return grouped
+
+
+def unreached_times(stream: Stream, shape, latest=False):
+    """The array of times of the nodes not reached yet: -inf if latest else inf, or TICKS_MIN and TICKS_MAX in an int64
+    array if the stream has a clock, so that its ticks stay exact.
+
+    """
+    if stream.clock:
+        return np.full(shape, TICKS_MIN if latest else TICKS_MAX, dtype=np.int64)
+    return np.full(shape, -np.inf if latest else np.inf)
@@ -1,3 +1,4 @@
 from .streamdict import StreamDict, DiStreamDict
 from .streamtree import StreamTree, DiStreamTree
 from .stream import Stream, DiStream
+from .pointstream import PointStream, DiPointStream
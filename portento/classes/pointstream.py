@@ -0,0 +1,242 @@
+from collections.abc import Hashable, Mapping
+from bisect import bisect_left
+from heapq import merge
+from typing import Optional, Iterable
+
+import pandas as pd
+from sortedcontainers import SortedKeyList
+
+from .stream import Stream, DiStream
+from portento.utils import Link, DiLink, Clock
+
+
+def _time(link):
+    return link.interval.left
+
+
+class PointStream(Stream):
+    """The stream of instantaneous contacts, that is of links with interval Interval(t, t, 'both').
+
+    The links are stored in a table sorted by time and, for each edge, in the sorted list of its times, with a single
+    Interval object for each time. Iteration, access by node, slicing, the path algorithms and the presence lengths
+    (the number of distinct times of the contacts times the instant duration) work on them, without interval trees.
+    The dictionary view, the tree view and the stream presence are the ones of a Stream with the same links: they are
+    built from the table the first time they are accessed, e.g. by the metrics, and then kept up to date by add. The
+    stream presence, needed by the path algorithms for their default time bound, is built in linear time from the
+    sorted times.
+
+    """
+    link_type = Link
+
+    def __init__(self, links: Optional[Iterable[Link]] = iter([]), instant_duration=1):
+        self._clock = None
+        if isinstance(instant_duration, pd.Timedelta):
+            self._clock = Clock()
+            instant_duration = instant_duration.value
+        self._instant_duration = instant_duration
+        self._intervals = dict()  # {t : Interval(t, t, 'both')}
+        self._nodes = dict()
+        self._edges = dict()  # {u : {v : sorted times}}, shared with {v : {u : sorted times}} of _reverse_edges
+        self._reverse_edges = dict()
+        self._dict = self._tree = self._time_instants = None
+        self._path_tables = dict()
+        self._listeners = []
+
+        contacts = dict()
+        for link in map(self._intern, links):
+            contacts.setdefault((link.interval.left, link.u, link.v), link)
+            self._nodes.setdefault(link.u)
+            self._nodes.setdefault(link.v)
+
+        self._contacts = SortedKeyList(contacts.values(), key=_time)
+        for link in self._contacts:
+            self._edge_times(link.u, link.v).append(link.interval.left)
+
+    @property
+    def tree_view(self):
+        if self._tree is None:
+            self._tree = self.tree_view_container(self._contacts, instant_duration=self._instant_duration)
+        return self._tree
+
+    @property
+    def dict_view(self):
+        if self._dict is None:
+            self._dict = self.dict_view_container(self._contacts, instant_duration=self._instant_duration)
+        return self._dict
+
+    @property
+    def stream_presence(self):
+        if self._time_instants is None:
+            self._time_instants = self.time_instants_container.from_sorted(
+                map(self._intervals.__getitem__, sorted(self._intervals)), instant_duration=self._instant_duration)
+        return self._time_instants
+
+    @property
+    def nodes(self):
+        """The nodes of the stream, mapped to their presence as in a Stream.
+
+        """
+        return _PointStreamNodes(self)
+
+    @property
+    def instant_duration(self):
+        return self._instant_duration
+
+    def __iter__(self):
+        return self._times(iter(self._contacts))
+
+    def __contains__(self, item):
+        return item in self._nodes
+
+    def _links_of(self, item):
+        """Get the links of a node, or among a pair of nodes, sorted by time, with their intervals in ticks.
+
+        Parameters
+        ----------
+        item : node or (node, node)
+
+        Returns
+        -------
+        iter_of_links : Iterable(Link)
+
+        """
+        if isinstance(item, tuple):
+            if len(item) == 2 and all(map(lambda x: isinstance(x, Hashable), item)):
+                u, v = self.dict_view_container._sort_nodes(item)
+                if u not in self._nodes or v not in self._nodes:
+                    raise ValueError("One of the two nodes is not in the stream")
+                return self._links(u, v, self._edges.get(u, dict()).get(v, []))
+
+            raise AttributeError("Tuple must have two nodes."
+                                 f"Instead got {len(item)} nodes.")
+
+        if not isinstance(item, Hashable):
+            raise AttributeError("This method requires as input an Hashable object or a tuple of two Hashable "
+                                 f"objects.\nInstead got {item}")
+        if item not in self._nodes:
+            raise ValueError("The given node is not in the stream")
+
+        return merge(*(self._links(item, v, times) for v, times in self._edges.get(item, dict()).items()),
+                     *(self._links(u, item, times) for u, times in self._reverse_edges.get(item, dict()).items()))
+
+    def stream_presence_len(self):
+        """The total time in which the stream has at least an active link, the number of distinct times of the
+        contacts times the instant duration.
+
+        """
+        return len(self._intervals) * self._instant_duration
+
+    def node_presence_len(self, node: Hashable):
+        """The total time in which the node has at least an active link, the number of distinct times of its contacts
+        times the instant duration.
+
+        """
+        if node not in self._nodes:
+            raise KeyError(node)
+        times = set()
+        for adj in (self._edges.get(node, dict()), self._reverse_edges.get(node, dict())):
+            for link_times in adj.values():
+                times.update(link_times)
+        return len(times) * self._instant_duration
+
+    def link_presence_len(self, u: Hashable, v: Hashable):
+        """The total time in which the link (u, v) is active, the number of its times times the instant duration.
+
+        """
+        u, v = self.dict_view_container._sort_nodes((u, v))
+        return len(self._edges[u][v]) * self._instant_duration
+
+    def add(self, link):
+        """Add a link to the stream, and to its views if they have been built.
+
+        Parameters
+        ----------
+        link : Link
+            The link to add.
+
+        """
+        link = self._intern(link)
+        self._nodes.setdefault(link.u)
+        self._nodes.setdefault(link.v)
+        times = self._edge_times(link.u, link.v)
+        t = link.interval.left
+        i = bisect_left(times, t)
+        if i == len(times) or times[i] != t:
+            times.insert(i, t)
+            self._contacts.add(link)
+
+        if self._dict is not None:
+            self._dict.add(link)
+        if self._tree is not None:
+            self._tree.add(link)
+        if self._time_instants is not None:
+            self._time_instants.add(link.interval)
+        self._path_tables.clear()
+        for listener in self._listeners:
+            listener(link)
+
+    def _intern(self, link):
+        """The link with its interval in ticks (if the stream has a clock) and equal to the interval of the stream with
+        the same time.
+
+        """
+        if not isinstance(link, self.link_type) or (self.link_type is Link and isinstance(link, DiLink)):
+            raise TypeError(f"Tried to insert an object that is not a {self.link_type.__name__} in a "
+                            f"{self.__class__.__name__}.")
+        interval = self._clock.interval(link.interval) if self._clock else link.interval
+        if interval.left != interval.right or interval.closed != 'both':
+            raise AttributeError("The links of a point stream must be instantaneous, with interval Interval(t, t, "
+                                 f"'both'). Instead got {interval}")
+
+        interval = self._intervals.setdefault(interval.left, interval)
+        return link if interval is link.interval else type(link)._trusted(interval, link.u, link.v)
+
+    def _edge_times(self, u, v):
+        times = self._edges.setdefault(u, dict()).get(v)
+        if times is None:
+            times = self._edges[u][v] = []
+            self._reverse_edges.setdefault(v, dict())[u] = times
+        return times
+
+    def _links(self, u, v, times):
+        return (self.link_type._trusted(self._intervals[t], u, v) for t in times)
+
+    def _slice_by_time(self, intervals: Optional[Iterable[pd.Interval]] = None):
+        """The links within the intervals, sorted by time. The intervals must be sorted and disjoint.
+
+        """
+        if intervals is None:
+            return iter(self._contacts)
+        return (link for interval in intervals
+                for link in self._contacts.irange_key(interval.left, interval.right,
+                                                      (interval.closed_left, interval.closed_right)))
+
+
+class DiPointStream(PointStream, DiStream):
+    """The directed stream of instantaneous contacts.
+
+    The order of the nodes counts.
+
+    """
+    link_type = DiLink
+
+
+class _PointStreamNodes(Mapping):
+    """The nodes of a point stream, mapped to their presence, the IntervalContainer of the dictionary view.
+
+    """
+
+    def __init__(self, stream: PointStream):
+        self._stream = stream
+
+    def __getitem__(self, node):
+        return self._stream.dict_view.nodes[node]
+
+    def __contains__(self, node):
+        return node in self._stream._nodes
+
+    def __iter__(self):
+        return iter(self._stream._nodes)
+
+    def __len__(self):
+        return len(self._stream._nodes)
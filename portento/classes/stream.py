@@ -1,26 +1,44 @@
 from itertools import tee
 from collections.abc import Hashable
-from typing import Optional, Iterable
+from typing import Callable, Optional, Iterable
+
+import pandas as pd
 
 from .streamtree import StreamTree, DiStreamTree
 from .streamdict import StreamDict, DiStreamDict
-from portento.utils import Link, IntervalTree
+from portento.utils import Link, IntervalTree, IntervalPool, Clock
 
 
 class Stream:
     """The stream class.
 
+    If instant_duration is a pandas Timedelta, the links may have Timestamp (or Timedelta) intervals: they are stored
+    as int64 nanosecond ticks, converted by the clock of the stream, and the instant duration becomes the number of
+    nanoseconds. Iteration, access by node, the presences, slicing and the path algorithms take and return Timestamps,
+    while the views, the presence lengths and the metrics measure time in ticks.
+    The intervals of the links are interned in a pool of the stream, so that the links with equal intervals (e.g. the
+    contacts at the same instant of a point-event stream) share a single Interval object.
+
     """
     dict_view_container = StreamDict
     tree_view_container = StreamTree
     time_instants_container = IntervalTree
 
     def __init__(self, links: Optional[Iterable[Link]] = iter([]), instant_duration=1):
+        self._clock = None
+        if isinstance(instant_duration, pd.Timedelta):
+            self._clock = Clock()
+            instant_duration = instant_duration.value
+        self._interval_pool = IntervalPool()
+        links = map(self._intern, links)
         links_for_dict, links_for_tree, links_for_time = tee(links, 3)
         self._dict = self.dict_view_container(links_for_dict, instant_duration=instant_duration)
-        self._tree = self.tree_view_container(links_for_tree)
+        self._tree = self.tree_view_container(links_for_tree, instant_duration=instant_duration)
         self._time_instants = self.time_instants_container(map(lambda l: l.interval, links_for_time),
                                                            instant_duration=instant_duration)
+        self._interval_pool.prune(self._link_intervals)
+        self._path_tables = dict()
+        self._listeners = []
 
     @property
     def tree_view(self):
@@ -46,20 +64,39 @@ class Stream:
     def instant_duration(self):
         return self.tree_view._instant_duration
 
+    @property
+    def clock(self):
+        """The Clock that converts the Timestamps of the stream to ticks and back, None for a numeric stream.
+
+        """
+        return self._clock
+
     def __iter__(self):
-        return iter(self.tree_view)
+        return self._times(iter(self.tree_view))
 
     def __contains__(self, item):
         return self.dict_view.__contains__(item)
 
     def __getitem__(self, item):
+        return self._times(self._links_of(item))
+
+    def _links_of(self, item):
+        """The links of a node, or among a pair of nodes, with their intervals in ticks.
+
+        """
         return self.dict_view.__getitem__(item)
 
+    def _times(self, links):
+        """The links with their intervals converted back to times, if the stream has a clock.
+
+        """
+        return map(self._clock.link, links) if self._clock else links
+
     def stream_presence_len(self):
         """The total time in which the stream has at least an active link.
 
         It is computed as the sum of the length of all time intervals in which the stream has at least an active link.
-        If intervals have boundaries of the pandas Timestamp type, the number of total seconds is returned
+        If the stream has a clock, the length is in ticks, i.e. the number of nanoseconds.
 
         """
 
@@ -76,20 +113,21 @@ class Stream:
         Returns
         -------
         time : IntervalContainer
-            The IntervalContainer object containing Interval objects.
+            The IntervalContainer object containing Interval objects, or the list of its intervals with Timestamp
+            bounds if the stream has a clock.
 
         """
-        return self.dict_view.node_presence(node)
+        return self._time_intervals(self.dict_view.node_presence(node))
 
     def node_presence_len(self, node: Hashable):
         """The total time in which the node has at least an active link
 
         It is computed as the sum of the length of all time intervals in which the node has at least an active link.
-        If intervals have boundaries of the pandas Timestamp type, the number of total seconds is returned
+        If the stream has a clock, the length is in ticks, i.e. the number of nanoseconds.
 
         """
 
-        return self.node_presence(node).length
+        return self.dict_view.node_presence(node).length
 
     def link_presence(self, u: Hashable, v: Hashable):
         """Return all time instances in which the link (u, v) is active.
@@ -102,19 +140,26 @@ class Stream:
         Returns
         -------
         time : IntervalContainer
-            The IntervalContainer object containing Interval objects.
+            The IntervalContainer object containing Interval objects, or the list of its intervals with Timestamp
+            bounds if the stream has a clock.
+        """
+        return self._time_intervals(self.dict_view.edge_presence(u, v))
+
+    def _time_intervals(self, presence):
+        """The intervals of a presence converted back to times, if the stream has a clock.
+
         """
-        return self.dict_view.edge_presence(u, v)
+        return [self._clock.time_interval(interval) for interval in presence.interval_tree] if self._clock else presence
 
     def link_presence_len(self, u: Hashable, v: Hashable):
         """The total time in which the node has at least an active link
 
         It is computed as the sum of the length of all time intervals in which the node has at least an active link.
-        If intervals have boundaries of the pandas Timestamp type, the number of total seconds is returned
+        If the stream has a clock, the length is in ticks, i.e. the number of nanoseconds.
 
         """
 
-        return self.link_presence(u, v).length
+        return self.dict_view.edge_presence(u, v).length
 
     def neighborhood(self, u):
         """Return the stream with all the links in the neighborhood of node u
@@ -125,11 +170,13 @@ class Stream:
 
         Returns
         -------
-        stream : Stream
-            Stream object of links in which u appears
+        stream : Stream or DiStream
+            Stream object (of the same type) of links in which u appears, sharing the clock of the stream
 
         """
-        return Stream(self[u])
+        stream = self.__class__(self._links_of(u), instant_duration=self.instant_duration)
+        stream._clock = self._clock
+        return stream
 
     def add(self, link):
         """Add a link to the stream.
@@ -141,9 +188,50 @@ class Stream:
             The link to add.
 
         """
+        link = self._intern(link)
         self.dict_view.add(link)
         self.tree_view.add(link)
         self.stream_presence.add(link.interval)
+        self._interval_pool.prune(self._link_intervals)
+        self._path_tables.clear()
+        for listener in self._listeners:
+            listener(link)
+
+    def _link_intervals(self):
+        """The intervals of the links, as merged by the dictionary view.
+
+        """
+        return (interval for adj in self.dict_view.edges.values() for links in adj.values()
+                for interval in links.interval_tree)
+
+    def _intern(self, link):
+        """The link with its interval in ticks (if the stream has a clock) and interned in the pool of the stream.
+
+        """
+        if not isinstance(link, Link):
+            return link
+        interval = self._interval_pool(self._clock.interval(link.interval) if self._clock else link.interval)
+        return link if interval is link.interval else type(link)._trusted(interval, link.u, link.v)
+
+    def add_listener(self, listener: Callable):
+        """Call listener(link) after each link is added to the stream.
+
+        Parameters
+        ----------
+        listener : Callable
+
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable):
+        """Stop calling a listener added with add_listener.
+
+        Parameters
+        ----------
+        listener : Callable
+
+        """
+        self._listeners.remove(listener)
 
 
 class DiStream(Stream):
@@ -1,3 +1,4 @@
+from dataclasses import dataclass, field
 from portento.utils import *
 
 
@@ -14,7 +15,7 @@ class StreamTreeNode(IntervalTreeNode):
     def __iter__(self):
         if self.left:
             yield from iter(self.left)
-        yield Link(self.value, self.u, self.v)
+        yield Link._trusted(self.value, self.u, self.v)
         if self.right:
             yield from iter(self.right)
 
@@ -64,7 +65,7 @@ class DiStreamTreeNode(StreamTreeNode):
     def __iter__(self):
         if self.left:
             yield from iter(self.left)
-        yield DiLink(self.value, self.u, self.v)
+        yield DiLink._trusted(self.value, self.u, self.v)
         if self.right:
             yield from iter(self.right)
 
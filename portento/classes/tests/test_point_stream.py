@@ -0,0 +1,75 @@
+import random
+import pytest
+from pandas import Interval
+
+from portento import Stream, DiStream, PointStream, DiPointStream, slice_stream, TimeFilter, NodeFilter
+from portento.utils import Link, DiLink
+from portento.algorithms.min_temporal_paths import earliest_arrival_time, fastest_path_duration
+
+
+def point_links(link_type, s, n_links=150, t_range=range(40), u_range=range(10)):
+    rnd = random.Random(s)
+    return [link_type(Interval(t, t, 'both'), *rnd.sample(u_range, 2)) for t in rnd.choices(t_range, k=n_links)]
+
+
+def canonical(links):
+    return sorted((link.interval.left, repr(link.u), repr(link.v)) for link in links)
+
+
+class TestPointStream:
+
+    @pytest.mark.parametrize('s', range(5))
+    @pytest.mark.parametrize('stream_type, point_stream_type, link_type', [(Stream, PointStream, Link),
+                                                                           (DiStream, DiPointStream, DiLink)])
+    def test_same_as_stream(self, s, stream_type, point_stream_type, link_type):
+        links = point_links(link_type, s)
+        stream = stream_type(links[:100], instant_duration=2)
+        point_stream = point_stream_type(links[:100], instant_duration=2)
+        point_stream.dict_view
+        for link in links[100:]:
+            stream.add(link)
+            point_stream.add(link)
+
+        assert canonical(point_stream) == canonical(stream)
+        assert list(point_stream) == sorted(point_stream)
+        assert set(point_stream.nodes) == set(stream.nodes)
+        assert point_stream.stream_presence_len() == stream.stream_presence_len()
+        assert list(point_stream.stream_presence) == list(stream.stream_presence)
+        for u in stream.nodes:
+            assert point_stream.node_presence_len(u) == stream.node_presence_len(u)
+            assert list(point_stream.nodes[u]) == list(stream.nodes[u])
+            assert canonical(point_stream[u]) == canonical(stream[u])
+            for v in stream.edges.get(u, dict()):
+                assert point_stream.link_presence_len(u, v) == stream.link_presence_len(u, v)
+                assert canonical(point_stream[u, v]) == canonical(stream[u, v])
+
+    @pytest.mark.parametrize('s', range(5))
+    def test_slice_and_paths(self, s):
+        links = point_links(Link, s)
+        stream, point_stream = Stream(links), PointStream(links)
+        rnd = random.Random(s)
+        for _ in range(5):
+            left, right = sorted(rnd.sample(range(40), 2))
+            time_bound = Interval(left, right, rnd.choice(['both', 'left', 'right', 'neither']))
+            nodes = set(rnd.sample(range(10), 5))
+            for first in ['time', 'node']:
+                assert canonical(slice_stream(point_stream, NodeFilter(lambda x: x in nodes), TimeFilter([time_bound]),
+                                              first)) == \
+                    canonical(slice_stream(stream, NodeFilter(lambda x: x in nodes), TimeFilter([time_bound]), first))
+
+            source = rnd.choice(list(stream.nodes))
+            assert earliest_arrival_time(point_stream, source, time_bound) == \
+                earliest_arrival_time(stream, source, time_bound)
+            assert fastest_path_duration(point_stream, source) == fastest_path_duration(stream, source)
+
+    def test_exceptions(self):
+        with pytest.raises(AttributeError):
+            PointStream([Link(Interval(0, 1, 'both'), 0, 1)])
+        with pytest.raises(AttributeError):
+            PointStream().add(Link(Interval(0, 0, 'left'), 0, 1))
+        with pytest.raises(TypeError):
+            PointStream([DiLink(Interval(0, 0, 'both'), 0, 1)])
+        with pytest.raises(TypeError):
+            DiPointStream([Link(Interval(0, 0, 'both'), 0, 1)])
+        with pytest.raises(ValueError):
+            PointStream([Link(Interval(0, 0, 'both'), 0, 1)])[2]
@@ -1,5 +1,5 @@
 import pytest
-from pandas import Interval
+from pandas import Interval, Timestamp, Timedelta
 
 from portento import Stream
 from portento.utils import Link, compute_presence
@@ -48,6 +48,66 @@ class TestStream:
         assert set(stream_2.node_presence('a')) - \
                {Interval(0.0, 5.0, closed='both'), Interval(6.0, 9.0, closed='both')} == set()
 
+    def test_listeners(self, stream):
+        added = []
+        stream.add_listener(added.append)
+        link = Link(Interval(9.0, 10.0, 'both'), 'c', 'd')
+        stream.add(link)
+        assert added == [link]
+
+        stream.remove_listener(added.append)
+        stream.add(Link(Interval(11.0, 12.0, 'both'), 'c', 'd'))
+        assert added == [link]
+
+    def test_timestamps(self):
+        start = Timestamp('2024-01-01 08:00', tz='Europe/Rome')
+        stream = Stream([Link(Interval(start, start + Timedelta('10s'), 'both'), 'a', 'b')],
+                        instant_duration=Timedelta('500ms'))
+        stream.add(Link(Interval(start + Timedelta('5s'), start + Timedelta('20s'), 'left'), 'b', 'c'))
+
+        assert stream.instant_duration == 500_000_000
+        assert list(stream.tree_view) == [Link(Interval(0, 10_000_000_000, 'both'), 'a', 'b'),
+                                          Link(Interval(5_000_000_000, 20_000_000_000, 'left'), 'b', 'c')]
+        assert stream.stream_presence_len() == 20_000_000_000
+        assert stream.node_presence_len('b') == 20_000_000_000
+
+        # iteration, access by node and presences convert the ticks back to times
+        assert list(stream) == [Link(Interval(start, start + Timedelta('10s'), 'both'), 'a', 'b'),
+                                Link(Interval(start + Timedelta('5s'), start + Timedelta('20s'), 'left'), 'b', 'c')]
+        assert list(stream['c']) == [Link(Interval(start + Timedelta('5s'), start + Timedelta('20s'), 'left'),
+                                          'b', 'c')]
+        assert stream.node_presence('b') == [Interval(start, start + Timedelta('20s'), 'left')]
+        assert stream.link_presence('a', 'b') == [Interval(start, start + Timedelta('10s'), 'both')]
+        neighborhood = stream.neighborhood('c')
+        assert neighborhood.clock is stream.clock
+        assert list(neighborhood) == list(stream['c'])
+        assert stream.clock.time(5_000_000_000) == start + Timedelta('5s')
+        assert stream.clock.duration(float('inf')) is Timedelta('NaT')
+        assert Stream().clock is None
+
+    def test_interned_intervals(self):
+        stream = Stream([Link(Interval(1, 1, 'both'), 'a', 'b'), Link(Interval(1, 1, 'both'), 'c', 'd')])
+        stream.add(Link(Interval(1, 1, 'both'), 'a', 'c'))
+
+        intervals = [link.interval for link in stream]
+        assert intervals == [Interval(1, 1, 'both')] * 3
+        assert all(interval is intervals[0] for interval in intervals)
+        assert all(interval is intervals[0] for u in stream.nodes for interval in stream.node_presence(u))
+        assert stream.stream_presence.root.value is intervals[0]
+
+    def test_interval_pool_size(self):
+        stream = Stream([Link(Interval(t, t + 1, 'both'), 'a', 'b') for t in range(0, 1000, 2)])
+        assert len(stream._interval_pool) == 500
+
+        # each link is merged with the previous ones: the pool does not keep the intervals merged away
+        for t in range(1000):
+            stream.add(Link(Interval(t, t + 1, 'both'), 'a', 'c'))
+            assert len(stream._interval_pool) <= 2 * (500 + stream._interval_pool.min_size)
+        assert list(stream.edges['a']['c'].interval_tree) == [Interval(0, 1000, 'both')]
+
+        stream = Stream([Link(Interval(t, t + 2, 'both'), 'a', 'b') for t in range(1000)])
+        assert len(stream._interval_pool) <= stream._interval_pool.min_size * 2
+
     def test_graph_presence(self, stream, stream_2):
         assert stream.stream_presence_len() == 6.5
         assert stream_2.stream_presence_len() == 10.0
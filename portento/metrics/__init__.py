@@ -1 +1,5 @@
+from . import metrics, approx, series
 from .metrics import *
+
+# without the module metrics, which would shadow the package when portento star-imports it
+__all__ = [name for name in vars(metrics) if not name.startswith('_')] + ['approx', 'series']
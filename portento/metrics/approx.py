@@ -0,0 +1,351 @@
+"""Approximate Stream Metrics
+
+Sampling-based estimators of the metrics that are too expensive to be computed exactly on large streams.
+Time is sampled within the presence containers of the stream as the exact metrics measure it: uniformly by length
+for density and uniformity, whose exact values are ratios of interval lengths, and among the time instants
+(multiples of the instant duration) for the degrees, whose exact values are sums over the instants divided by
+presence lengths (so the mean over the instants is scaled by the number of instants over the length). The estimates
+are unbiased whatever the closure of the intervals, e.g. a closed Interval(t, t + k) has length k and k + 1 instants.
+Each estimator draws samples in batches of growing size and stops as soon as an empirical Bernstein confidence
+interval is narrow enough, or when the number of samples given by the Hoeffding bound is reached.
+
+"""
+from bisect import bisect_right
+from collections.abc import Hashable
+from dataclasses import dataclass
+from itertools import accumulate
+from math import ceil, log, sqrt
+from random import Random
+from typing import Callable, Optional, Union
+
+from portento.classes import Stream, DiStream
+from portento.utils import IntervalTree, Instants
+
+
+@dataclass(frozen=True)
+class Estimate:
+    """The estimate of a metric, with the confidence interval [low, high].
+
+    Parameters
+    ----------
+    value : float
+    low : float
+    high : float
+    n_samples : int
+        The number of samples used for the estimate.
+
+    """
+    value: float
+    low: float
+    high: float
+    n_samples: int
+
+
+def density(stream: Stream, eps: float = 0.01, delta: float = 0.05, seed: Optional[int] = None):
+    """Estimate the density of the stream.
+
+    The probability that the link (u, v) exists at time t, for a random time t and a random pair of nodes u, v both
+    present at t.
+
+    Parameters
+    ----------
+    stream : Stream or DiStream.
+
+    eps : float
+        The maximum half-width of the confidence interval.
+    delta : float
+        The probability that the true value falls out of the confidence interval.
+    seed : int
+        Seed of the random generator.
+
+    Returns
+    -------
+    estimate : Estimate
+
+    """
+    rnd = Random(seed)
+    sample_w = _TemporalNodesSampler(stream, rnd, _TimeSampler)
+    nodes = list(stream.nodes)
+
+    def sample():
+        t, u, v = _sample_triple_both_present(stream, sample_w, nodes, rnd)
+        return 1 if _is_linked(stream, u, v, t) else 0
+
+    return _estimate_mean(sample, 1, eps, delta)
+
+
+def uniformity(stream: Stream, eps: float = 0.01, delta: float = 0.05, seed: Optional[int] = None):
+    """Estimate the uniformity of the stream.
+
+    For a random time t and a random pair of nodes u, v with u present at t, the probability p that also v is present
+    at t gives the uniformity as p / (2 - p).
+
+    Parameters
+    ----------
+    stream : Stream or DiStream.
+
+    eps : float
+        The maximum half-width of the confidence interval of p.
+    delta : float
+        The probability that the true value falls out of the confidence interval.
+    seed : int
+        Seed of the random generator.
+
+    Returns
+    -------
+    estimate : Estimate
+
+    """
+    rnd = Random(seed)
+    sample_w = _TemporalNodesSampler(stream, rnd, _TimeSampler)
+    nodes = list(stream.nodes)
+
+    def sample():
+        t, u = sample_w()
+        v = _sample_other_node(nodes, u, rnd)
+        return 1 if _is_present(stream.nodes[v].interval_tree, t) else 0
+
+    p = _estimate_mean(sample, 1, eps, delta)
+    return Estimate(*map(lambda x: x / (2 - x), (p.value, p.low, p.high)), p.n_samples)
+
+
+def expected_degree_of_node(stream: Stream, u: Hashable, eps: float = 0.01, delta: float = 0.05,
+                            seed: Optional[int] = None):
+    """Estimate the expected degree of a node.
+
+    The average number of neighbors of the node over random time instants in which the node is present.
+
+    Parameters
+    ----------
+    stream : Stream or DiStream.
+
+    u : Node
+
+    eps : float
+        The maximum half-width of the confidence interval of the mean over the instants, relative to the number of
+        neighbors of the node.
+    delta : float
+        The probability that the true value falls out of the confidence interval.
+    seed : int
+        Seed of the random generator.
+
+    Returns
+    -------
+    estimate : Estimate
+
+    """
+    if u not in stream:
+        raise ValueError("The given node is not in the stream")
+
+    rnd = Random(seed)
+    sample_t = _InstantsSampler(stream.nodes[u].interval_tree, stream.instant_duration, rnd)
+    neighbors = _neighbors(stream, u)
+
+    def sample():
+        return _instantaneous_degree(neighbors, sample_t())
+
+    return _scaled(_estimate_mean(sample, max(len(neighbors), 1), eps, delta),
+                   sample_t.weight / stream.node_presence_len(u))
+
+
+def average_time_degree(stream: Stream, eps: float = 0.01, delta: float = 0.05, seed: Optional[int] = None):
+    """Estimate the average time degree of the stream.
+
+    The average time degree is the expected instantaneous degree of a random node u at time t, where t is taken
+    with probability proportional to the number of nodes present at t.
+
+    Parameters
+    ----------
+    stream : Stream or DiStream.
+
+    eps : float
+        The maximum half-width of the confidence interval of the mean over the instants, relative to the maximum number
+        of neighbors of a node.
+    delta : float
+        The probability that the true value falls out of the confidence interval.
+    seed : int
+        Seed of the random generator.
+
+    Returns
+    -------
+    estimate : Estimate
+
+    """
+    rnd = Random(seed)
+    sample_w = _TemporalNodesSampler(stream, rnd)
+    nodes = list(stream.nodes)
+    neighbors = dict(((u, _neighbors(stream, u)) for u in nodes))
+
+    def sample():
+        t, _ = sample_w()
+        return _instantaneous_degree(neighbors[rnd.choice(nodes)], t)
+
+    return _scaled(_estimate_mean(sample, max(max(map(len, neighbors.values())), 1), eps, delta),
+                   sample_w.weight / sum(map(stream.node_presence_len, nodes)))
+
+
+class _InstantsSampler:
+    """Sample uniformly the time instants of a sorted iterable of disjoint intervals.
+
+    """
+
+    def __init__(self, intervals, instant_duration, rnd: Random):
+        self._instants = [Instants.from_interval(interval, instant_duration) for interval in intervals]
+        self._cumulative = list(accumulate(map(len, self._instants)))
+        self._rnd = rnd
+
+    @property
+    def weight(self):
+        """The number of instants.
+
+        """
+        return self._cumulative[-1] if self._cumulative else 0
+
+    def __call__(self):
+        k = self._rnd.randrange(self.weight)
+        idx = bisect_right(self._cumulative, k)
+        offset = k - (self._cumulative[idx - 1] if idx else 0)
+        return self._instants[idx][offset]
+
+
+class _TimeSampler:
+    """Sample uniformly by length the times of a sorted iterable of disjoint intervals, each one weighing its length in
+    the presence containers (at least the instant duration).
+
+    """
+
+    def __init__(self, intervals, instant_duration, rnd: Random):
+        self._intervals = list(intervals)
+        self._cumulative = list(accumulate(max(interval.length, instant_duration) for interval in self._intervals))
+        self._rnd = rnd
+
+    @property
+    def weight(self):
+        """The total length.
+
+        """
+        return self._cumulative[-1] if self._cumulative else 0
+
+    def __call__(self):
+        idx = min(bisect_right(self._cumulative, self._rnd.random() * self.weight), len(self._intervals) - 1)
+        interval = self._intervals[idx]
+        t = interval.left + self._rnd.random() * interval.length
+        return t if t in interval else interval.mid  # an open side, drawn with probability 0
+
+
+class _TemporalNodesSampler:
+    """Sample uniformly the temporal nodes (t, u) of the stream, with the times drawn by the given sampler of the
+    presence of u.
+
+    """
+
+    def __init__(self, stream: Stream, rnd: Random, sampler=_InstantsSampler):
+        self._nodes = list(stream.nodes)
+        self._samplers = [sampler(stream.nodes[u].interval_tree, stream.instant_duration, rnd) for u in self._nodes]
+        self._cumulative = list(accumulate(map(lambda s: s.weight, self._samplers)))
+        self._rnd = rnd
+
+    @property
+    def weight(self):
+        return self._cumulative[-1]
+
+    def __call__(self):
+        idx = min(bisect_right(self._cumulative, self._rnd.random() * self.weight), len(self._nodes) - 1)
+        return self._samplers[idx](), self._nodes[idx]
+
+
+def _estimate_mean(sample: Callable, value_range: Union[int, float], eps: float, delta: float,
+                   first_batch: int = 64):
+    """Estimate the mean of a random variable in [0, value_range] within eps * value_range.
+
+    Half of delta is spread over the checks of the empirical Bernstein bound (delta / 2 ** (i + 2) at the i-th
+    check), the other half is given to the Hoeffding bound that sets the maximum number of samples.
+
+    """
+    if not (0 < eps and 0 < delta < 1):
+        raise AttributeError("eps must be positive and delta must be in (0, 1).")
+
+    max_samples = ceil(log(4 / delta) / (2 * eps ** 2))
+    total, total_sq, n = 0, 0, 0
+    batch, check = first_batch, 0
+
+    while n < max_samples:
+        for _ in range(min(batch, max_samples - n)):
+            x = sample() / value_range
+            total += x
+            total_sq += x * x
+        n = min(n + batch, max_samples)
+
+        if n < max_samples:
+            mean = total / n
+            variance = max(total_sq / n - mean * mean, 0) * n / (n - 1)
+            log_term = log(3 * 2 ** (check + 2) / delta)
+            half_width = sqrt(2 * variance * log_term / n) + 7 * log_term / (3 * (n - 1))
+            if half_width <= eps:
+                break
+            batch, check = 2 * batch, check + 1
+    else:
+        half_width = sqrt(log(4 / delta) / (2 * n))
+
+    mean = total / n
+    return Estimate(mean * value_range,
+                    max(mean - half_width, 0) * value_range,
+                    min(mean + half_width, 1) * value_range,
+                    n)
+
+
+def _scaled(estimate: Estimate, factor: float):
+    return Estimate(estimate.value * factor, estimate.low * factor, estimate.high * factor, estimate.n_samples)
+
+
+def _sample_triple_both_present(stream: Stream, sample_w: _TemporalNodesSampler, nodes, rnd: Random):
+    """Sample uniformly (t, u, v) with both u and v present at t, rejecting the other triples.
+
+    """
+    while True:
+        t, u = sample_w()
+        v = _sample_other_node(nodes, u, rnd)
+        if _is_present(stream.nodes[v].interval_tree, t):
+            return t, u, v
+
+
+def _sample_other_node(nodes, u, rnd: Random):
+    v = u
+    while v == u:
+        v = rnd.choice(nodes)
+    return v
+
+
+def _neighbors(stream: Stream, u: Hashable):
+    """The interval trees of the links of u, grouped by neighbor.
+
+    """
+    neighbors = dict()
+    for adj in (stream.edges.get(u, {}), stream.dict_view._reverse_edges.get(u, {})):
+        for v, links in adj.items():
+            neighbors.setdefault(v, []).append(links.interval_tree)
+    return list(neighbors.values())
+
+
+def _instantaneous_degree(neighbors, t):
+    return sum(1 for trees in neighbors if any(_is_present(tree, t) for tree in trees))
+
+
+def _is_linked(stream: Stream, u: Hashable, v: Hashable, t):
+    if not isinstance(stream, DiStream):
+        u, v = stream.dict_view._sort_nodes((u, v))
+    if u in stream.edges and v in stream.edges[u]:
+        return _is_present(stream.edges[u][v].interval_tree, t)
+    return False
+
+
+def _is_present(tree: IntervalTree, t):
+    """Check if the time instant t is in one of the disjoint intervals of the tree, descending from the root.
+
+    """
+    node = tree.root
+    while node:
+        if t in node.value:
+            return True
+        node = node.left if (t, 0) < (node.value.left, 0 if node.value.closed_left else 1) else node.right
+    return False
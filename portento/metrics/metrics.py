@@ -8,14 +8,19 @@ Social Network Analysis and Mining 8.1 (2018): 1-29.
 
 """
 from collections.abc import Hashable
+from typing import Callable, Iterable, Optional
 
 import pandas as pd
+from bisect import bisect_left, bisect_right
+from heapq import merge
 from operator import truediv, mul
-from functools import partial
+from functools import partial, cached_property
 from itertools import chain, combinations, permutations
 from more_itertools import flatten, unzip
 
-from portento.utils import IntervalTree, split_in_instants
+from portento.utils import IntervalTree, Link, DiLink, split_in_instants, merge_interval, sort_nodes, map_shared, \
+    Instants
+from portento.utils.intervals_functions import _left_tuple, _right_tuple
 from portento.classes import Stream, DiStream
 from portento.slicing import slice_by_time, TimeFilter
 
@@ -84,7 +89,7 @@ def E_t(stream: Stream, t: pd.Interval):
     return set(
         list(
             map(lambda link: (link.u, link.v),
-                slice_by_time(stream.tree_view, TimeFilter([t])))))
+                slice_by_time(stream.tree_view, TimeFilter([t]), DiLink if isinstance(stream, DiStream) else Link))))
 
 
 def card_E_t(stream: Stream, t: pd.Interval):
@@ -119,7 +124,7 @@ def T_u(stream: Stream, u: Hashable):
     """Node presence as the intervals in which a node is present (is at least in a link).
 
     """
-    return stream.node_presence(u)
+    return stream.dict_view.node_presence(u)
 
 
 def card_T_u(stream: Stream, u: Hashable):
@@ -140,7 +145,7 @@ def T_u_v(stream: Stream, u: Hashable, v: Hashable):
     """Node presence as the intervals in which a node is present (is at least in a link).
 
     """
-    return stream.link_presence(u, v)
+    return stream.dict_view.edge_presence(u, v)
 
 
 def card_T_u_v(stream: Stream, u: Hashable, v: Hashable):
@@ -262,11 +267,12 @@ def density_of_pair(stream: Stream, u: Hashable, v: Hashable):
 def density_of_node(stream: Stream, node: Hashable):
     """Density of a node.
     The probability that the node is involved in a link when it exists.
+    The pairs of nodes that never share a link have no presence.
     """
     return truediv(
         *map(lambda x: sum(x),
-             unzip((card_T_u_v(stream, u, node), _card_intervals_intersection(stream, u, node)) for u in V(stream) if
-                   u != node)))
+             unzip((_card_T_u_v_or_zero(stream, u, node), _card_intervals_intersection(stream, u, node))
+                   for u in V(stream) if u != node)))
 
 
 def density_of_time(stream: Stream, t: pd.Interval):
@@ -277,13 +283,31 @@ def density_of_time(stream: Stream, t: pd.Interval):
 
 
 def in_degree(stream: Stream, u: Hashable):
-    return sum((contribution_of_link(stream, u, v) for v in stream.dict_view._reverse_edges[u])) \
-        if u in stream.dict_view._reverse_edges else 0
+    """In-degree of a node.
+
+    The sum of the contributions of the links (v, u). For undirected streams it counts the links in which u is the
+    second node.
+
+    """
+    if u not in stream.dict_view._reverse_edges:
+        return 0
+
+    card_t = card_T(stream)
+    return sum((truediv(links.length, card_t) for links in stream.dict_view._reverse_edges[u].values()))
 
 
 def out_degree(stream: Stream, u: Hashable):
-    return sum((contribution_of_link(stream, u, v) for v in stream.edges[u])) \
-        if u in stream.edges else 0
+    """Out-degree of a node.
+
+    The sum of the contributions of the links (u, v). For undirected streams it counts the links in which u is the
+    first node.
+
+    """
+    if u not in stream.edges:
+        return 0
+
+    card_t = card_T(stream)
+    return sum((truediv(links.length, card_t) for links in stream.edges[u].values()))
 
 
 def degree(stream: Stream, u: Hashable):
@@ -293,11 +317,55 @@ def degree(stream: Stream, u: Hashable):
     return in_degree(stream, u) + out_degree(stream, u)
 
 
+def in_degrees(stream: Stream):
+    """In-degree of all nodes.
+
+    Computed with a single pass over the links of the stream.
+
+    Returns
+    -------
+    in_degrees : dict
+        The dictionary of the form {node : in-degree}
+
+    """
+    return _degrees(stream)[0]
+
+
+def out_degrees(stream: Stream):
+    """Out-degree of all nodes.
+
+    Computed with a single pass over the links of the stream.
+
+    Returns
+    -------
+    out_degrees : dict
+        The dictionary of the form {node : out-degree}
+
+    """
+    return _degrees(stream)[1]
+
+
+def degrees(stream: Stream):
+    """Degree of all nodes.
+
+    Computed with a single pass over the links of the stream.
+
+    Returns
+    -------
+    degrees : dict
+        The dictionary of the form {node : degree}
+
+    """
+    in_deg, out_deg = _degrees(stream)
+    return dict(((u, in_deg[u] + out_deg[u]) for u in V(stream)))
+
+
 def average_degree(stream: Stream):
     """Average degree of the stream.
 
     """
-    return truediv(sum(degree(stream, u) * card_T_u(stream, u) for u in V(stream)), card_W(stream))
+    deg = degrees(stream)
+    return truediv(sum(deg[u] * card_T_u(stream, u) for u in V(stream)), card_W(stream))
 
 
 def average_node_degree(stream: Stream):
@@ -306,8 +374,8 @@ def average_node_degree(stream: Stream):
     The contribution of each node to the average node degree of S is weighted by its presence duration.
 
     """
-
-    return truediv(sum((contribution_of_node(stream, u) * degree(stream, u) for u in V(stream))),
+    deg = degrees(stream)
+    return truediv(sum((contribution_of_node(stream, u) * deg[u] for u in V(stream))),
                    number_of_nodes(stream))
 
 
@@ -326,9 +394,18 @@ def expected_degree_of_node(stream: Stream, u: Hashable):
     The expected instantaneous degree of a node when it is involved in the stream.
 
     """
-    return truediv(sum((instantaneous_degree(stream, u, pd.Interval(t, t, 'both'))
-                        for interval in T_u(stream, u)
-                        for t in split_in_instants(interval, stream.instant_duration)
+    presence = list(T_u(stream, u))
+    instants = [Instants.from_interval(interval, stream.instant_duration) for interval in presence]
+    left_keys = [_left_tuple(interval) for interval in presence]
+
+    # each neighbor counts at the instants of node presence in which one of its links with u is active
+    neighbors = dict()
+    for link in stream.dict_view[u]:
+        neighbors.setdefault(link.v if link.u == u else link.u, []).append(link.interval)
+
+    return truediv(sum((len(instants[bisect_right(left_keys, _left_tuple(interval)) - 1].within(interval))
+                        for intervals in neighbors.values()
+                        for interval in IntervalTree(intervals)
                         )), card_T_u(stream, u))
 
 
@@ -381,6 +458,191 @@ def average_expected_degree(stream: Stream):
     return truediv(2 * number_of_links(stream), number_of_nodes(stream))
 
 
+def map_nodes(func: Callable, stream: Stream, nodes: Optional[Iterable[Hashable]] = None,
+              workers: Optional[int] = None, chunksize: Optional[int] = None):
+    """Compute a per-node metric for many nodes in parallel.
+
+    The stream is shared with each worker process once (inherited through fork where available), so only nodes and
+    results are exchanged with the workers.
+
+    Parameters
+    ----------
+    func : Callable
+        A per-node metric of the form func(stream, node), e.g. degree or density_of_node.
+        If the 'fork' start method is not available, func must be picklable (defined at module level).
+    stream : Stream or DiStream
+
+    nodes : Iterable[Node]
+        The nodes to compute the metric for.
+        Default is None.
+        If nodes is None, use all the nodes of the stream.
+    workers : int
+        Number of processes. Default is None, that is the number of CPUs.
+        If workers is 1, the computation is serial.
+    chunksize : int
+        The number of nodes sent to a worker at once. Default is None, that lets multiprocessing choose it.
+
+    Returns
+    -------
+    results : dict
+        The dictionary of the form {node : func(stream, node)}
+
+    """
+    nodes = list(V(stream) if nodes is None else nodes)
+    return dict(zip(nodes, map_shared(func, stream, nodes, workers, chunksize)))
+
+
+PROFILE_METRICS = ('card_V', 'card_E', 'card_T', 'card_W',
+                   'coverage', 'number_of_nodes', 'number_of_links', 'node_duration', 'link_duration',
+                   'uniformity', 'compactness', 'density',
+                   'average_degree', 'average_node_degree', 'average_time_degree',
+                   'degree_of_stream', 'average_expected_degree')
+
+
+def profile(stream: Stream, metrics: Optional[Iterable[str]] = None):
+    """Compute the whole-stream metrics at once.
+
+    Intermediate results shared among metrics (presence of nodes and links, sums over pairs of nodes, degrees and
+    the sweep over the time instants) are computed only once, and only if a requested metric needs them.
+
+    Parameters
+    ----------
+    stream : Stream or DiStream
+
+    metrics : Iterable[str]
+        The names of the metrics to compute, taken from PROFILE_METRICS.
+        Default is None.
+        If metrics is None, compute all the metrics in PROFILE_METRICS.
+
+    Returns
+    -------
+    profile : dict
+        The dictionary of the form {metric name : value}
+
+    """
+    metrics = PROFILE_METRICS if metrics is None else tuple(metrics)
+    unknown = [m for m in metrics if m not in PROFILE_METRICS]
+    if unknown:
+        raise ValueError(f"Unknown metrics: {unknown}. Available metrics are: {PROFILE_METRICS}")
+
+    stream_profile = _StreamProfile(stream)
+    return dict(((m, getattr(stream_profile, m)) for m in metrics))
+
+
+class _StreamProfile:
+    """Lazy evaluation of the whole-stream metrics, caching the shared intermediate results.
+
+    """
+
+    def __init__(self, stream: Stream):
+        self._stream = stream
+
+    @cached_property
+    def card_V(self):
+        return card_V(self._stream)
+
+    @cached_property
+    def card_T(self):
+        return card_T(self._stream)
+
+    @cached_property
+    def card_T_u(self):
+        return dict(((u, card_T_u(self._stream, u)) for u in V(self._stream)))
+
+    @cached_property
+    def card_W(self):
+        return sum(self.card_T_u.values())
+
+    @cached_property
+    def card_E(self):
+        return card_E(self._stream)
+
+    @cached_property
+    def coverage(self):
+        return truediv(self.card_W, self.card_T * self.card_V)
+
+    @cached_property
+    def number_of_nodes(self):
+        return truediv(self.card_W, self.card_T)
+
+    @cached_property
+    def number_of_links(self):
+        return truediv(self.card_E, self.card_T)
+
+    @cached_property
+    def node_duration(self):
+        return truediv(self.card_W, self.card_V)
+
+    @cached_property
+    def link_duration(self):
+        return truediv(self.card_E, _card_set_unordered_pairs_distinct_elements(self.card_V))
+
+    @cached_property
+    def _pairs_intersection_union(self):
+        """Sums over all pairs of nodes of the cardinality of the intersection and the union of their presence.
+
+        """
+        presence = dict(((u, list(T_u(self._stream, u))) for u in V(self._stream)))
+        sum_intersection, sum_union = 0, 0
+        for u, v in pair_combinations(iterable=V(self._stream)):
+            card_union = _card_intervals_union(presence[u], presence[v], self._stream.instant_duration)
+            sum_union += card_union
+            sum_intersection += self.card_T_u[u] + self.card_T_u[v] - card_union
+
+        if isinstance(self._stream, DiStream):  # ordered pairs count twice
+            return 2 * sum_intersection, 2 * sum_union
+        return sum_intersection, sum_union
+
+    @cached_property
+    def uniformity(self):
+        return truediv(*self._pairs_intersection_union)
+
+    @cached_property
+    def compactness(self):
+        t_min_max = self._stream.stream_presence.root.full_interval.length
+        return truediv(self.card_W, t_min_max * self.card_V)
+
+    @cached_property
+    def density(self):
+        sum_intersection, _ = self._pairs_intersection_union
+        if sum_intersection:
+            return truediv(self.card_E, sum_intersection)
+        return 0
+
+    @cached_property
+    def _degrees(self):
+        in_deg, out_deg = _degrees(self._stream)
+        return dict(((u, in_deg[u] + out_deg[u]) for u in V(self._stream)))
+
+    @cached_property
+    def average_degree(self):
+        return truediv(sum(self._degrees[u] * self.card_T_u[u] for u in V(self._stream)), self.card_W)
+
+    @cached_property
+    def average_node_degree(self):
+        return truediv(sum(truediv(self.card_T_u[u], self.card_T) * self._degrees[u] for u in V(self._stream)),
+                       self.number_of_nodes)
+
+    @cached_property
+    def average_time_degree(self):
+        instants = [t for interval in T(self._stream) for t in split_in_instants(interval,
+                                                                                 self._stream.instant_duration)]
+        left_keys, right_keys = _instants_keys(instants)
+        card_v_t = _count_present((T_u(self._stream, u) for u in V(self._stream)), left_keys, right_keys)
+        card_neighbors_t = _count_present(_undirected_links_presence(self._stream), left_keys, right_keys)
+
+        return truediv(sum((mul(truediv(v_t, self.card_V), truediv(2 * n_t, self.card_V))
+                            for v_t, n_t in zip(card_v_t, card_neighbors_t))), self.node_duration)
+
+    @cached_property
+    def degree_of_stream(self):
+        return truediv(2 * self.card_E, self.card_T * self.card_V)
+
+    @cached_property
+    def average_expected_degree(self):
+        return truediv(2 * self.number_of_links, self.number_of_nodes)
+
+
 def _all_possible_links(stream: Stream):
     if isinstance(stream, DiStream):
         return pair_permutations(iterable=V(stream))
@@ -388,16 +650,41 @@ def _all_possible_links(stream: Stream):
     return pair_combinations(iterable=V(stream))
 
 
-def _card_intervals_union(intervals_1, intervals_2):
+def _card_intervals_union(intervals_1, intervals_2, instant_duration):
     """Compute the cardinality of the union of two iterables of intervals.
 
+    Overlapping intervals are merged as in the IntervalTree, sweeping over the intervals sorted by their left bound.
+
     """
-    tree = IntervalTree(chain(intervals_1, intervals_2))
-    return tree.length
+    card_union = 0
+    current = None
+    for interval in sorted(chain(intervals_1, intervals_2), key=_left_tuple):
+        if current is not None and current.overlaps(interval):
+            current = merge_interval(current, interval)
+        else:
+            if current is not None:
+                card_union += max(current.length, instant_duration)
+            current = interval
+
+    if current is not None:
+        card_union += max(current.length, instant_duration)
+
+    return card_union
+
+
+def _card_T_u_v_or_zero(stream: Stream, u: Hashable, v: Hashable):
+    """card_T_u_v, or 0 if u and v never share a link.
+
+    """
+    try:
+        return card_T_u_v(stream, u, v)
+    except KeyError:
+        return 0
 
 
 def _card_intervals_intersection(stream: Stream, u: Hashable, v: Hashable):
-    return card_T_u(stream, u) + card_T_u(stream, v) - _card_intervals_union(card_T_u(stream, u), card_T_u(stream, v))
+    return card_T_u(stream, u) + card_T_u(stream, v) - _card_intervals_union(T_u(stream, u), T_u(stream, v),
+                                                                             stream.instant_duration)
 
 
 def _intersection_and_union(stream: Stream, u: Hashable, v: Hashable):
@@ -407,11 +694,77 @@ def _intersection_and_union(stream: Stream, u: Hashable, v: Hashable):
     """
     t_u = T_u(stream, u)
     t_v = T_u(stream, v)
-    card_union = _card_intervals_union(t_u, t_v)
+    card_union = _card_intervals_union(t_u, t_v, stream.instant_duration)
     card_intersection = card_T_u(stream, u) + card_T_u(stream, v) - card_union
     return card_intersection, card_union
 
 
+def _degrees(stream: Stream):
+    """Compute in-degree and out-degree of all nodes visiting each link once.
+
+    """
+    card_t = card_T(stream)
+    in_deg = dict.fromkeys(V(stream), 0)
+    out_deg = dict.fromkeys(V(stream), 0)
+
+    for u, adj in stream.edges.items():
+        for v, links in adj.items():
+            contribution = truediv(links.length, card_t)
+            out_deg[u] += contribution
+            in_deg[v] += contribution
+
+    return in_deg, out_deg
+
+
+def _instants_keys(instants):
+    """Left and right keys of the time instants, seen as intervals closed on both sides.
+
+    """
+    return [(t, 0) for t in instants], [(t, 1) for t in instants]
+
+
+def _count_present(presences, left_keys, right_keys):
+    """Count, for each of the sorted and disjoint query intervals, how many presences overlap it.
+
+    Each presence is a sorted iterable of disjoint intervals (e.g. an IntervalTree) and is counted at most once
+    for each query interval. The query intervals are given by their left and right keys.
+
+    """
+    delta = [0] * (len(left_keys) + 1)
+    for presence in presences:
+        covered = 0  # queries before this index are already counted for this presence
+        for interval in presence:
+            first = max(bisect_right(right_keys, _left_tuple(interval)), covered)
+            last = bisect_left(left_keys, _right_tuple(interval))
+            if first < last:
+                delta[first] += 1
+                delta[last] -= 1
+                covered = last
+
+    counts = []
+    count = 0
+    for d in delta[:-1]:
+        count += d
+        counts.append(count)
+    return counts
+
+
+def _undirected_links_presence(stream: Stream):
+    """The presence of each unordered pair of linked nodes, as sorted iterables of intervals.
+
+    """
+    if not isinstance(stream, DiStream):
+        yield from (links.interval_tree for adj in stream.edges.values() for links in adj.values())
+    else:
+        for u, adj in stream.edges.items():
+            for v, links in adj.items():
+                if u in stream.edges.get(v, {}):
+                    if sort_nodes((u, v)) == (u, v):  # visit the pair just once
+                        yield merge(links.interval_tree, stream.edges[v][u].interval_tree, key=_left_tuple)
+                else:
+                    yield links.interval_tree
+
+
 def _card_set_unordered_pairs_distinct_elements(card_set):
     """Cardinality of the set of unordered pairs of distinct elements.
 
@@ -0,0 +1,161 @@
+"""Time-resolved Stream Metrics
+
+The metrics of the stream that depend on a time instant, computed for many time instants (or time bins) at once.
+Instead of slicing the stream for each time instant, the presence of each node and link is swept once against the
+sorted time instants. Results are pandas Series indexed by time.
+
+"""
+from typing import Iterable, Optional
+
+import pandas as pd
+
+from portento.classes import Stream
+from portento.utils.intervals_functions import _left_tuple, _right_tuple
+from .metrics import V, card_V, T_u, _count_present, _instants_keys, _undirected_links_presence
+
+
+def card_V_t(stream: Stream, times: Optional[Iterable] = None, bins: Optional[Iterable] = None):
+    """Cardinality of the set of nodes that are present in each time instant (or time bin).
+
+    Parameters
+    ----------
+    stream : Stream or DiStream.
+
+    times : Iterable
+        The time instants.
+    bins : Iterable
+        The edges of the time bins. Each bin is closed on the left side.
+        Exactly one between times and bins must be given.
+
+    Returns
+    -------
+    series : pandas Series
+        The series indexed by time instants or by time bins.
+
+    """
+    index, left_keys, right_keys = _prepare_queries(times, bins)
+    return pd.Series(_count_present((T_u(stream, u) for u in V(stream)), left_keys, right_keys),
+                     index=index, name='card_V_t')
+
+
+def card_E_t(stream: Stream, times: Optional[Iterable] = None, bins: Optional[Iterable] = None):
+    """Cardinality of the set of links that are present in each time instant (or time bin).
+
+    Parameters
+    ----------
+    stream : Stream or DiStream.
+
+    times : Iterable
+        The time instants.
+    bins : Iterable
+        The edges of the time bins. Each bin is closed on the left side.
+        Exactly one between times and bins must be given.
+
+    Returns
+    -------
+    series : pandas Series
+        The series indexed by time instants or by time bins.
+
+    """
+    index, left_keys, right_keys = _prepare_queries(times, bins)
+    return pd.Series(_count_present((links.interval_tree for adj in stream.edges.values() for links in adj.values()),
+                                    left_keys, right_keys),
+                     index=index, name='card_E_t')
+
+
+def density_of_time(stream: Stream, times: Optional[Iterable] = None, bins: Optional[Iterable] = None):
+    """Density of each time instant (or time bin).
+
+    The values are NaN or inf where less than two nodes are present.
+
+    Parameters
+    ----------
+    stream : Stream or DiStream.
+
+    times : Iterable
+        The time instants.
+    bins : Iterable
+        The edges of the time bins. Each bin is closed on the left side.
+        Exactly one between times and bins must be given.
+
+    Returns
+    -------
+    series : pandas Series
+        The series indexed by time instants or by time bins.
+
+    """
+    card_v_t = card_V_t(stream, times, bins)
+    return (card_E_t(stream, times, bins) / (card_v_t * (card_v_t - 1) / 2)).rename('density_of_time')
+
+
+def degree_at_t(stream: Stream, times: Optional[Iterable] = None, bins: Optional[Iterable] = None):
+    """Degree at each time instant (or time bin).
+
+    The sum of all instantaneous degrees over the cardinality of V.
+
+    Parameters
+    ----------
+    stream : Stream or DiStream.
+
+    times : Iterable
+        The time instants.
+    bins : Iterable
+        The edges of the time bins. Each bin is closed on the left side.
+        Exactly one between times and bins must be given.
+
+    Returns
+    -------
+    series : pandas Series
+        The series indexed by time instants or by time bins.
+
+    """
+    return (_sum_instantaneous_degrees(stream, times, bins) / card_V(stream)).rename('degree_at_t')
+
+
+def expected_degree_at_t(stream: Stream, times: Optional[Iterable] = None, bins: Optional[Iterable] = None):
+    """Expected degree at each time instant (or time bin).
+
+    The sum of all instantaneous degrees over the cardinality of V_t.
+    The values are NaN where no node is present.
+
+    Parameters
+    ----------
+    stream : Stream or DiStream.
+
+    times : Iterable
+        The time instants.
+    bins : Iterable
+        The edges of the time bins. Each bin is closed on the left side.
+        Exactly one between times and bins must be given.
+
+    Returns
+    -------
+    series : pandas Series
+        The series indexed by time instants or by time bins.
+
+    """
+    return (_sum_instantaneous_degrees(stream, times, bins) / card_V_t(stream, times, bins)) \
+        .rename('expected_degree_at_t')
+
+
+def _sum_instantaneous_degrees(stream: Stream, times, bins):
+    """Each pair of linked nodes adds one neighbor to both nodes.
+
+    """
+    index, left_keys, right_keys = _prepare_queries(times, bins)
+    return 2 * pd.Series(_count_present(_undirected_links_presence(stream), left_keys, right_keys), index=index)
+
+
+def _prepare_queries(times, bins):
+    """The index of the series with the left and right keys of the sorted queries.
+
+    """
+    if (times is None) == (bins is None):
+        raise AttributeError("Exactly one between times and bins must be given.")
+
+    if times is not None:
+        instants = sorted(set(times))
+        return (pd.Index(instants, name='t'), *_instants_keys(instants))
+
+    index = pd.IntervalIndex.from_breaks(sorted(set(bins)), closed='left', name='t')
+    return index, list(map(_left_tuple, index)), list(map(_right_tuple, index))
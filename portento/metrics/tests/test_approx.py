@@ -0,0 +1,59 @@
+import pytest
+import random
+from pandas import Interval
+from portento.classes import Stream, DiStream
+from portento.utils import Link, DiLink
+from portento.metrics import approx
+from portento.metrics.metrics import density, uniformity, expected_degree_of_node, average_time_degree, V
+
+
+def generate_mixed_closed_stream(stream_type, link_type, s, n_links=100, t_range=range(30), u_range=range(8)):
+    """Links with any closure, so that the length of an interval may differ from its number of time instants."""
+    random.seed(s)
+    links = []
+    for _ in range(n_links):
+        t = random.choice(t_range)
+        u, v = random.sample(u_range, 2)
+        links.append(link_type(Interval(t, t + random.choice(range(1, 6)),
+                                        random.choice(['both', 'left', 'right', 'neither'])), u, v))
+    return stream_type(links)
+
+
+class TestApprox:
+
+    @pytest.mark.parametrize('s,stream_types', [(0, (Stream, Link)), (1, (DiStream, DiLink)), (2, (Stream, Link))])
+    def test_density(self, s, stream_types):
+        stream = generate_mixed_closed_stream(*stream_types, s)
+        estimate = approx.density(stream, eps=0.02, seed=s)
+        assert estimate.low <= density(stream) <= estimate.high
+        assert estimate.high - estimate.low <= 0.04 + 1e-9
+
+    @pytest.mark.parametrize('s,stream_types', [(0, (Stream, Link)), (1, (DiStream, DiLink)), (2, (Stream, Link))])
+    def test_uniformity(self, s, stream_types):
+        stream = generate_mixed_closed_stream(*stream_types, s)
+        estimate = approx.uniformity(stream, eps=0.02, seed=s)
+        assert estimate.low <= uniformity(stream) <= estimate.high
+
+    @pytest.mark.parametrize('s', list(range(3)))
+    def test_expected_degree_of_node(self, s):
+        stream = generate_mixed_closed_stream(Stream, Link, s)
+        for u in V(stream):
+            estimate = approx.expected_degree_of_node(stream, u, eps=0.02, seed=s)
+            assert estimate.low <= expected_degree_of_node(stream, u) <= estimate.high
+
+    @pytest.mark.parametrize('s', list(range(3)))
+    def test_average_time_degree(self, s):
+        stream = generate_mixed_closed_stream(Stream, Link, s)
+        estimate = approx.average_time_degree(stream, eps=0.02, seed=s)
+        assert estimate.low <= average_time_degree(stream) <= estimate.high
+
+    def test_parameters(self):
+        stream = generate_mixed_closed_stream(Stream, Link, 0)
+        assert approx.density(stream, seed=0) == approx.density(stream, seed=0)
+        with pytest.raises(AttributeError):
+            approx.density(stream, eps=0)
+
+    def test_import(self):
+        from portento import metrics
+        stream = generate_mixed_closed_stream(Stream, Link, 0)
+        assert metrics.approx.density(stream, seed=0) == approx.density(stream, seed=0)
@@ -44,7 +44,7 @@ class TestMetrics:
     def test_card_union(self, intervals, card_union):
 
         tree_1, tree_2 = map(lambda x: IntervalTree(x), intervals)
-        assert _card_intervals_union(tree_1, tree_2) == card_union
+        assert _card_intervals_union(tree_1, tree_2, 1) == card_union
 
     @pytest.mark.parametrize('s,stream_types', zip(range(20), cycle(zip((Stream, DiStream), (Link, DiLink)))))
     def test_uniformity(self, s, stream_types):
@@ -58,7 +58,7 @@ class TestMetrics:
         for u in u_range:
             for v in u_range:
                 if u != v:
-                    card_union = _card_intervals_union(T_u(stream, u), T_u(stream, v))
+                    card_union = _card_intervals_union(T_u(stream, u), T_u(stream, v), stream.instant_duration)
                     card_intersection = card_T_u(stream, u) + card_T_u(stream, v) - card_union
                     assert round_5(uniformity_of_nodes(stream, u, v)) == round_5(card_intersection / card_union)
                     union_acc += card_union
@@ -72,6 +72,22 @@ class TestMetrics:
         stream = generate_stream(Stream, Link, s)
         assert round_5(2 * number_of_links(stream)) == round_5(sum((degree(stream, u) for u in stream.nodes)))
 
+    @pytest.mark.parametrize('s,stream_types', zip(range(10), cycle(zip((Stream, DiStream), (Link, DiLink)))))
+    def test_degrees(self, s, stream_types):
+
+        stream_type, link_type = stream_types
+        stream = generate_stream(stream_type, link_type, s)
+        all_degrees, all_in_degrees, all_out_degrees = degrees(stream), in_degrees(stream), out_degrees(stream)
+
+        assert set(all_degrees) == set(V(stream))
+        for u in V(stream):
+            assert round_5(all_degrees[u]) == round_5(degree(stream, u))
+            assert round_5(all_in_degrees[u]) == round_5(in_degree(stream, u))
+            assert round_5(all_out_degrees[u]) == round_5(out_degree(stream, u))
+
+        assert round_5(sum(all_in_degrees.values())) == round_5(sum(all_out_degrees.values())) == \
+               round_5(number_of_links(stream))
+
     @pytest.mark.parametrize('s', list(range(20)))
     def test_avg_degree(self, s):
 
@@ -101,9 +117,10 @@ class TestMetrics:
                                  filter(lambda x: contains_interval(x.interval, t), neighborhood))))) - 1,
                                                                  0)
 
-    @pytest.mark.parametrize('s', list(range(5)))
-    def test_average_time_degree(self, s):
-        stream = generate_stream(Stream, Link, s, n_links=50, t_range=range(15), u_range=range(7))
+    @pytest.mark.parametrize('s,stream_types', zip(range(6), cycle(zip((Stream, DiStream), (Link, DiLink)))))
+    def test_average_time_degree(self, s, stream_types):
+        stream_type, link_type = stream_types
+        stream = generate_stream(stream_type, link_type, s, n_links=50, t_range=range(15), u_range=range(7))
         assert round_5(truediv(sum((mul(card_V_t(stream, pd.Interval(t, t, 'both')),
                                         degree_at_t(stream, pd.Interval(t, t, 'both')))
                                     for interval in T(stream)
@@ -122,3 +139,46 @@ class TestMetrics:
         stream = generate_stream(Stream, Link, s)
         assert round_5(truediv(2 * card_E(stream), card_W(stream))) == \
                round_5(average_expected_degree(stream))
+
+    @pytest.mark.parametrize('s,stream_types', zip(range(6), cycle(zip((Stream, DiStream), (Link, DiLink)))))
+    def test_profile(self, s, stream_types):
+        stream_type, link_type = stream_types
+        stream = generate_stream(stream_type, link_type, s, n_links=50, t_range=range(15), u_range=range(7))
+        stream_profile = profile(stream)
+
+        assert set(stream_profile) == set(PROFILE_METRICS)
+        for metric in PROFILE_METRICS:
+            assert round_5(stream_profile[metric]) == round_5(globals()[metric](stream))
+
+    def test_profile_subset(self):
+        stream = generate_stream(Stream, Link, 0)
+        assert profile(stream, ['density', 'card_V']) == {'density': density(stream), 'card_V': card_V(stream)}
+
+        with pytest.raises(ValueError):
+            profile(stream, ['not_a_metric'])
+
+    def test_point_links_instant_duration(self):
+        stream = Stream([Link(Interval(0, 0, 'both'), 'a', 'b'), Link(Interval(0, 0, 'both'), 'b', 'c'),
+                         Link(Interval(1, 1, 'both'), 'a', 'c')], instant_duration=0.5)
+        # the presence of a and c is two instants of 0.5, the one of b a single instant
+        assert uniformity(stream) == pytest.approx((0.5 + 1 + 0.5) / 3)
+        assert density(stream) == pytest.approx(1.5 / 2)
+        assert [density_of_node(stream, u) for u in 'abc'] == pytest.approx([1 / 1.5, 1, 1 / 1.5])
+        assert profile(stream, ['uniformity', 'density']) == \
+            pytest.approx({'uniformity': uniformity(stream), 'density': density(stream)})
+
+    @pytest.mark.parametrize('stream_type,link_type', [(Stream, Link), (DiStream, DiLink)])
+    def test_density_of_node_not_complete(self, stream_type, link_type):
+        stream = stream_type([link_type(Interval(0, 4, 'both'), 0, 1), link_type(Interval(2, 6, 'both'), 1, 2),
+                              link_type(Interval(3, 5, 'both'), 3, 2)])
+        # the node 2 shares a link with 1 and 3, not with 0: 0 and 2 are present together in [2, 4]
+        assert density_of_node(stream, 2) == pytest.approx((4 + 2) / (2 + 4 + 2))
+        assert map_nodes(density_of_node, stream, workers=1) == \
+            dict(((u, density_of_node(stream, u)) for u in V(stream)))
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_map_nodes(self, workers):
+        stream = generate_stream(Stream, Link, 0)
+        assert map_nodes(degree, stream, workers=workers) == dict(((u, degree(stream, u)) for u in V(stream)))
+        assert map_nodes(lambda s, u: card_T_u(s, u), stream, [0, 1], workers=workers) == \
+               {0: card_T_u(stream, 0), 1: card_T_u(stream, 1)}
@@ -0,0 +1,53 @@
+import pytest
+import pandas as pd
+from pandas import Interval
+from itertools import cycle
+from portento.classes.tests.random_stream import generate_stream
+from portento.classes import Stream, DiStream
+from portento.utils import Link, DiLink
+from portento.metrics import series
+from portento.metrics import metrics
+
+TIMES = [-1, 0, 3, 7.5, 10, 11, 20, 33, 49, 60]
+BINS = [0, 5, 12, 30, 31, 50]
+
+
+class TestSeries:
+
+    @pytest.mark.parametrize('s,stream_types', zip(range(6), cycle(zip((Stream, DiStream), (Link, DiLink)))))
+    def test_cardinalities(self, s, stream_types):
+        stream = generate_stream(*stream_types, s)
+        for name in ('card_V_t', 'card_E_t'):
+            by_time = getattr(series, name)(stream, TIMES)
+            assert list(by_time.index) == TIMES
+            assert list(by_time) == [getattr(metrics, name)(stream, Interval(t, t, 'both')) for t in TIMES]
+
+            by_bin = getattr(series, name)(stream, bins=BINS)
+            assert list(by_bin) == [getattr(metrics, name)(stream, b) for b in by_bin.index]
+
+    @pytest.mark.parametrize('s', list(range(4)))
+    def test_degrees(self, s):
+        stream = generate_stream(Stream, Link, s)
+        for name in ('density_of_time', 'degree_at_t', 'expected_degree_at_t'):
+            for result, queries in ((getattr(series, name)(stream, TIMES), [Interval(t, t, 'both') for t in TIMES]),
+                                    (getattr(series, name)(stream, bins=BINS), pd.IntervalIndex.from_breaks(BINS))):
+                for value, t in zip(result, queries):
+                    try:
+                        expected = getattr(metrics, name)(stream, Interval(t.left, t.right, 'left')
+                                                          if t.length else t)
+                    except ZeroDivisionError:
+                        assert pd.isna(value) or value == float('inf')
+                    else:
+                        assert round(value, 5) == round(expected, 5)
+
+    def test_queries(self):
+        stream = generate_stream(Stream, Link, 0)
+        with pytest.raises(AttributeError):
+            series.card_V_t(stream)
+        with pytest.raises(AttributeError):
+            series.card_V_t(stream, TIMES, BINS)
+
+    def test_import(self):
+        import portento
+        stream = generate_stream(Stream, Link, 0)
+        assert portento.metrics.series.density_of_time(stream, TIMES).equals(series.density_of_time(stream, TIMES))
@@ -1 +1,5 @@
+from . import readwrite
 from .readwrite import *
+
+# without the module readwrite, which would shadow the package when portento star-imports it
+__all__ = [name for name in vars(readwrite) if not name.startswith('_')]
@@ -1,12 +1,14 @@
 """Functions to convert a stream graph to and from other formats.
 """
 
+import numpy as np
 import pandas as pd
 
 import portento
 from portento.utils import Link, DiLink, interval_from_string
 from typing import Union, List, Type
 from collections import defaultdict
+from collections.abc import Hashable
 
 DEFAULT_COL_NAMES = ["interval", "source", "target"]
 
@@ -234,8 +236,9 @@ def _from_pandas(df: pd.DataFrame,
 
         target = _prepare_data_from_columns(df, target, names=source)
         source = _prepare_data_from_columns(df, source)
+        source, target = _validate_nodes(source, target, sort=link_type is Link)
 
-        stream = stream_type(links=list(map(lambda x: link_type(*x), zip(df[interval], source, target))),
+        stream = stream_type(links=list(map(link_type._trusted, df[interval].tolist(), source, target)),
                              instant_duration=instant_duration)
 
         return stream
@@ -245,6 +248,35 @@ def _from_pandas(df: pd.DataFrame,
                              "A DiStream object must accept DiLink objects only.")
 
 
+def _validate_nodes(source, target, sort: bool):
+    """Check the nodes of all the links at once, as the Link class does for each link, and sort each pair of nodes
+    if sort is True.
+
+    Returns
+    -------
+    source, target : numpy arrays of objects
+
+    """
+    source, target = pd.Series(source), pd.Series(target)
+    if source.isna().any() or target.isna().any():
+        raise ValueError("Tried to create a link with a missing node.")
+    if any(nodes.dtype == object and not all(isinstance(node, Hashable) for node in nodes)
+           for nodes in (source, target)):
+        raise TypeError("Tried to create a link with non-hashable node.")
+
+    source_repr = source.map(repr).to_numpy()
+    target_repr = target.map(repr).to_numpy()
+    if (source_repr == target_repr).any():
+        raise AttributeError(f"Self loops are not allowed. Node with self loop: "
+                             f"{source[source_repr == target_repr].iloc[0]}")
+
+    source, target = source.to_numpy(dtype=object), target.to_numpy(dtype=object)
+    if sort:
+        swap = source_repr > target_repr
+        source, target = np.where(swap, target, source), np.where(swap, source, target)
+    return source, target
+
+
 def _prepare_dict_from_node(node, col_name: str):
     if isinstance(node, tuple):
         return dict(tuple(map(lambda x: (col_name + "_" + x[0], x[1]), node)))
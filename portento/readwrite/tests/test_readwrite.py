@@ -28,6 +28,22 @@ class TestFromPandasStream:
             df = pd.DataFrame(wrong_data)
             from_pandas_stream(df)
 
+    @pytest.mark.parametrize('source,target,error', [
+        (['a', None], ['b', 'c'], ValueError),
+        (['a', ['b']], ['b', 'c'], TypeError),
+        (['a', 'c'], ['b', 'c'], AttributeError)
+    ])
+    def test_invalid_nodes(self, source, target, error):
+        df = pd.DataFrame({"interval": [pd.Interval(0, 1), pd.Interval(1, 2)], "source": source, "target": target})
+        with pytest.raises(error):
+            from_pandas_stream(df)
+
+    def test_node_order(self):
+        df = pd.DataFrame({"interval": [pd.Interval(0, 1), pd.Interval(1, 2)], "source": ['b', 'a'],
+                           "target": ['a', 'c']})
+        assert [(link.u, link.v) for link in from_pandas_stream(df)] == [('a', 'b'), ('a', 'c')]
+        assert [(link.u, link.v) for link in from_pandas_di_stream(df)] == [('b', 'a'), ('a', 'c')]
+
 
 class TestToPandasStream:
 
@@ -36,3 +52,10 @@ class TestToPandasStream:
         df = to_pandas_stream(stream, *data.keys())
         assert df.equals(pd.DataFrame(list(map(lambda link: (*link,), list(stream))),
                                       columns=[col for col in data.keys()]))
+
+    def test_timestamps(self):
+        start = pd.Timestamp('2024-01-01 08:00')
+        df = pd.DataFrame({"interval": [pd.Interval(start, start + pd.Timedelta('10s'))], "source": ['a'],
+                           "target": ['b']})
+        stream = from_pandas_stream(df, instant_duration=pd.Timedelta('1s'))
+        assert list(to_pandas_stream(stream).itertuples(index=False)) == list(df.itertuples(index=False))
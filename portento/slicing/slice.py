@@ -1,12 +1,12 @@
 from abc import abstractmethod
-from pandas import Interval
+from pandas import Interval, Timestamp, Timedelta
 from typing import List, Callable, Union
 from heapq import merge
 from itertools import repeat
 from sortedcontainers.sortedlist import SortedList
 
-from portento.classes import Stream, DiStream, StreamDict, StreamTree
-from portento.classes.streamtree import StreamTreeNode
+from portento.classes import Stream, DiStream, PointStream, StreamDict, StreamTree
+from portento.classes.streamtree import StreamTreeNode, DiStreamTreeNode
 from portento.utils import IntervalTree, IntervalTreeNode, Link, DiLink, cut_interval
 
 
@@ -46,11 +46,14 @@ class NoFilter(Filter):
 class TimeFilter(Filter):
     """A links filter that tests the interval.
     A link is kept if the interval has an overlapping in the user-defined intervaltree.
-    __init__ takes into input a list of intervals.
+    __init__ takes into input a list of intervals, which may have Timestamp (or Timedelta) bounds to slice a stream
+    with a clock.
     """
 
     def __init__(self, list_of_intervals: List[Interval]):
-        self._interval_tree = IntervalTree(list_of_intervals)
+        list_of_intervals = list(list_of_intervals)
+        times = bool(list_of_intervals) and isinstance(list_of_intervals[0].left, (Timestamp, Timedelta))
+        self._interval_tree = IntervalTree(list_of_intervals, instant_duration=Timedelta(1) if times else 1)
 
     @property
     def interval_tree(self):
@@ -114,15 +117,25 @@ def slice_by_time(stream_tree: StreamTree, time_filter: Union[NoFilter, TimeFilt
         return iter([])
 
 
+def _link_factory(link_type, stream_link_type):
+    """The constructor of the links of link_type from the nodes of links of stream_link_type: the trusted one if the
+    nodes are already in the order of link_type, else link_type itself, which sorts them.
+
+    """
+    return link_type._trusted if link_type is stream_link_type else link_type
+
+
 def _filter_node_by_time(node: Union[StreamTreeNode, IntervalTreeNode], time_filter: Union[NoFilter, TimeFilter],
                          link_type: Union[Link, DiLink]):
     if time_filter(node.full_interval):
         if node.left:
             yield from _filter_node_by_time(node.left, time_filter, link_type)
         if time_filter(node.value):
-            yield from map(lambda i:
-                           link_type(i, node.u, node.v) if isinstance(node, StreamTreeNode) else i,
-                           time_filter[node.value])
+            if isinstance(node, StreamTreeNode):
+                create_link = _link_factory(link_type, DiLink if isinstance(node, DiStreamTreeNode) else Link)
+                yield from map(lambda i: create_link(i, node.u, node.v), time_filter[node.value])
+            else:
+                yield from time_filter[node.value]
         if node.right:
             yield from _filter_node_by_time(node.right, time_filter, link_type)
 
@@ -187,12 +200,31 @@ def _slice(stream: Union[Stream, DiStream],
            node_filter: Union[NoFilter, NodeFilter] = NoFilter(),
            time_filter: Union[NoFilter, TimeFilter] = NoFilter(),
            first='time'):
-    if first == 'time':
+    clock = stream.clock
+    if clock and isinstance(time_filter, TimeFilter):
+        time_filter = TimeFilter([clock.interval(interval) for interval in time_filter.interval_tree])
+    links = _slice_links(stream, link_type, node_filter, time_filter, first)
+    yield from map(clock.link, links) if clock else links
+
+
+def _slice_links(stream: Union[Stream, DiStream],
+                 link_type: Union[Link, DiLink],
+                 node_filter: Union[NoFilter, NodeFilter],
+                 time_filter: Union[NoFilter, TimeFilter],
+                 first: str):
+    if isinstance(stream, PointStream) and first in ('time', 'node'):
+        # the links are already sorted by time: the filters are applied in a single pass
+        intervals = time_filter.interval_tree if isinstance(time_filter, TimeFilter) else None
+        links = filter(lambda l: node_filter(l.u) and node_filter(l.v), stream._slice_by_time(intervals))
+        yield from (links if link_type is stream.link_type else (link_type(l.interval, l.u, l.v) for l in links))
+
+    elif first == 'time':
         yield from filter(lambda l: node_filter(l.u) and node_filter(l.v),
                           slice_by_time(stream.tree_view, time_filter, link_type))
 
     elif first == 'node':
-        yield from merge(*(map(lambda x: link_type(*x),
+        create_link = _link_factory(link_type, DiLink if isinstance(stream, DiStream) else Link)
+        yield from merge(*(map(lambda x: create_link(*x),
                                zip(slice_by_time(links.interval_tree, time_filter), repeat(u), repeat(v)))
                            for u, adj in stream.edges.items() if node_filter(u)
                            for v, links in adj.items() if node_filter(v)
@@ -1,9 +1,9 @@
 import pytest
-from pandas import Interval
+from pandas import Interval, Timestamp, Timedelta
 from itertools import combinations, chain
 
-from portento import Stream, Link, \
-    slice_stream, slice_by_time, slice_by_nodes, \
+from portento import Stream, DiStream, PointStream, DiPointStream, Link, DiLink, \
+    slice_stream, slice_di_stream, slice_by_time, slice_by_nodes, \
     NoFilter, TimeFilter, NodeFilter
 
 
@@ -75,3 +75,26 @@ class TestFilter:
                 node_filter = NodeFilter(lambda x: x in bunch_nodes)
                 assert [i for i in slice_stream(s, node_filter, time_filter, 'time')] == \
                        [i for i in slice_stream(s, node_filter, time_filter, 'node')]
+
+    @pytest.mark.parametrize('first', ['time', 'node'])
+    def test_slice_di_stream_into_links(self, first):
+        di_links = [DiLink(Interval(0, 3), 'b', 'a'), DiLink(Interval(1, 4), 'a', 'b')]
+        # the undirected links have their nodes sorted
+        assert sorted(slice_stream(DiStream(di_links), first=first)) == \
+            [Link(Interval(0, 3), 'a', 'b'), Link(Interval(1, 4), 'a', 'b')]
+        assert sorted(slice_di_stream(DiStream(di_links), first=first)) == sorted(di_links)
+
+        di_links = [DiLink(Interval(0, 0, 'both'), 'b', 'a'), DiLink(Interval(1, 1, 'both'), 'a', 'b')]
+        assert list(slice_stream(DiPointStream(di_links), first=first)) == \
+            [Link(Interval(0, 0, 'both'), 'a', 'b'), Link(Interval(1, 1, 'both'), 'a', 'b')]
+
+    @pytest.mark.parametrize('first', ['time', 'node'])
+    @pytest.mark.parametrize('stream_type', [Stream, PointStream])
+    def test_timestamps(self, first, stream_type):
+        start = Timestamp('2024-01-01 08:00')
+        links = [Link(Interval(start + Timedelta(f'{t}s'), start + Timedelta(f'{t}s'), 'both'), 'a', 'b')
+                 for t in range(5)]
+        stream = stream_type(links, instant_duration=Timedelta('1s'))
+        time_filter = TimeFilter([Interval(start + Timedelta('1s'), start + Timedelta('3s'), 'left')])
+        # the time filter is converted to the ticks of the stream and the links back to times
+        assert list(slice_stream(stream, time_filter=time_filter, first=first)) == links[1:3]
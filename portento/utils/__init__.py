@@ -1,4 +1,7 @@
 from .intervals_functions import *
+from .instants import *
 from .streamdata import *
 from .intervaltree import IntervalTree, IntervalTreeNode
+from .intervalpool import IntervalPool
 from .sortstreamnodes import sort_nodes
+from .parallel import map_shared
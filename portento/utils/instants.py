@@ -0,0 +1,241 @@
+"""Instant arithmetic
+
+The instants of an interval are the times first + k * instant_duration that lie within it, first being its left
+side (or the left side plus the instant duration if the interval is open on the left). Each instant is identified by
+its integer tick k, so that the bounds, the number and the membership of the instants of an interval are computed in
+constant time, without enumerating them. The instants are rounded to the digits of first and of the instant duration
+to avoid the accumulation of floating point errors.
+
+"""
+import math
+from collections.abc import Sequence
+import numpy as np
+import pandas as pd
+
+
+def _n_digits(x):
+    return len((str(x) + ".").split(".")[1])
+
+
+def _round(x, n_digits):
+    """Round the floats to n_digits, leaving integer ticks unchanged.
+
+    """
+    return round(x, ndigits=n_digits) if isinstance(x, float) else x
+
+
+def instants_bounds(interval: pd.Interval, instant_duration):
+    """Return the first and the last instant of an interval without enumerating its instants.
+
+    Parameters
+    ----------
+    interval : Interval
+
+    instant_duration
+
+    Returns
+    -------
+    (first, last) or None if the interval has no instants
+
+    """
+    first = interval.left if interval.closed_left else nth_instant(interval.left, 1, instant_duration)
+    right = interval.right if interval.closed_right else interval.right - instant_duration
+    if right < first:
+        return None
+
+    return first, instant_at_or_before(first, right, instant_duration)
+
+
+def instant_at_or_after(first, t, instant_duration):
+    """The smallest instant first + k * instant_duration that is greater than or equal to t (with k >= 0)
+
+    """
+    if t <= first:
+        return first
+    return _round(first + math.ceil(round((t - first) / instant_duration, 9)) * instant_duration,
+                  max(_n_digits(first), _n_digits(instant_duration)))
+
+
+def instant_at_or_before(first, t, instant_duration):
+    """The largest instant first + k * instant_duration that is less than or equal to t (with k >= 0)
+
+    """
+    return _round(first + math.floor(round((t - first) / instant_duration, 9)) * instant_duration,
+                  max(_n_digits(first), _n_digits(instant_duration)))
+
+
+def count_instants(first, last, instant_duration):
+    """Number of instants from first to last (included)
+
+    """
+    return math.floor(round((last - first) / instant_duration, 9)) + 1
+
+
+def nth_instant(first, n, instant_duration):
+    """The instant first + n * instant_duration
+
+    """
+    return _round(first + n * instant_duration, max(_n_digits(first), _n_digits(instant_duration)))
+
+
+class Instants(Sequence):
+    """The instants first + k * instant_duration, for k in range(n), as a sequence that does not store them.
+
+    Parameters
+    ----------
+    first
+        The first instant.
+    n : int
+        The number of instants.
+    instant_duration
+
+    """
+
+    def __init__(self, first, n, instant_duration):
+        self.first = first
+        self.n = n
+        self.instant_duration = instant_duration
+        self._n_digits = max(_n_digits(first), _n_digits(instant_duration))
+
+    @classmethod
+    def from_interval(cls, interval: pd.Interval, instant_duration):
+        bounds = instants_bounds(interval, instant_duration)
+        if not bounds:
+            return cls(interval.left, 0, instant_duration)
+        first, last = bounds
+        return cls(first, count_instants(first, last, instant_duration), instant_duration)
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return [self[i] for i in range(*k.indices(self.n))]
+        if k < 0:
+            k += self.n
+        if not 0 <= k < self.n:
+            raise IndexError("Instant index out of range.")
+        return _round(self.first + k * self.instant_duration, self._n_digits)
+
+    def __iter__(self):
+        return (_round(self.first + k * self.instant_duration, self._n_digits) for k in range(self.n))
+
+    def __reversed__(self):
+        return (_round(self.first + k * self.instant_duration, self._n_digits)
+                for k in range(self.n - 1, -1, -1))
+
+    def within(self, interval: pd.Interval):
+        """The instants that are in the interval, found without enumerating them.
+
+        """
+        low = max(math.ceil(round((interval.left - self.first) / self.instant_duration, 9)), 0)
+        if not interval.closed_left and low < self.n and self[low] == interval.left:
+            low += 1
+        high = min(math.floor(round((interval.right - self.first) / self.instant_duration, 9)), self.n - 1)
+        if not interval.closed_right and high >= 0 and self[high] == interval.right:
+            high -= 1
+        if high < low:
+            return Instants(self.first, 0, self.instant_duration)
+        return Instants(self[low], high - low + 1, self.instant_duration)
+
+    def __contains__(self, t):
+        k = round((t - self.first) / self.instant_duration)
+        return 0 <= k < self.n and self[k] == t
+
+    def index(self, t):
+        if t not in self:
+            raise ValueError("{} is not an instant.".format(t))
+        return round((t - self.first) / self.instant_duration)
+
+    def count(self, t):
+        return int(t in self)
+
+    def __repr__(self):
+        return "Instants(first={}, n={}, instant_duration={})".format(self.first, self.n, self.instant_duration)
+
+
+# the int64 ticks standing for +inf and -inf (e.g. nodes never reached) in the arrays of times of a clock
+TICKS_MAX, TICKS_MIN = np.iinfo(np.int64).max, np.iinfo(np.int64).min
+
+
+class Clock:
+    """The conversion between the pandas Timestamps (or Timedeltas) of a stream and int64 nanosecond ticks.
+
+    A stream whose instant duration is a Timedelta stores its times as the nanoseconds elapsed from an origin, the
+    first time it converts, so that slicing, metrics and paths run on integers. The results are converted back to
+    Timestamps (Timedeltas for durations) with the clock, infinite values becoming NaT.
+    The arrays of ticks (e.g. of earliest_arrival_times) are int64, with TICKS_MAX and TICKS_MIN in place of infinite
+    values, so that they are exact at any time span.
+
+    """
+
+    def __init__(self):
+        self._origin = None
+
+    def ticks(self, x):
+        """The Timestamp or Timedelta x as ticks, any other value unchanged.
+
+        """
+        if isinstance(x, pd.Timestamp):
+            if self._origin is None:
+                self._origin = x
+            return (x - self._origin).value
+        if isinstance(x, pd.Timedelta):
+            if self._origin is None:
+                self._origin = pd.Timedelta(0)
+            return (x - self._origin).value
+        return x
+
+    def interval(self, interval: pd.Interval):
+        """The interval with bounds in ticks.
+
+        """
+        if isinstance(interval.left, (pd.Timestamp, pd.Timedelta)):
+            return pd.Interval(self.ticks(interval.left), self.ticks(interval.right), interval.closed)
+        return interval
+
+    def time_interval(self, interval: pd.Interval):
+        """The interval with bounds in ticks converted back to times.
+
+        """
+        return pd.Interval(self.time(interval.left), self.time(interval.right), interval.closed)
+
+    def link(self, link):
+        """The link with its interval converted back to times.
+
+        """
+        return type(link)._trusted(self.time_interval(link.interval), link.u, link.v)
+
+    def time(self, x):
+        """The time of the ticks x, NaT if x is infinite.
+
+        """
+        if x in (float('inf'), float('-inf')):
+            return pd.NaT
+        return self._origin + pd.Timedelta(int(x))
+
+    def duration(self, x):
+        """The Timedelta of the ticks x, NaT if x is infinite.
+
+        """
+        if x in (float('inf'), float('-inf')):
+            return pd.NaT
+        return pd.Timedelta(int(x))
+
+    def times(self, values):
+        """The times of an array (or Series) of ticks.
+
+        """
+        return self._origin + self.durations(values)
+
+    def durations(self, values):
+        """The Timedeltas of an array (or Series) of ticks, either floats or int64 with TICKS_MAX and TICKS_MIN for the
+        infinite values.
+
+        """
+        values = np.asarray(values)
+        if values.dtype.kind == 'i':
+            durations = values.astype('m8[ns]')
+            durations[(values == TICKS_MAX) | (values == TICKS_MIN)] = np.timedelta64('NaT')
+            return pd.to_timedelta(durations)
+        return pd.to_timedelta(np.where(np.isfinite(values), values, np.nan), unit='ns')
@@ -0,0 +1,59 @@
+from typing import Callable, Iterable
+
+import pandas as pd
+
+
+class IntervalPool:
+    """Pool of interned intervals: equal intervals are replaced by a single Interval object.
+
+    The links of point-event streams share the same few intervals, e.g. Interval(t, t, 'both') for each contact at
+    time t. A stream interns the intervals of its links on ingestion, so that its containers hold one Interval object
+    for each distinct interval instead of one for each link.
+    pandas Interval objects cannot be weakly referenced, so the pool keeps a reference to its intervals: prune drops
+    the ones that are no longer alive (e.g. merged away by the containers of the stream) whenever the pool has doubled
+    since the last pruning, so that it holds at most about twice the live intervals at an amortized constant cost.
+
+    """
+    min_size = 64
+
+    def __init__(self):
+        self._intervals = dict()
+        self._n_retained = 0
+
+    def __call__(self, interval: pd.Interval):
+        """Return the interval of the pool equal to the given one, adding it if there is none.
+
+        Parameters
+        ----------
+        interval : Interval
+
+        Returns
+        -------
+        interval : Interval
+
+        """
+        return self._intervals.setdefault(interval, interval)
+
+    def __len__(self):
+        return len(self._intervals)
+
+    def __contains__(self, interval):
+        return self._intervals.get(interval) is interval
+
+    def prune(self, alive: Callable[[], Iterable[pd.Interval]]):
+        """Keep only the intervals returned by alive, if the pool has doubled since the last pruning.
+
+        Parameters
+        ----------
+        alive : Callable
+            The function returning the intervals still in use.
+
+        """
+        if len(self._intervals) > 2 * max(self._n_retained, self.min_size):
+            self._intervals = dict(((interval, interval) for interval in alive()
+                                    if self._intervals.get(interval) is interval))
+            self._n_retained = len(self._intervals)
+
+    def clear(self):
+        self._intervals.clear()
+        self._n_retained = 0
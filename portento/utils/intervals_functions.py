@@ -4,7 +4,7 @@ from typing import Iterable
 from functools import reduce
 from itertools import tee
 import operator
-from more_itertools import first, last
+from .instants import Instants, instants_bounds
 
 
 def compute_closure(closed_left, closed_right):
@@ -51,6 +51,12 @@ def merge_interval(*intervals):
     min_interval = min(it_min, key=lambda x: _left_tuple(x))
     max_interval = max(it_max, key=lambda x: _right_tuple(x))
 
+    # return one of the intervals when it already is the merged one, instead of a new equal Interval object
+    if _right_tuple(min_interval) == _right_tuple(max_interval):
+        return min_interval
+    if _left_tuple(max_interval) == _left_tuple(min_interval):
+        return max_interval
+
     closed = compute_closure(min_interval.closed_left, max_interval.closed_right)
 
     return pd.Interval(min_interval.left, max_interval.right, closed)
@@ -134,29 +140,17 @@ def split_in_instants(interval: pd.Interval, instant_duration):
 
     Returns
     -------
-    range
+    Instants
 
     """
-
-    n_digits = len((str(instant_duration)+".").split(".")[1])
-
-    if interval.closed_left:
-        left = interval.left
-    else:
-        left = interval.left + instant_duration
-    if interval.closed_right:
-        right = interval.right
-    else:
-        right = interval.right - instant_duration
-
-    counter = left
-    while counter <= right:
-        yield counter
-        counter = round(counter + instant_duration, ndigits=n_digits)
+    return Instants.from_interval(interval, instant_duration)
 
 
 def get_start_end(interval: pd.Interval, instant_duration):
-    instants = split_in_instants(interval, instant_duration)
-    start = first(instants)
-    end = last(instants, start)
-    return start, max(end, end - instant_duration)
+    """Return the first and the last instant of an interval, raising a ValueError if it has no instants.
+
+    """
+    bounds = instants_bounds(interval, instant_duration)
+    if not bounds:
+        raise ValueError("The interval must contain at least an instant.")
+    return bounds
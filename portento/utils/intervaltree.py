@@ -177,6 +177,45 @@ class IntervalTree:
             for d in data:
                 self.add(d)
 
+    @classmethod
+    def from_sorted(cls, data: Iterable[value_type], instant_duration=1):
+        """Build the tree from sorted and non-overlapping intervals in linear time, without adding them one by one.
+
+        The tree is balanced: the nodes in its deepest level are red, the other ones are black.
+
+        Parameters
+        ----------
+        data : Iterable[Interval]
+            The intervals, sorted and such that no two of them overlap.
+
+        instant_duration
+
+        Returns
+        -------
+        tree : IntervalTree
+
+        """
+        tree = cls(instant_duration=instant_duration)
+        nodes = [cls._create_node(d, instant_duration) for d in data]
+        tree.root = cls._balanced_subtree(nodes, 0, len(nodes), len(nodes).bit_length() - 1, 0)
+        return tree
+
+    @classmethod
+    def _balanced_subtree(cls, nodes, low, high, red_depth, depth):
+        if low >= high:
+            return None
+
+        mid = (low + high) // 2
+        node = nodes[mid]
+        node.left = cls._balanced_subtree(nodes, low, mid, red_depth, depth + 1)
+        node.right = cls._balanced_subtree(nodes, mid + 1, high, red_depth, depth + 1)
+        for child in (node.left, node.right):
+            if child:
+                child.parent = node
+        node.color = Color.RED if 0 < depth == red_depth else Color.BLACK
+        node._compute_data()
+        return node
+
     def __iter__(self):
         if self.root:
             return iter(self.root)
@@ -567,4 +606,4 @@ class IntervalTree:
     @classmethod
     def _merge(cls, node_1, node_2):
         # data is assumed to be Interval
-        return IntervalTreeNode(merge_interval(node_1.value, node_2.value))
+        return IntervalTreeNode(merge_interval(node_1.value, node_2.value), instant_duration=node_1.instant_duration)
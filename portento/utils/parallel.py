@@ -0,0 +1,51 @@
+from multiprocessing import get_all_start_methods, get_context
+from typing import Callable, Iterable, Optional
+
+_shared_func = None
+_shared_data = None
+
+
+def map_shared(func: Callable, shared, items: Iterable, workers: Optional[int] = None,
+               chunksize: Optional[int] = None):
+    """Compute func(shared, item) for each item with a pool of processes.
+
+    The shared object (e.g. a stream) and the function are handed to each worker once, when the worker starts:
+    with the 'fork' start method they are inherited by the child processes without being pickled at all,
+    otherwise they are pickled once per worker. Only the items and the results travel between processes.
+
+    Parameters
+    ----------
+    func : Callable
+        A function of the form func(shared, item).
+    shared : object
+        The object shared among all the calls, e.g. a Stream.
+    items : Iterable
+        The items to map.
+    workers : int
+        Number of processes. Default is None, that is the number of CPUs.
+        If workers is 1, the computation is serial.
+    chunksize : int
+        The number of items sent to a worker at once. Default is None, that lets multiprocessing choose it.
+
+    Returns
+    -------
+    results : list
+        The list of results, in the same order of items.
+
+    """
+    items = list(items)
+    if workers == 1 or len(items) <= 1:
+        return [func(shared, item) for item in items]
+
+    context = get_context('fork') if 'fork' in get_all_start_methods() else get_context()
+    with context.Pool(workers, initializer=_init_worker, initargs=(func, shared)) as pool:
+        return pool.map(_call_shared, items, chunksize)
+
+
+def _init_worker(func, shared):
+    global _shared_func, _shared_data
+    _shared_func, _shared_data = func, shared
+
+
+def _call_shared(item):
+    return _shared_func(_shared_data, item)
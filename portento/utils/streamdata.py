@@ -1,4 +1,4 @@
-from dataclasses import dataclass, field
+from dataclasses import FrozenInstanceError
 from collections.abc import Hashable
 
 from pandas import Interval
@@ -7,9 +7,12 @@ from .intervaltree import IntervalTree
 from .sortstreamnodes import sort_nodes
 
 
-@dataclass(frozen=True, order=True)
 class Link:
-    """Base dataclass containing all the information of a link of the stream.
+    """Base class containing all the information of a link of the stream.
+
+    A link is immutable and is unpacked as (interval, u, v). Links are compared, sorted and hashed by their interval
+    only, through a key (left, closed-left flag, right, closed-right flag) computed once, so that the intervals that
+    start earlier come first and, among the ones with the same left side, the ones that end earlier.
 
     Parameters
     ----------
@@ -18,34 +21,88 @@ class Link:
     v : node (Hashable)
 
     """
-    interval: Interval
-    u: Hashable = field(compare=False)
-    v: Hashable = field(compare=False)
+    __slots__ = ('interval', 'u', 'v', '_key')
 
-    def __post_init__(self):
-        if self.u is None or self.v is None:
+    def __init__(self, interval: Interval, u: Hashable, v: Hashable):
+        if u is None or v is None:
             raise ValueError(f"Tried to create a link with a node equal to {None} "
-                             f"in interval {self.interval}")
-        if not isinstance(self.u, Hashable) or not isinstance(self.v, Hashable):
+                             f"in interval {interval}")
+        if not isinstance(u, Hashable) or not isinstance(v, Hashable):
             raise TypeError("Tried to create a link with non-hashable node.")
 
-        if repr(self.u) == repr(self.v):
-            raise AttributeError(f"Self loops are not allowed. Node with self loop: {self.u}")
+        if repr(u) == repr(v):
+            raise AttributeError(f"Self loops are not allowed. Node with self loop: {u}")
+
+        self._set(interval, *self._order_nodes(u, v))
 
-        self._order_nodes()
+    @classmethod
+    def _trusted(cls, interval, u, v):
+        """Create a link skipping the checks on the nodes, which must be valid and already in the order of the class,
+        e.g. the nodes of a link of a stream or nodes validated in bulk.
+
+        """
+        link = object.__new__(cls)
+        link._set(interval, u, v)
+        return link
+
+    def _set(self, interval, u, v):
+        set_field = object.__setattr__
+        set_field(self, 'interval', interval)
+        set_field(self, 'u', u)
+        set_field(self, 'v', v)
+        set_field(self, '_key', (interval.left, 0 if interval.closed_left else 1,
+                                 interval.right, 1 if interval.closed_right else 0))
+
+    @staticmethod
+    def _order_nodes(u, v):
+        return sort_nodes([u, v])
 
     def __iter__(self):
         return iter((self.interval, self.u, self.v))
 
-    def _order_nodes(self):
-        u, v = sort_nodes([self.u, self.v])
-        object.__setattr__(self, 'u', u)
-        object.__setattr__(self, 'v', v)
+    def __setattr__(self, name, value):
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name):
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+    def __reduce__(self):
+        return self.__class__._trusted, (self.interval, self.u, self.v)
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}(interval={self.interval!r}, u={self.u!r}, v={self.v!r})"
+
+    def __hash__(self):
+        return hash(self._key)
+
+    def __eq__(self, other):
+        if other.__class__ is self.__class__:
+            return self._key == other._key
+        return NotImplemented
+
+    def __lt__(self, other):
+        if other.__class__ is self.__class__:
+            return self._key < other._key
+        return NotImplemented
+
+    def __le__(self, other):
+        if other.__class__ is self.__class__:
+            return self._key <= other._key
+        return NotImplemented
+
+    def __gt__(self, other):
+        if other.__class__ is self.__class__:
+            return self._key > other._key
+        return NotImplemented
+
+    def __ge__(self, other):
+        if other.__class__ is self.__class__:
+            return self._key >= other._key
+        return NotImplemented
 
 
-@dataclass(frozen=True)
 class DiLink(Link):
-    """Base dataclass containing all the information of a directed link of the directed stream.
+    """Base class containing all the information of a directed link of the directed stream.
     This works like the Link, just it doesn't sort nodes.
 
     Parameters
@@ -55,9 +112,11 @@ class DiLink(Link):
     v : node (Hashable)
 
     """
+    __slots__ = ()
 
-    def _order_nodes(self):
-        pass
+    @staticmethod
+    def _order_nodes(u, v):
+        return u, v
 
 
 class IntervalContainer:
@@ -86,7 +145,7 @@ class IntervalContainer:
     def __iter__(self):
         if len(self._cond) == 2:
             u, v = self._cond
-            return iter(self.link_type(interval, u, v) for interval in self._intervals)
+            return iter(self.link_type._trusted(interval, u, v) for interval in self._intervals)
         else:
             return iter(self._intervals)
 
@@ -2,7 +2,7 @@ import pytest
 import pandas as pd
 import numpy as np
 
-from portento.utils import merge_interval, split_in_instants
+from portento.utils import merge_interval, split_in_instants, get_start_end
 
 
 class TestIntervalMerge:
@@ -44,3 +44,22 @@ class TestIntervalSplit:
             counter = round(counter + step, ndigits=n_digits)
 
         assert list(split_in_instants(interval, instant_duration)) == res_list
+
+    @pytest.mark.parametrize('interval,instant_duration,res', [
+        (pd.Interval(0.25, 2, 'both'), 0.5, [0.25, 0.75, 1.25, 1.75]),
+        (pd.Interval(0.1, 0.7, 'neither'), 0.2, [0.3, 0.5]),
+        (pd.Interval(3, 3.5, 'neither'), 1, [])
+    ])
+    def test_instants(self, interval, instant_duration, res):
+        instants = split_in_instants(interval, instant_duration)
+        assert list(instants) == res
+        assert len(instants) == len(res)
+        assert all(t in instants for t in res) and 2 not in instants and 1.5 not in instants
+        assert [instants.index(t) for t in res] == list(range(len(res)))
+        assert list(instants.within(pd.Interval(0.5, 1.25, 'right'))) == [t for t in res if 0.5 < t <= 1.25]
+        if res:
+            assert instants[-1] == res[-1]
+            assert get_start_end(interval, instant_duration) == (res[0], res[-1])
+        else:
+            with pytest.raises(ValueError):
+                get_start_end(interval, instant_duration)
@@ -1,5 +1,7 @@
+import pickle
 import pytest
 
+from dataclasses import FrozenInstanceError
 from pandas import Interval
 
 from portento.utils import Link, IntervalContainer
@@ -24,6 +26,26 @@ class TestLink:
         with pytest.raises(TypeError):
             Link(*attrs)
 
+    def test_record(self):
+        link = Link(Interval(0, 1), 3, 2)
+        interval, u, v = link
+        assert (interval, u, v) == (link.interval, link.u, link.v) == (Interval(0, 1), 2, 3)
+        assert repr(link) == "Link(interval=Interval(0, 1, closed='right'), u=2, v=3)"
+        assert pickle.loads(pickle.dumps(link)) == link
+        assert not hasattr(link, '__dict__')
+        with pytest.raises(FrozenInstanceError):
+            link.u = 4
+
+    def test_order(self):
+        links = [Link(Interval(0, 2, 'neither'), 0, 1),
+                 Link(Interval(0, 1, 'both'), 0, 1),
+                 Link(Interval(0, 1, 'left'), 0, 1),
+                 Link(Interval(0, 2, 'left'), 0, 1)]
+        assert sorted(links) == [links[2], links[1], links[3], links[0]]
+        assert Link(Interval(0, 1), 0, 1) == Link(Interval(0, 1), 2, 3)
+        assert hash(Link(Interval(0, 1), 0, 1)) == hash(Link(Interval(0, 1), 2, 3))
+        assert Link(Interval(0, 1), 0, 1) != Link(Interval(0, 1, 'both'), 0, 1)
+
 
 @pytest.fixture
 def links():
@@ -124,6 +124,22 @@ class TestRedBlackTree:
             assert same_q_black_paths(tree.root)
             assert height(tree.root) <= 2 * log2(n - n_deleted + 1)
 
+    @pytest.mark.parametrize('n', [0, 1, 2, 3, 7, 8, 100, 190])
+    def test_from_sorted(self, n):
+        intervals = [Interval(x, x, 'both') for x in range(n)]
+        tree = IntervalTree.from_sorted(intervals, instant_duration=2)
+
+        assert list(tree) == intervals
+        assert tree.length == 2 * n
+        assert black_root(tree)
+        assert red_has_black_child(tree.root)
+        assert same_q_black_paths(tree.root)
+        assert height(tree.root) <= 2 * log2(n + 1)
+
+        tree.add(Interval(n - 1, n - 0.5, 'both'))
+        assert tree.length == 2 * max(n, 1)
+        assert same_q_black_paths(tree.root)
+
     @pytest.mark.parametrize('s', list(range(20)))
     def test_update(self, s):
 